@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+/api/db/agendas under 200 concurrent clients: the previous handler (sync
+Session inside an async def, so queries run on the event loop thread) vs
+the AsyncSession handler. The API runs under uvicorn in a separate process
+with the old handler mounted at /bench/sync/agendas; a probe hits /health
+during each run to show how long the loop is unavailable to other requests.
+
+With more clients than pooled connections the old handler also stalls on the
+pool: its query blocks the loop waiting for a connection, while the sessions
+holding them are only closed by dependency teardowns scheduled on that same
+loop, so the wait ends at DB_POOL_TIMEOUT (set low here with --pool-timeout).
+Each handler gets a fresh server; draining the old one's backlog before its
+pool counters can be read takes a few minutes at 200 clients.
+
+Run from the backend directory:
+    python -m benchmarks.bench_async_db --clients 200 --requests 1
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def serve(port: int):
+    """The API plus the pre-AsyncSession version of the agendas handler"""
+    import uvicorn
+    from fastapi import Depends
+    from sqlalchemy.orm import Session
+
+    import main
+    from database.database import get_db
+    from database.models import Agenda
+    from database.pagination import PageParams, page_params, paginate_query, row_to_dict
+
+    @main.app.get("/bench/sync/agendas")
+    async def sync_agendas(db: Session = Depends(get_db), page: PageParams = Depends(page_params)):
+        selected = page.select(main.AGENDA_FIELDS, ("content",))
+        rows, next_cursor = paginate_query(db.query(Agenda), Agenda, page, page.cursors.get("db"), columns=selected)
+        return {"agendas": [row_to_dict(row, selected) for row in rows], "pagination": page.info({"db": next_cursor})}
+
+    uvicorn.run(main.app, host="127.0.0.1", port=port, log_level="warning")
+
+def seed(rows: int):
+    from database.database import SessionLocal
+    from database.models import Agenda
+    from database.utils import create_tables
+
+    create_tables()
+    start = datetime(2025, 1, 1)
+    with SessionLocal() as db:
+        db.bulk_insert_mappings(Agenda, [
+            {"event_id": i % 20 + 1, "title": f"Agenda {i}", "content": "Talk " * 400,
+             "day_number": i % 3 + 1, "created_at": start + timedelta(minutes=i)}
+            for i in range(rows)
+        ])
+        db.commit()
+
+def percentile(values, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))] if ordered else 0.0
+
+async def load(base: str, path: str, clients: int, requests: int, timeout: float):
+    import httpx
+
+    params = {"limit": 100, "order_by": "created_at"}
+    latencies, probe, errors = [], [], 0
+    done = asyncio.Event()
+    limits = httpx.Limits(max_connections=clients + 1, max_keepalive_connections=clients + 1)
+    async with httpx.AsyncClient(base_url=base, limits=limits, timeout=timeout) as client:
+        async def worker():
+            nonlocal errors
+            for _ in range(requests):
+                start = time.perf_counter()
+                try:
+                    response = await client.get(path, params=params)
+                except httpx.HTTPError:
+                    errors += 1  # timed out waiting for the server
+                    continue
+                latencies.append((time.perf_counter() - start) * 1000)
+                if response.status_code != 200:
+                    errors += 1
+
+        async def health():
+            while not done.is_set():
+                start = time.perf_counter()
+                try:
+                    await client.get("/health")
+                except httpx.HTTPError:
+                    pass
+                probe.append((time.perf_counter() - start) * 1000)
+                await asyncio.sleep(0.05)
+
+        probe_task = asyncio.create_task(health())
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(clients)))
+        elapsed = time.perf_counter() - start
+        done.set()
+        await probe_task
+    return latencies, probe, errors, elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Sync vs AsyncSession list endpoint under concurrent clients")
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=1, help="Requests per client")
+    parser.add_argument("--rows", type=int, default=20000, help="Agendas seeded")
+    parser.add_argument("--pool-timeout", default="10", help="DB_POOL_TIMEOUT for the server (seconds)")
+    parser.add_argument("--timeout", type=float, default=60, help="Client timeout per request (seconds)")
+    parser.add_argument("--serve", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve)
+        return
+
+    workdir = tempfile.mkdtemp(prefix="hackatwin-async-db-")
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{workdir}/bench.db",
+           "JOB_WORKER_INPROCESS": "false", "OUTBOX_WORKER_INPROCESS": "false", "DB_POOL_TIMEOUT": args.pool_timeout}
+    os.environ.update(env)
+    seed(args.rows)
+
+    import httpx
+
+    print(f"📊 {args.clients} clients x {args.requests} requests, 100 agendas per page ({args.rows:,} seeded, "
+          f"pool timeout {args.pool_timeout}s)")
+    # A fresh server per handler: requests the clients gave up on are still queued in the old one
+    for label, path in (("sync Session (old)", "/bench/sync/agendas"), ("AsyncSession (new)", "/api/db/agendas")):
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        with open(os.path.join(workdir, "server.log"), "a") as log:
+            server = subprocess.Popen([sys.executable, "-m", "benchmarks.bench_async_db", "--serve", str(port)],
+                                      env=env, stdout=log, stderr=log)
+        base = f"http://127.0.0.1:{port}"
+        try:
+            for _ in range(100):
+                try:
+                    httpx.get(f"{base}/health")
+                    break
+                except httpx.TransportError:
+                    time.sleep(0.1)
+
+            latencies, probe, errors, elapsed = asyncio.run(load(base, path, args.clients, args.requests, args.timeout))
+            print(f"   {label:<20} {len(latencies) / elapsed:>7.1f} req/s   p50 {statistics.median(latencies or [0]):>7.1f} ms"
+                  f"   p99 {percentile(latencies, 0.99):>7.1f} ms   errors/timeouts {errors}")
+            print(f"   {'':<20} /health meanwhile: p50 {statistics.median(probe or [0]):>7.1f} ms"
+                  f"   p99 {percentile(probe, 0.99):>7.1f} ms   max {max(probe or [0]):>7.1f} ms")
+            # Answered once the server has worked through its backlog
+            pools = httpx.get(f"{base}/api/db/pool", timeout=None).json()
+            print(f"   {'':<20} pool timeouts: sync engine {pools['pool'].get('timeouts')}, "
+                  f"async engine {pools['async_pool'].get('timeouts')}")
+        finally:
+            server.terminate()
+            try:
+                server.wait(10)
+            except subprocess.TimeoutExpired:
+                server.kill()
+
+if __name__ == "__main__":
+    main()
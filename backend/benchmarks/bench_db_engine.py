@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Concurrent dashboard reads and outreach log writes against one SQLite file:
+the previous engine (create_engine defaults, rollback journal) vs
+create_db_engine (WAL, synchronous=NORMAL, busy timeout, cache and mmap
+pragmas, metered pool). Reports throughput, read latency, "database is
+locked" errors and the pool metrics.
+
+Run from the backend directory:
+    python -m benchmarks.bench_db_engine --seconds 10 --readers 8 --writers 4
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def seed(path: str, rows: int):
+    """Tables and rows with a plain engine: journal_mode=WAL would persist in the file"""
+    from sqlalchemy import create_engine
+    from database.database import Base
+    import database.models  # noqa: F401 (registers the tables)
+
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    conn = engine.raw_connection()
+    try:
+        conn.cursor().executemany(
+            "INSERT INTO outreach_logs (name, email, message_type, status, event_id, sent_at) "
+            "VALUES (?, ?, 'outreach', 'sent', 1, ?)",
+            ((f"Lead {i}", f"lead{i}@example.com", datetime(2025, 1, 1, i % 24, i % 60).isoformat(" "))
+             for i in range(rows)))
+        conn.commit()
+    finally:
+        conn.close()
+    engine.dispose()
+
+def run(engine, seconds: float, readers: int, writers: int) -> dict:
+    from sqlalchemy.exc import OperationalError
+    from sqlalchemy.orm import sessionmaker
+    from database.models import OutreachLog
+    from database.utils import get_dashboard_stats
+
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    stop = time.perf_counter() + seconds
+    lock = threading.Lock()
+    results = {"reads": 0, "writes": 0, "locked": 0, "read_ms": [], "write_ms": []}
+
+    def reader():
+        while time.perf_counter() < stop:
+            start = time.perf_counter()
+            with Session() as db:
+                # get_dashboard_stats swallows errors; run its queries directly so they are counted
+                try:
+                    db.query(OutreachLog).count()
+                    db.query(OutreachLog).order_by(OutreachLog.sent_at.desc()).limit(3).all()
+                    get_dashboard_stats(db)
+                except OperationalError:
+                    with lock:
+                        results["locked"] += 1
+                    continue
+            with lock:
+                results["reads"] += 1
+                results["read_ms"].append((time.perf_counter() - start) * 1000)
+
+    def writer(n: int):
+        i = 0
+        while time.perf_counter() < stop:
+            i += 1
+            start = time.perf_counter()
+            with Session() as db:
+                try:
+                    db.add(OutreachLog(name=f"Writer {n}", email=f"w{n}-{i}@example.com", status="sent",
+                                       message_type="outreach", event_id=1))
+                    db.commit()
+                except OperationalError:
+                    db.rollback()
+                    with lock:
+                        results["locked"] += 1
+                    continue
+            with lock:
+                results["writes"] += 1
+                results["write_ms"].append((time.perf_counter() - start) * 1000)
+
+    threads = [threading.Thread(target=reader) for _ in range(readers)]
+    threads += [threading.Thread(target=writer, args=(n,)) for n in range(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+def percentile(values, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite engine configuration under concurrent reads and writes")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--rows", type=int, default=200000, help="Outreach logs seeded before the run")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="hackatwin-engine-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{workdir}/app.db"
+
+    from sqlalchemy import create_engine
+    from database.database import create_db_engine, pool_stats
+
+    print(f"📊 {args.readers} dashboard readers + {args.writers} log writers for {args.seconds:.0f}s "
+          f"on {args.rows:,} outreach logs ({workdir})")
+    configs = (
+        # The previous database.py: driver defaults, rollback journal
+        ("create_engine defaults (old)", lambda url: create_engine(url, connect_args={"check_same_thread": False})),
+        ("create_db_engine (new)", create_db_engine),
+    )
+    for n, (label, make_engine) in enumerate(configs):
+        path = os.path.join(workdir, f"bench{n}.db")
+        seed(path, args.rows)
+        engine = make_engine(f"sqlite:///{path}")
+        results = run(engine, args.seconds, args.readers, args.writers)
+        print(f"   {label}")
+        print(f"      reads {results['reads'] / args.seconds:>8.1f}/s   p50 {statistics.median(results['read_ms'] or [0]):>7.1f} ms"
+              f"   p99 {percentile(results['read_ms'], 0.99):>7.1f} ms")
+        print(f"      writes {results['writes'] / args.seconds:>7.1f}/s   p50 {statistics.median(results['write_ms'] or [0]):>7.1f} ms"
+              f"   p99 {percentile(results['write_ms'], 0.99):>7.1f} ms")
+        print(f"      'database is locked' errors: {results['locked']}")
+        if label.endswith("(new)"):
+            print(f"      pool: {pool_stats(engine)}")
+        engine.dispose()
+
+if __name__ == "__main__":
+    main()
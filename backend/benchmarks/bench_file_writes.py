@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Concurrent write stress test for services/file_utils.
+
+Many processes append to the same JSON Lines log and the same JSON data file
+at once; the run fails if a single record is lost.
+
+Run from the backend directory:
+    python -m benchmarks.bench_file_writes --workers 8 --records 500
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def log_worker(log_path: str, worker: int, records: int):
+    from services.file_utils import append_to_json_file, log_writer
+    for i in range(records):
+        append_to_json_file(log_path, {"worker": worker, "seq": i, "email": f"w{worker}-{i}@example.com"})
+    log_writer.close()
+
+def data_worker(data_path: str, worker: int, records: int):
+    from services.file_utils import update_json_file
+    for i in range(records):
+        update_json_file(data_path, lambda members: members.append({"worker": worker, "seq": i}))
+
+def run(target, path: str, workers: int, records: int) -> float:
+    processes = [multiprocessing.Process(target=target, args=(path, w, records)) for w in range(workers)]
+    start = time.perf_counter()
+    for p in processes:
+        p.start()
+    for p in processes:
+        p.join()
+    return time.perf_counter() - start
+
+def check(entries: list, workers: int, records: int) -> int:
+    expected = {(w, i) for w in range(workers) for i in range(records)}
+    seen = {(e["worker"], e["seq"]) for e in entries}
+    return len(expected - seen)
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent JSON write stress test")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--records", type=int, default=500)
+    parser.add_argument("--data-records", type=int, default=50,
+                        help="records per worker for the read-modify-write data file (O(N) per write)")
+    args = parser.parse_args()
+
+    from services.file_utils import load_json_file, load_json_log
+
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = os.path.join(tmp, "logs", "stress_log.json")
+        data_path = os.path.join(tmp, "data", "community.json")
+
+        total = args.workers * args.records
+        elapsed = run(log_worker, log_path, args.workers, args.records)
+        entries = load_json_log(log_path)
+        lost = check(entries, args.workers, args.records)
+        print(f"📝 Log appends:  {total} records from {args.workers} processes in {elapsed:.2f}s "
+              f"({total / elapsed:.0f}/s) - read back {len(entries)}, lost {lost}")
+
+        data_total = args.workers * args.data_records
+        elapsed = run(data_worker, data_path, args.workers, args.data_records)
+        members = load_json_file(data_path)
+        data_lost = check(members, args.workers, args.data_records)
+        print(f"📦 Data updates: {data_total} records from {args.workers} processes in {elapsed:.2f}s "
+              f"({data_total / elapsed:.0f}/s) - read back {len(members)}, lost {data_lost}")
+
+        leftovers = [name for name in os.listdir(os.path.dirname(data_path)) if name.endswith((".tmp", ".journal"))]
+        if lost or data_lost or len(entries) != total or len(members) != data_total or leftovers:
+            print(f"❌ Stress test failed (leftover files: {leftovers})")
+            sys.exit(1)
+        print("✅ Zero lost records")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Hot query paths before and after the model indexes, on a seeded SQLite
+database (1M outreach logs by default, plus tasks, sponsors, jury members
+and speakers). The database is seeded without the secondary indexes, as an
+existing database would be, then create_missing_indexes() builds them.
+Prints each query's plan (EXPLAIN QUERY PLAN) and median time on both sides.
+
+Run from the backend directory:
+    python -m benchmarks.bench_indexes --rows 1000000
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+EVENTS = 20
+STATUSES = ["sent"] * 60 + ["delivered"] * 25 + ["opened"] * 10 + ["clicked"] * 3 + ["error"] * 2
+START = datetime(2025, 1, 1)
+
+# (label, SQL as the app issues it)
+QUERIES = [
+    ("dashboard: latest outreach", "SELECT * FROM outreach_logs ORDER BY sent_at DESC LIMIT 3"),
+    ("dashboard: latest tasks", "SELECT * FROM tasks ORDER BY created_at DESC LIMIT 2"),
+    ("dashboard: confirmed sponsors", "SELECT COUNT(*) FROM sponsors WHERE status = 'confirmed'"),
+    ("migration: outreach (email, sent_at)",
+     "SELECT id FROM outreach_logs WHERE email = :email AND sent_at = :sent_at LIMIT 1"),
+    ("migration: task (title, assignee)",
+     "SELECT id FROM tasks WHERE title = :title AND assigned_to = :member LIMIT 1"),
+    ("jury member by email", "SELECT id FROM jury_members WHERE email = :email LIMIT 1"),
+    ("speaker by email", "SELECT id FROM speakers WHERE email = :email LIMIT 1"),
+    ("sponsor by contact email", "SELECT id FROM sponsors WHERE contact_email = :email LIMIT 1"),
+    ("tasks of a member (FK)", "SELECT id, title FROM tasks WHERE assigned_to = :member"),
+    ("event outreach errors", "SELECT COUNT(*) FROM outreach_logs WHERE event_id = :event AND status = 'error'"),
+    ("event outreach timeline",
+     "SELECT * FROM outreach_logs WHERE event_id = :event ORDER BY sent_at DESC LIMIT 20"),
+    ("event jury by status", "SELECT * FROM jury_members WHERE event_id = :event AND status = 'accepted'"),
+    ("event sponsors, newest first",
+     "SELECT * FROM sponsors WHERE event_id = :event ORDER BY created_at DESC LIMIT 20"),
+]
+
+def stamp(seconds: int) -> str:
+    """DateTime as SQLAlchemy stores it in SQLite"""
+    return (START + timedelta(seconds=seconds)).strftime("%Y-%m-%d %H:%M:%S.%f")
+
+def seed(engine, rows: int):
+    """Bulk load with the driver directly: events, team members, and the large tables"""
+    rng = random.Random(7)
+    people = max(rows // 20, 1000)
+    tasks = max(rows // 5, 1000)
+    conn = engine.raw_connection()
+    try:
+        cur = conn.cursor()
+        cur.executemany("INSERT INTO events (id, name, status) VALUES (?, ?, 'planning')",
+                        [(i, f"Event {i}") for i in range(1, EVENTS + 1)])
+        cur.executemany(
+            "INSERT INTO team_members (id, name, email, event_id, status, created_at) VALUES (?, ?, ?, ?, 'active', ?)",
+            [(i, f"Volunteer {i}", f"volunteer{i}@example.com", i % EVENTS + 1, stamp(i)) for i in range(1, 10001)])
+        cur.executemany(
+            "INSERT INTO tasks (title, assigned_to, status, created_at) VALUES (?, ?, 'pending', ?)",
+            ((f"Task {i}", i % 10000 + 1, stamp(i * 60)) for i in range(tasks)))
+        cur.executemany(
+            "INSERT INTO outreach_logs (name, email, message_type, status, event_id, sent_at) "
+            "VALUES (?, ?, 'outreach', ?, ?, ?)",
+            ((f"Lead {i}", f"lead{i % (rows // 5 or 1)}@example.com", rng.choice(STATUSES), i % EVENTS + 1, stamp(i))
+             for i in range(rows)))
+        for table, email_column, extra in (("jury_members", "email", "name"), ("speakers", "email", "name"),
+                                           ("sponsors", "contact_email", "company_name")):
+            status = (lambda: rng.choice(["prospective"] * 19 + ["confirmed"])) if table == "sponsors" \
+                else (lambda: rng.choice(["invited", "invited", "accepted", "declined"]))
+            cur.executemany(
+                f"INSERT INTO {table} ({extra}, {email_column}, event_id, status, created_at) VALUES (?, ?, ?, ?, ?)",
+                ((f"{table} {i}", f"{table}{i}@example.com", i % EVENTS + 1, status(), stamp(i * 30))
+                 for i in range(people)))
+        conn.commit()
+    finally:
+        conn.close()
+    return {"people": people, "tasks": tasks}
+
+def query_params(rows: int, counts: dict) -> dict:
+    probe = rows // 2
+    return {
+        "email": f"lead{probe % (rows // 5 or 1)}@example.com",
+        "sent_at": stamp(probe),
+        "title": f"Task {counts['tasks'] // 2}",
+        "member": (counts["tasks"] // 2) % 10000 + 1,
+        "person": counts["people"] // 2,
+        "event": 7,
+    }
+
+def measure(engine, params: dict, repeats: int) -> dict:
+    from sqlalchemy import text
+
+    results = {}
+    with engine.connect() as conn:
+        for label, sql in QUERIES:
+            # Lookups by email probe the middle row of each table
+            bound = dict(params)
+            if "jury_members" in sql:
+                bound["email"] = f"jury_members{params['person']}@example.com"
+            elif "speakers" in sql:
+                bound["email"] = f"speakers{params['person']}@example.com"
+            elif "contact_email" in sql:
+                bound["email"] = f"sponsors{params['person']}@example.com"
+            plan = "; ".join(row[-1] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {sql}"), bound))
+            timings = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                conn.execute(text(sql), bound).fetchall()
+                timings.append(time.perf_counter() - start)
+            results[label] = (plan, statistics.median(timings) * 1000)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Query plans and timings with and without the model indexes")
+    parser.add_argument("--rows", type=int, default=1000000, help="Outreach log rows")
+    parser.add_argument("--repeats", type=int, default=7, help="Runs per query (median reported)")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="hackatwin-indexes-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{workdir}/bench.db"
+
+    from sqlalchemy import text
+    from database.database import Base, engine
+    from database.utils import create_missing_indexes, create_tables
+
+    create_tables()
+    # Start from the schema an existing database has: primary key indexes only
+    seeded = {"events", "team_members", "tasks", "outreach_logs", "jury_members", "speakers", "sponsors"}
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in seeded:
+                continue
+            for index in table.indexes:
+                if [column.name for column in index.columns] != ["id"]:
+                    conn.execute(text(f"DROP INDEX {index.name}"))
+
+    start = time.perf_counter()
+    counts = seed(engine, args.rows)
+    total = args.rows + counts["tasks"] + 3 * counts["people"] + 10000 + EVENTS
+    print(f"📊 Seeded {total:,} rows ({args.rows:,} outreach logs) in {time.perf_counter() - start:.1f}s ({workdir})")
+
+    params = query_params(args.rows, counts)
+    before = measure(engine, params, args.repeats)
+    print("🔧 Running the index migration (create_missing_indexes)")
+    start = time.perf_counter()
+    create_missing_indexes()
+    print(f"   built in {time.perf_counter() - start:.1f}s")
+    after = measure(engine, params, args.repeats)
+
+    print()
+    for label, _ in QUERIES:
+        plan_before, ms_before = before[label]
+        plan_after, ms_after = after[label]
+        speedup = ms_before / ms_after if ms_after else float("inf")
+        print(f"{label}")
+        print(f"   before {ms_before:>9.3f} ms   {plan_before}")
+        print(f"   after  {ms_after:>9.3f} ms   {plan_after}   ({speedup:,.0f}x)")
+
+if __name__ == "__main__":
+    main()
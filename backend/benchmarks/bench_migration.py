@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+migrate_json_to_db timing on a generated outreach log and team task log:
+the old per-entry SELECT ... first() loop vs the set-based, batched
+migration in database/migration.py. Also times an idempotent re-run and a
+re-run with checkpoints dropped (every entry checked against the preloaded keys).
+
+Run from the backend directory:
+    python -m benchmarks.bench_migration --entries 50000
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def write_logs(entries: int, tasks: int):
+    """Legacy JSON array logs, with 1% repeated outreach entries"""
+    os.makedirs("logs", exist_ok=True)
+    start = datetime(2025, 1, 1)
+    outreach = [
+        {"name": f"Lead {i}", "email": f"lead{i}@example.com", "status": "sent",
+         "timestamp": (start + timedelta(seconds=i)).isoformat()}
+        for i in range(entries)
+    ]
+    outreach += outreach[: entries // 100]
+    team = [
+        {"task": f"Task {i}", "assigned_to": f"Volunteer {i % 200}", "email": f"volunteer{i % 200}@example.com",
+         "status": "pending", "timestamp": (start + timedelta(minutes=i)).isoformat()}
+        for i in range(tasks)
+    ]
+    with open("logs/outreach_log.json", "w") as f:
+        json.dump(outreach, f)
+    with open("logs/team_tasks.json", "w") as f:
+        json.dump(team, f)
+    return len(outreach)
+
+def legacy_migrate(default_event_id: int):
+    """The outreach and team task loops of the previous migrate_json_to_db"""
+    from database.database import get_db
+    from database.models import OutreachLog, Task, TeamMember
+    from services.file_utils import load_json_log
+
+    db = next(get_db())
+    try:
+        for entry in load_json_log("logs/outreach_log.json"):
+            existing = db.query(OutreachLog).filter(
+                OutreachLog.email == entry["email"],
+                OutreachLog.sent_at == datetime.fromisoformat(entry["timestamp"])
+            ).first()
+            if not existing:
+                db.add(OutreachLog(name=entry["name"], email=entry["email"], status=entry["status"],
+                                   message_type="outreach", event_id=default_event_id,
+                                   sent_at=datetime.fromisoformat(entry["timestamp"])))
+        for entry in load_json_log("logs/team_tasks.json"):
+            team_member = db.query(TeamMember).filter(TeamMember.email == entry["email"]).first()
+            if not team_member:
+                team_member = TeamMember(name=entry["assigned_to"], email=entry["email"],
+                                         event_id=default_event_id, role="Developer")
+                db.add(team_member)
+                db.commit()
+                db.refresh(team_member)
+            existing_task = db.query(Task).filter(
+                Task.title == entry["task"], Task.assigned_to == team_member.id
+            ).first()
+            if not existing_task:
+                db.add(Task(title=entry["task"], assigned_to=team_member.id, status=entry["status"],
+                            created_at=datetime.fromisoformat(entry["timestamp"])))
+        db.commit()
+    finally:
+        db.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON -> database migration benchmark")
+    parser.add_argument("--entries", type=int, default=50000, help="Outreach log entries")
+    parser.add_argument("--tasks", type=int, default=2000, help="Team task log entries")
+    parser.add_argument("--skip-legacy", action="store_true", help="Only time the new migration")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="hackatwin-migration-")
+    os.chdir(workdir)
+    os.environ["DATABASE_URL"] = f"sqlite:///{workdir}/bench.db"
+    total = write_logs(args.entries, args.tasks)
+
+    from sqlalchemy import text
+    from database.database import engine
+    from database.migration import JsonMigration
+    from database.utils import create_tables
+
+    create_tables()
+    print(f"📊 Migrating {total} outreach entries + {args.tasks} team tasks (SQLite, {workdir})")
+
+    def reset():
+        with engine.begin() as conn:
+            for table in ("tasks", "team_members", "outreach_logs", "migration_checkpoints"):
+                conn.execute(text(f"DELETE FROM {table}"))
+
+    def counts():
+        with engine.connect() as conn:
+            return tuple(conn.execute(text(f"SELECT COUNT(*) FROM {t}")).scalar() for t in ("outreach_logs", "tasks"))
+
+    quiet = lambda *a: None
+    if not args.skip_legacy:
+        event_id = JsonMigration()._default_event()
+        start = time.perf_counter()
+        legacy_migrate(event_id)
+        print(f"   {'per-entry SELECT (old)':<32} {time.perf_counter() - start:>8.2f}s   rows (outreach, tasks)={counts()}")
+        reset()
+
+    for label, restart in (("set-based batches (new)", False), ("re-run, checkpoints", False),
+                           ("re-run, checkpoints dropped", True)):
+        start = time.perf_counter()
+        migration = JsonMigration(restart=restart, progress=quiet)
+        migration.event_id = migration._default_event()
+        for source, path, preload, convert in migration.sources[:2]:
+            migration.migrate_source(source, path, preload, convert)
+        print(f"   {label:<32} {time.perf_counter() - start:>8.2f}s   rows (outreach, tasks)={counts()}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+MIME build cost for one body sent to many recipients: building and encoding
+a MIMEMultipart per recipient (the old _send_gmail path) vs the message
+renderer, which encodes each distinct body once and only writes headers per
+recipient. No network involved; this measures the CPU spent per message.
+
+Run from the backend directory:
+    python -m benchmarks.bench_mime_render --recipients 10000
+"""
+
+import argparse
+import email
+import os
+import sys
+import time
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.message_render import MessageRenderer, html_to_text
+
+BODY = (
+    "<p>Hi there,</p>"
+    "<p>Thanks for joining the HackaTwin community! Here is what happens next:</p>"
+    "<ul><li>Find a team on <a href='https://hackatwin.example/teams'>the teams page</a></li>"
+    "<li>Pick a track &amp; start building</li><li>Demo on Sunday</li></ul>"
+    "<p>See you at the kickoff,<br>The HackaTwin Team</p>"
+) * 4
+
+def legacy_render(from_email: str, to_email: str, subject: str, content: str) -> bytes:
+    msg = MIMEMultipart('alternative')
+    msg['Subject'] = subject
+    msg['From'] = from_email
+    msg['To'] = to_email
+    msg.attach(MIMEText(content.replace('<br>', '\n').replace('<p>', '').replace('</p>', '\n'), 'plain'))
+    msg.attach(MIMEText(content, 'html'))
+    return msg.as_bytes()
+
+def main():
+    parser = argparse.ArgumentParser(description="MIME render cache benchmark")
+    parser.add_argument("--recipients", type=int, default=10000)
+    parser.add_argument("--bodies", type=int, default=1, help="Distinct bodies, round-robin across recipients")
+    args = parser.parse_args()
+
+    bodies = [BODY + f"<p>Ref {i}</p>" for i in range(args.bodies)]
+    recipients = [f"member{i}@example.com" for i in range(args.recipients)]
+    subject = "Welcome to HackaTwin!"
+    print(f"📊 Rendering {args.recipients} messages from {args.bodies} distinct bodies ({len(BODY)} chars)")
+
+    start = time.perf_counter()
+    for i, to in enumerate(recipients):
+        legacy_render("team@hackatwin.local", to, subject, bodies[i % args.bodies])
+    legacy = time.perf_counter() - start
+
+    renderer = MessageRenderer()
+    start = time.perf_counter()
+    for i, to in enumerate(recipients):
+        last = renderer.render("team@hackatwin.local", to, subject, bodies[i % args.bodies])
+    cached = time.perf_counter() - start
+
+    # The cached message must still parse as multipart/alternative addressed to the last recipient
+    parsed = email.message_from_bytes(last)
+    ok = parsed["To"] == recipients[-1] and [p.get_content_type() for p in parsed.walk()] == [
+        "multipart/alternative", "text/plain", "text/html"]
+
+    for label, elapsed in (("MIMEMultipart per recipient", legacy), ("render cache", cached)):
+        print(f"   {label:<28} {elapsed:>7.3f}s   {args.recipients / elapsed:>10.0f} msg/s   "
+              f"{elapsed / args.recipients * 1e6:>7.1f}µs/msg")
+    print(f"   speedup {legacy / cached:.1f}x   cache {renderer.stats()}   message parses ok={ok}")
+
+    # Generated plain text with a "<" in it keeps its paragraphs in the text part
+    plain = "Dear Bob,\n\nHope you are well. 3 < 5, see <Registration Link>\n\nThanks"
+    plain_ok = html_to_text(plain) == plain
+    print(f"   plain text with '<' kept as is ok={plain_ok}")
+    if not (ok and plain_ok):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
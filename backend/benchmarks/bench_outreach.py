@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Outreach pipeline throughput benchmark against a stub LLM and stub SMTP server.
+
+Run from the backend directory:
+    python -m benchmarks.bench_outreach --leads 200 --llm-latency 0.05
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.stubs import StubLLMServer, StubSMTPServer
+
+def make_leads(count: int) -> list:
+    return [
+        {
+            "name": f"Lead {i}",
+            "email": f"lead{i}@example.com",
+            "country": "Testland",
+            "source": "alumni" if i % 2 else "website"
+        }
+        for i in range(count)
+    ]
+
+def configure_services(llm: StubLLMServer, smtp: StubSMTPServer):
+    """Point the real services at the stubs before they are imported"""
+    os.environ.update({
+        "LOCAL_AI_TYPE": "ollama",
+        "LOCAL_AI_URL": llm.url,
+        "AI_FALLBACK": "false",
+        "AI_CACHE_ENABLED": "false",
+        "USE_GMAIL_SMTP": "true",
+        "SMTP_SERVER": smtp.host,
+        "SMTP_PORT": str(smtp.port),
+        "SMTP_USE_TLS": "false",
+        "EMAIL_PASSWORD": "",
+        "FROM_EMAIL": "bench@hackatwin.local",
+    })
+
+async def run_once(leads: list, ai_workers: int, send_workers: int, log_path: str) -> float:
+    from services.ai_service import agenerate_text, ai_service
+    from services.email_service import send_email
+    from services.file_utils import append_to_json_file
+    from services.pipeline import CampaignPipeline
+
+    async def generate(lead):
+        return await agenerate_text(f"Write an outreach email for {lead['name']}")
+
+    pipeline = CampaignPipeline(
+        generate=generate,
+        send=lambda lead, content: send_email(lead["email"], "Benchmark", content),
+        log=lambda result: append_to_json_file(log_path, {"email": result["item"]["email"], "status": result["status"]}),
+        ai_workers=ai_workers,
+        send_workers=send_workers,
+    )
+
+    start = time.perf_counter()
+    try:
+        results = await pipeline.run_all(leads)
+        elapsed = time.perf_counter() - start
+    finally:
+        await ai_service.aclose()  # each run has its own event loop
+
+    failed = [r for r in results if r["status"] != "success"]
+    if failed:
+        print(f"⚠️  {len(failed)} sends failed: {failed[0].get('send_result') or failed[0].get('error')}")
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Outreach pipeline benchmark")
+    parser.add_argument("--leads", type=int, default=200)
+    parser.add_argument("--llm-latency", type=float, default=0.05)
+    parser.add_argument("--smtp-latency", type=float, default=0.01)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    args = parser.parse_args()
+
+    leads = make_leads(args.leads)
+
+    with StubLLMServer(latency=args.llm_latency) as llm, StubSMTPServer(latency=args.smtp_latency) as smtp:
+        configure_services(llm, smtp)
+        print(f"📊 Outreach pipeline benchmark: {args.leads} leads, "
+              f"LLM {args.llm_latency * 1000:.0f}ms, SMTP {args.smtp_latency * 1000:.0f}ms per message")
+        print(f"{'workers':>8} {'seconds':>9} {'leads/s':>9} {'speedup':>8}")
+
+        baseline = None
+        with tempfile.TemporaryDirectory() as tmp:
+            for workers in args.workers:
+                log_path = os.path.join(tmp, f"outreach_{workers}.json")
+                elapsed = asyncio.run(run_once(leads, workers, workers, log_path))
+                baseline = baseline or elapsed
+                print(f"{workers:>8} {elapsed:>9.2f} {args.leads / elapsed:>9.1f} {baseline / elapsed:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+SendGrid round trips for a follow-up campaign: one request per member
+(mode=template) vs personalization batches (mode=batch), against a fake
+SendGrid endpoint and a stub LLM.
+
+Run from the backend directory:
+    python -m benchmarks.bench_sendgrid_batch --members 2500
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.stubs import StubLLMServer, StubSendGridServer
+
+def make_members(count: int) -> list:
+    return [
+        {"name": f"Member {i}", "email": f"member{i}@example.com", "country": "Testland"}
+        for i in range(count)
+    ]
+
+def configure_services(llm: StubLLMServer, sendgrid: StubSendGridServer):
+    """Point the real services at the stubs before they are imported"""
+    os.environ.update({
+        "LOCAL_AI_TYPE": "ollama",
+        "LOCAL_AI_URL": llm.url,
+        "AI_FALLBACK": "false",
+        "AI_CACHE_ENABLED": "false",
+        "USE_GMAIL_SMTP": "false",
+        "SENDGRID_API_KEY": "SG.fake",
+        "SENDGRID_API_HOST": sendgrid.url,
+        "FROM_EMAIL": "bench@hackatwin.local",
+        "EMAIL_RATE_SENDGRID": "0",
+        "EMAIL_DELIVERY": "direct",
+        "EMAIL_RETRY_BASE_DELAY": "0.01",
+    })
+
+async def run_mode(mode: str, members: list, send_workers: int):
+    from services.campaigns import CampaignRun, FollowupCampaign
+
+    run = CampaignRun(FollowupCampaign(), mode=mode, send_workers=send_workers)
+    start = time.perf_counter()
+    results = await run.run_all(members)
+    return time.perf_counter() - start, results
+
+def main():
+    parser = argparse.ArgumentParser(description="SendGrid batch mode benchmark")
+    parser.add_argument("--members", type=int, default=2500)
+    parser.add_argument("--latency", type=float, default=0.05, help="Fake SendGrid latency per request")
+    parser.add_argument("--send-workers", type=int, default=8)
+    parser.add_argument("--throttle", type=int, default=1, help="429 responses before the batch run succeeds")
+    args = parser.parse_args()
+
+    members = make_members(args.members)
+    print(f"📊 SendGrid follow-up to {args.members} members (fake API latency {args.latency * 1000:.0f}ms)")
+
+    with StubLLMServer(latency=0.01) as llm, StubSendGridServer(latency=args.latency) as sendgrid:
+        configure_services(llm, sendgrid)
+        for mode, throttle in (("template", 0), ("batch", args.throttle)):
+            requests_before, payloads_before = sendgrid.requests, len(sendgrid.payloads)
+            sendgrid.httpd.throttle_next = throttle
+            elapsed, results = asyncio.run(run_mode(mode, members, args.send_workers))
+            sent = sum(1 for r in results if r["status"] == "success")
+
+            # Every recipient must get exactly one personalization with their own name
+            names = {}
+            for payload in sendgrid.payloads[payloads_before:]:
+                for personalization in payload["personalizations"]:
+                    email = personalization["to"][0]["email"]
+                    names[email] = personalization.get("substitutions", {}).get("{{name}}")
+            personalized = mode != "batch" or all(names.get(m["email"]) == m["name"] for m in members)
+
+            print(f"   {mode:<9} {elapsed:>7.2f}s   API requests={sendgrid.requests - requests_before:<5} "
+                  f"sent={sent}/{len(members)}   per-recipient substitutions ok={personalized}")
+
+if __name__ == "__main__":
+    main()
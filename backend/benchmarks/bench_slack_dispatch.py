@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Slack sends for /assign_tasks-style DMs and channel announcements against a
+fake Web API: the old loop (conversations.open + chat.postMessage per DM,
+one at a time) vs the dispatcher (cached DM channels, concurrent sends,
+Retry-After handling, coalesced channel posts), threaded and asyncio.
+
+Run from the backend directory:
+    python -m benchmarks.bench_slack_dispatch --members 40
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from concurrent.futures import TimeoutError as FutureTimeout
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.stubs import StubSlackServer
+from services.slack_dispatch import MAX_COALESCED_CHARS
+
+def legacy_dm(client, user_id: str, text: str) -> dict:
+    conversation = client.conversations_open(users=[user_id])
+    response = client.chat_postMessage(channel=conversation["channel"]["id"], text=text)
+    return {"status": "success", "ts": response["ts"]}
+
+def main():
+    parser = argparse.ArgumentParser(description="Slack dispatcher benchmark")
+    parser.add_argument("--members", type=int, default=40)
+    parser.add_argument("--latency", type=float, default=0.05, help="Fake Slack API latency per call")
+    parser.add_argument("--announcements", type=int, default=10, help="Channel posts fired at once")
+    parser.add_argument("--throttle", type=int, default=2, help="429 responses (Retry-After: 1) in the last round")
+    args = parser.parse_args()
+
+    with StubSlackServer(latency=args.latency) as slack:
+        os.environ.update({"SLACK_BOT_TOKEN": "xoxb-fake", "SLACK_API_URL": slack.url, "SLACK_CHANNEL_ID": "C1"})
+        from services.slack_service import slack_service
+
+        members = [f"U{i:04d}" for i in range(args.members)]
+        text = "You have new task assignments:\n\n- Build the demo\n- Book the venue"
+        print(f"📊 Slack DMs to {args.members} members (fake API latency {args.latency * 1000:.0f}ms)")
+
+        dispatcher = slack_service.dispatcher
+        failures = []
+
+        def report(label, elapsed, results, before):
+            calls = {m: n - before.get(m, 0) for m, n in slack.calls.items()}
+            ok = sum(1 for r in results if r["status"] == "success")
+            print(f"   {label:<34} {elapsed:>6.2f}s   ok={ok}/{len(results)}   "
+                  f"conversations.open={calls.get('conversations.open', 0):<4} "
+                  f"chat.postMessage={calls.get('chat.postMessage', 0):<4} 429s={dispatcher.rate_limited - before.get('429', 0)}")
+
+        before = {**slack.calls, "429": dispatcher.rate_limited}
+        start = time.perf_counter()
+        results = [legacy_dm(slack_service.client, user, text) for user in members]
+        report("serial loop", time.perf_counter() - start, results, before)
+
+        messages = [{"user_id": user, "text": text} for user in members]
+        for label in ("dispatcher, cold DM cache", "dispatcher, warm DM cache"):
+            before = {**slack.calls, "429": dispatcher.rate_limited}
+            start = time.perf_counter()
+            results = slack_service.send_many(messages)
+            report(label, time.perf_counter() - start, results, before)
+
+        slack.httpd.throttle_next = args.throttle
+        before = {**slack.calls, "429": dispatcher.rate_limited}
+        start = time.perf_counter()
+        results = slack_service.send_many(messages)
+        report(f"dispatcher, {args.throttle} x 429", time.perf_counter() - start, results, before)
+
+        # The handlers' path: AsyncWebClient on a shared aiohttp pool, same limits and DM cache
+        async def async_round():
+            try:
+                return await slack_service.async_send_many(messages)
+            finally:
+                await slack_service.aclose()
+
+        before = {**slack.calls, "429": dispatcher.rate_limited}
+        start = time.perf_counter()
+        results = asyncio.run(async_round())
+        report("async dispatcher, warm DM cache", time.perf_counter() - start, results, before)
+
+        before, posts_before = {**slack.calls, "429": dispatcher.rate_limited}, len(slack.posts)
+        start = time.perf_counter()
+        futures = [slack_service.queue_message("C1", f"🎉 Welcome member {i}!") for i in range(args.announcements)]
+        results = [future.result() for future in futures]
+        report(f"{args.announcements} channel posts, coalesced", time.perf_counter() - start, results, before)
+        merged = slack.posts[posts_before:]
+        print(f"   channel posts made: {len(merged)}, messages in them: {sum(len(p[1].split(chr(10) * 2)) for p in merged)}")
+        print(f"   dispatcher {dispatcher.stats()}")
+
+        # Texts that do not fit one post: every batch must still be posted and resolved
+        long_texts = ["x" * (MAX_COALESCED_CHARS * 3 // 4), "y" * (MAX_COALESCED_CHARS * 3 // 4)]
+
+        async def async_overflow():
+            futures = [slack_service.async_dispatcher().submit("C2", text=t) for t in long_texts]
+            try:
+                return await asyncio.wait_for(asyncio.gather(*futures), 10)
+            finally:
+                await slack_service.aclose()
+
+        def threaded_overflow():
+            futures = [slack_service.queue_message("C2", t) for t in long_texts]
+            return [future.result(10) for future in futures]
+
+        for label, run in (("threaded", threaded_overflow),
+                           ("async", lambda: asyncio.run(async_overflow()))):
+            posts_before = len(slack.posts)
+            try:
+                results = run()
+            except (TimeoutError, asyncio.TimeoutError, FutureTimeout):
+                results = []
+            posted = len(slack.posts) - posts_before
+            ok = len(results) == len(long_texts) and all(r["status"] == "success" for r in results) and posted == 2
+            print(f"   {'✅' if ok else '❌'} {label} overflow past {MAX_COALESCED_CHARS} chars: "
+                  f"{len(results)}/{len(long_texts)} resolved, {posted} posts")
+            if not ok:
+                failures.append(f"{label} overflow")
+
+        # A loop that ends without aclose: its queued batch is sent and its session closed from the next loop
+        async def leave_queued():
+            slack_service.async_dispatcher().submit("C3", text="left in the window")
+            return slack_service._async_session
+
+        async def next_loop():
+            try:
+                return await asyncio.wait_for(slack_service.async_queue_message("C3", "next loop"), 10)
+            finally:
+                await slack_service.aclose()
+
+        posts_before = len(slack.posts)
+        dispatcher.coalesce_window, window = 5.0, dispatcher.coalesce_window
+        old_session = asyncio.run(leave_queued())
+        dispatcher.coalesce_window = window
+        asyncio.run(next_loop())
+        texts = [text for _, text in slack.posts[posts_before:]]
+        ok = "left in the window" in "\n\n".join(texts) and old_session.closed
+        print(f"   {'✅' if ok else '❌'} loop change: {len(texts)} posts, old session closed={old_session.closed}")
+        if not ok:
+            failures.append("loop change")
+        slack_service.close()
+    if failures:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
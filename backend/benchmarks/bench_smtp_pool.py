@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+SMTP transport benchmark: connection per message vs pooled sessions.
+
+The stub charges --handshake-latency for EHLO and again for AUTH, standing in
+for the TLS handshake and login that dominate unpooled sends.
+
+Run from the backend directory:
+    python -m benchmarks.bench_smtp_pool --messages 200 --handshake-latency 0.05
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.stubs import StubSMTPServer
+
+def configure_email(smtp: StubSMTPServer, pool_size: int, max_messages: int):
+    os.environ.update({
+        "USE_GMAIL_SMTP": "true",
+        "SMTP_SERVER": smtp.host,
+        "SMTP_PORT": str(smtp.port),
+        "SMTP_USE_TLS": "false",
+        "EMAIL_PASSWORD": "bench-password",
+        "FROM_EMAIL": "bench@hackatwin.local",
+        "SMTP_POOL_SIZE": str(pool_size),
+        "SMTP_POOL_MAX_MESSAGES": str(max_messages),
+    })
+
+def run(args, label: str, pool_size: int, threads: int) -> None:
+    with StubSMTPServer(latency=args.smtp_latency, handshake_latency=args.handshake_latency,
+                        max_messages_per_connection=args.server_cap) as smtp:
+        configure_email(smtp, pool_size, args.max_messages)
+        from services.email_service import EmailService
+
+        service = EmailService()
+        send = lambda i: service.send_email(f"lead{i}@example.com", "Benchmark", f"<p>Hello {i}</p>")
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            results = list(executor.map(send, range(args.messages)))
+        elapsed = time.perf_counter() - start
+        service.close()
+
+        failed = [r for r in results if r["status"] != "success"]
+        print(f"   {label:<28} {args.messages / elapsed:>8.1f} msg/s   "
+              f"connections={smtp.connections:<4} logins={smtp.logins:<4} failed={len(failed)}")
+        if failed:
+            print(f"      first error: {failed[0]['message']}")
+
+def main():
+    parser = argparse.ArgumentParser(description="SMTP connection pool benchmark")
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--smtp-latency", type=float, default=0.005)
+    parser.add_argument("--handshake-latency", type=float, default=0.05)
+    parser.add_argument("--pool-size", type=int, default=4)
+    parser.add_argument("--max-messages", type=int, default=100, help="Pool recycles a session after this many")
+    parser.add_argument("--server-cap", type=int, default=0, help="Stub hangs up (421) after this many per connection")
+    args = parser.parse_args()
+
+    print(f"📊 SMTP benchmark: {args.messages} messages, handshake {args.handshake_latency * 1000:.0f}ms x2, "
+          f"message {args.smtp_latency * 1000:.0f}ms")
+    run(args, "serial, connection/message", pool_size=0, threads=1)
+    run(args, "pooled, 1 thread", pool_size=1, threads=1)
+    run(args, f"pooled, {args.pool_size} threads", pool_size=args.pool_size, threads=args.pool_size)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Statement budgets for the list and dashboard paths. Seeds a throwaway
+database with full pages of rows (every task with its own assignee, some
+unassigned), calls each endpoint under database.query_count.assert_max_queries
+and exits non-zero when one issues more statements than its budget, so a
+lazy load per row (N+1) fails the check.
+
+Run from the backend directory:
+    python -m benchmarks.check_query_counts
+"""
+
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+ROWS = 150  # more than a page (limit=100), so every list also builds a next cursor
+
+# (path, budget): one SELECT per page, whatever the order (the cursor key comes from the last row)
+ENDPOINT_BUDGETS = [
+    ("/api/db/tasks", 1),
+    ("/api/db/tasks?order_by=created_at", 1),
+    ("/api/db/tasks?fields=id,title", 1),
+    ("/api/db/team-members", 1),
+    ("/api/db/jury-members", 1),
+    ("/api/db/speakers?order_by=created_at", 1),
+    ("/api/db/sponsors", 1),
+    ("/api/db/agendas", 1),
+    ("/api/db/community-members", 1),
+    ("/api/db/events", 1),
+]
+# get_dashboard_stats: every count in one SELECT, the activity feed in one UNION ALL
+DASHBOARD_BUDGET = 2
+
+def seed():
+    from database.database import SessionLocal
+    from database.models import Agenda, CommunityMember, Event, JuryMember, Speaker, Sponsor, Task, TeamMember
+
+    start = datetime(2025, 1, 1)
+    with SessionLocal() as db:
+        db.add(Event(id=1, name="HackaTwin 2025", status="planning"))
+        db.bulk_insert_mappings(TeamMember, [
+            {"id": i + 1, "name": f"Volunteer {i}", "email": f"volunteer{i}@example.com", "event_id": 1}
+            for i in range(ROWS)
+        ])
+        # Every tenth task is unassigned
+        db.bulk_insert_mappings(Task, [
+            {"title": f"Task {i}", "assigned_to": None if i % 10 == 0 else i + 1, "status": "pending",
+             "created_at": start + timedelta(minutes=i)}
+            for i in range(ROWS)
+        ])
+        for model, extra in ((JuryMember, {"expertise": "AI"}), (Speaker, {"topic": "Agents"})):
+            db.bulk_insert_mappings(model, [
+                {"name": f"Person {i}", "email": f"{model.__tablename__}{i}@example.com", "event_id": 1,
+                 "created_at": start + timedelta(minutes=i), **extra}
+                for i in range(ROWS)
+            ])
+        db.bulk_insert_mappings(Sponsor, [
+            {"company_name": f"Company {i}", "contact_email": f"sponsor{i}@example.com", "event_id": 1,
+             "status": "confirmed" if i % 4 == 0 else "prospective"}
+            for i in range(ROWS)
+        ])
+        db.bulk_insert_mappings(Agenda, [
+            {"event_id": 1, "title": f"Agenda {i}", "content": "Keynote", "created_at": start + timedelta(hours=i)}
+            for i in range(ROWS)
+        ])
+        db.bulk_insert_mappings(CommunityMember, [
+            {"name": f"Member {i}", "email": f"member{i}@example.com"} for i in range(ROWS)
+        ])
+        db.commit()
+
+def main():
+    workdir = tempfile.mkdtemp(prefix="hackatwin-queries-")
+    os.environ.update({"DATABASE_URL": f"sqlite:///{workdir}/queries.db",
+                       "JOB_WORKER_INPROCESS": "false", "OUTBOX_WORKER_INPROCESS": "false"})
+
+    from fastapi.testclient import TestClient
+    import main as api
+    from database.database import SessionLocal
+    from database.query_count import assert_max_queries
+    from database.stats import dashboard_stats_cache
+    from database.utils import get_dashboard_stats
+
+    failures = []
+
+    def check(label, budget, call):
+        try:
+            with assert_max_queries(budget) as counter:
+                call()
+            print(f"   ✅ {label:<45} {counter.count:>3} statements (budget {budget})")
+        except AssertionError as e:
+            print(f"   ❌ {label:<45} {e}")
+            failures.append(label)
+
+    with TestClient(api.app) as client:
+        seed()
+        print(f"📊 Statements per request ({ROWS} rows per table)")
+        def get(path):
+            response = client.get(path)
+            assert response.status_code == 200, f"{path}: HTTP {response.status_code}"
+
+        for path, budget in ENDPOINT_BUDGETS:
+            check(path, budget, lambda path=path: get(path))
+
+        tasks = client.get("/api/db/tasks").json()["tasks"]
+        unassigned = sum(1 for task in tasks if task["assigned_to"] == "Unassigned")
+        if unassigned != sum(1 for i in range(min(ROWS, 100)) if i % 10 == 0):
+            print(f"   ❌ /api/db/tasks returned {unassigned} unassigned tasks")
+            failures.append("unassigned tasks")
+
+        def dashboard():
+            with SessionLocal() as db:
+                get_dashboard_stats(db)
+        dashboard_stats_cache.invalidate()  # measure the queries, not a cache hit
+        check("get_dashboard_stats", DASHBOARD_BUDGET, dashboard)
+        check("get_dashboard_stats (cached)", 0, dashboard)
+        check("/api/stats/dashboard/db (cached)", 0, lambda: get("/api/stats/dashboard/db"))
+
+    if failures:
+        print(f"💥 {len(failures)} over budget")
+        sys.exit(1)
+    print("🎉 All within budget")
+
+if __name__ == "__main__":
+    main()
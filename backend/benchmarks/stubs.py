@@ -0,0 +1,325 @@
+"""
+Local stub servers used by the benchmark scripts.
+Nothing here talks to a real model, mail provider or Slack.
+"""
+
+import json
+import socketserver
+import threading
+import time
+from urllib.parse import parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class _LLMHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        self.server.requests += 1
+        time.sleep(self.server.latency)
+
+        text = "Hello from the stub model! Join us at HackaTwin."
+        if self.path == "/api/generate":
+            body = {"response": text}
+        else:
+            body = {"choices": [{"message": {"content": text}}]}
+
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+class StubLLMServer:
+    """Answers Ollama (/api/generate) and OpenAI-style (/v1/chat/completions) calls after a fixed delay"""
+
+    def __init__(self, latency: float = 0.05, port: int = 0):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), _LLMHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.latency = latency
+        self.httpd.requests = 0
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    @property
+    def requests(self) -> int:
+        return self.httpd.requests
+
+    def __enter__(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+class _SendGridHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        server = self.server
+        time.sleep(server.latency)
+
+        with server.lock:
+            server.requests += 1
+            throttled = server.throttle_next > 0
+            if throttled:
+                server.throttle_next -= 1
+            else:
+                server.payloads.append(body)
+                server.personalizations += len(body.get("personalizations", []))
+
+        if self.path != "/v3/mail/send":
+            self._respond(404, b'{"errors": [{"message": "not found"}]}')
+        elif throttled:
+            self._respond(429, b'{"errors": [{"message": "too many requests"}]}', {"Retry-After": "0"})
+        else:
+            self._respond(202, b"")
+
+    def _respond(self, status: int, payload: bytes, headers: dict = None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+class StubSendGridServer:
+    """
+    Fake SendGrid v3 /mail/send endpoint: accepts mail with 202 and records
+    each payload. throttle_next answers that many requests with 429 first.
+    Point EmailService at it with SENDGRID_API_HOST=server.url.
+    """
+
+    def __init__(self, latency: float = 0.05, throttle_next: int = 0, port: int = 0):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), _SendGridHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.latency = latency
+        self.httpd.throttle_next = throttle_next
+        self.httpd.lock = threading.Lock()
+        self.httpd.requests = 0
+        self.httpd.personalizations = 0
+        self.httpd.payloads = []
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    @property
+    def requests(self) -> int:
+        return self.httpd.requests
+
+    @property
+    def personalizations(self) -> int:
+        return self.httpd.personalizations
+
+    @property
+    def payloads(self) -> list:
+        return self.httpd.payloads
+
+    def __enter__(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    disable_nagle_algorithm = True
+
+    def reply(self, line: str):
+        self.wfile.write((line + "\r\n").encode())
+
+    def handle(self):
+        server = self.server
+        self.reply("220 stub.local ESMTP ready")
+        delivered = 0
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode(errors="replace").strip().upper()
+            if command.startswith("EHLO"):
+                self.wfile.write(b"250-stub.local\r\n250-AUTH PLAIN LOGIN\r\n250 8BITMIME\r\n")
+                server.connections += 1
+                time.sleep(server.handshake_latency)
+            elif command.startswith("HELO"):
+                self.reply("250 stub.local")
+            elif command.startswith("AUTH"):
+                server.logins += 1
+                time.sleep(server.handshake_latency)
+                self.reply("235 2.7.0 Authentication successful")
+            elif command.startswith("MAIL") and server.max_messages_per_connection and delivered >= server.max_messages_per_connection:
+                # Like providers that cap messages per connection
+                self.reply("421 4.7.0 Too many messages on this connection")
+                return
+            elif command.startswith("MAIL") or command.startswith("RCPT") or command.startswith("RSET"):
+                self.reply("250 OK")
+            elif command.startswith("NOOP"):
+                self.reply("250 OK")
+            elif command == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                while self.rfile.readline() not in (b".\r\n", b".\n", b""):
+                    pass
+                time.sleep(server.latency)
+                server.messages += 1
+                delivered += 1
+                self.reply("250 OK queued")
+            elif command == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Command not implemented")
+
+class _ThreadingSMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+class StubSMTPServer:
+    """
+    Plain-text SMTP sink. handshake_latency is paid per EHLO/AUTH to mimic
+    TLS + login cost, latency is paid per message. max_messages_per_connection
+    makes the server answer 421 and hang up once a session has sent that many.
+    """
+
+    def __init__(self, latency: float = 0.01, handshake_latency: float = 0.0, port: int = 0,
+                 max_messages_per_connection: int = 0):
+        self.server = _ThreadingSMTPServer(("127.0.0.1", port), _SMTPHandler)
+        self.server.latency = latency
+        self.server.handshake_latency = handshake_latency
+        self.server.max_messages_per_connection = max_messages_per_connection
+        self.server.messages = 0
+        self.server.connections = 0
+        self.server.logins = 0
+
+    @property
+    def host(self) -> str:
+        return self.server.server_address[0]
+
+    @property
+    def port(self) -> int:
+        return self.server.server_address[1]
+
+    @property
+    def messages(self) -> int:
+        return self.server.messages
+
+    @property
+    def connections(self) -> int:
+        return self.server.connections
+
+    @property
+    def logins(self) -> int:
+        return self.server.logins
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+class _SlackHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        raw = self.rfile.read(length).decode() if length else ""
+        if self.headers.get("Content-Type", "").startswith("application/json"):
+            args = json.loads(raw or "{}")
+        else:
+            args = {key: values[0] for key, values in parse_qs(raw).items()}
+        # AsyncWebClient sends some arguments in the query string
+        path, _, query = self.path.partition("?")
+        args.update({key: values[0] for key, values in parse_qs(query).items()})
+        method = path.rsplit("/", 1)[-1]
+        server = self.server
+        time.sleep(server.latency)
+
+        with server.lock:
+            server.calls[method] = server.calls.get(method, 0) + 1
+            throttled = server.throttle_next > 0
+            if throttled:
+                server.throttle_next -= 1
+            elif method == "chat.postMessage":
+                server.posts.append((args.get("channel"), args.get("text")))
+
+        if throttled:
+            self._respond(429, {"ok": False, "error": "ratelimited"}, {"Retry-After": str(server.retry_after)})
+        elif method == "conversations.open":
+            users = args.get("users", "")
+            self._respond(200, {"ok": True, "channel": {"id": "D" + str(users).strip("[]'\" ")}})
+        elif method == "chat.postMessage":
+            self._respond(200, {"ok": True, "channel": args.get("channel"), "ts": f"{time.time():.6f}"})
+        elif method == "chat.scheduleMessage":
+            self._respond(200, {"ok": True, "scheduled_message_id": f"Q{len(server.posts)}"})
+        else:
+            self._respond(200, {"ok": False, "error": "unknown_method"})
+
+    def _respond(self, status: int, payload: dict, headers: dict = None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class StubSlackServer:
+    """
+    Fake Slack Web API (conversations.open, chat.postMessage, chat.scheduleMessage).
+    Counts calls per method and records posts; throttle_next answers that many
+    calls with 429 and Retry-After: retry_after. Point SlackService at it with
+    SLACK_API_URL=server.url.
+    """
+
+    def __init__(self, latency: float = 0.05, throttle_next: int = 0, retry_after: int = 1, port: int = 0):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), _SlackHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.latency = latency
+        self.httpd.throttle_next = throttle_next
+        self.httpd.retry_after = retry_after
+        self.httpd.lock = threading.Lock()
+        self.httpd.calls = {}
+        self.httpd.posts = []
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}/api/"
+
+    @property
+    def calls(self) -> dict:
+        return self.httpd.calls
+
+    @property
+    def posts(self) -> list:
+        return self.httpd.posts
+
+    def __enter__(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -1,23 +1,288 @@
-from sqlalchemy import create_engine, MetaData
+from sqlalchemy import create_engine, event, MetaData
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import NoSuchModuleError, TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 import os
+import threading
+import time
+import weakref
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Union
 from dotenv import load_dotenv
+from starlette.concurrency import run_in_threadpool
 
 load_dotenv()
 
 # Database configuration
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./hackatwin.db")
+# Same database through an asyncio driver; derived from DATABASE_URL unless set
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", "")
+
+# Pool settings (client/server databases; file SQLite uses the same pool, sized down)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000"))
+
+# SQLite pragmas, applied to every new connection
+SQLITE_PRAGMAS = {
+    "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+    "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "10000")),
+    "cache_size": -int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536")),  # negative = KiB
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", "268435456")),
+    "temp_store": "MEMORY",
+}
+
+# PoolMetrics of each engine made by create_db_engine
+_engine_metrics: "weakref.WeakKeyDictionary[Engine, PoolMetrics]" = weakref.WeakKeyDictionary()
+
+class PoolMetrics:
+    """Connection checkouts, how long they waited for a free connection, and pool timeouts"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.connects = 0
+        self.timeouts = 0
+        self.checked_out = 0
+        self.peak_checked_out = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def waited(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            self.wait_seconds += seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def attach(self, engine: Engine):
+        @event.listens_for(engine, "connect")
+        def on_connect(dbapi_connection, connection_record):
+            with self._lock:
+                self.connects += 1
+
+        @event.listens_for(engine, "checkout")
+        def on_checkout(dbapi_connection, connection_record, connection_proxy):
+            with self._lock:
+                self.checkouts += 1
+                self.checked_out += 1
+                self.peak_checked_out = max(self.peak_checked_out, self.checked_out)
+
+        @event.listens_for(engine, "checkin")
+        def on_checkin(dbapi_connection, connection_record):
+            with self._lock:
+                self.checked_out = max(0, self.checked_out - 1)
+
+    def stats(self, pool=None) -> Dict[str, Any]:
+        with self._lock:
+            stats = {
+                "checkouts": self.checkouts,
+                "checked_out": self.checked_out,
+                "peak_checked_out": self.peak_checked_out,
+                "connects": self.connects,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": round(self.wait_seconds / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                "max_wait_ms": round(self.max_wait_seconds * 1000, 3),
+            }
+        if isinstance(pool, QueuePool):
+            stats.update({"pool_size": pool.size(), "idle": pool.checkedin(), "overflow": max(0, pool.overflow())})
+        return stats
+
+class MeteredQueuePool(QueuePool):
+    """QueuePool that reports how long each checkout waited (opening a new connection included)"""
+
+    metrics: Optional[PoolMetrics] = None
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            if self.metrics:
+                self.metrics.waited(time.perf_counter() - start, timed_out=True)
+            raise
+        if self.metrics:
+            self.metrics.waited(time.perf_counter() - start)
+        return connection
+
+    def recreate(self):
+        # dispose() and invalidation replace the pool; keep counting into the same metrics
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+class MeteredAsyncQueuePool(MeteredQueuePool, AsyncAdaptedQueuePool):
+    """MeteredQueuePool for asyncio engines"""
+
+def async_database_url(url: str) -> str:
+    """The asyncio driver URL for a database URL: aiosqlite for SQLite, asyncpg for Postgres"""
+    parsed = make_url(url)
+    drivers = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+    backend = parsed.get_backend_name()
+    if backend not in drivers:
+        raise ValueError(f"No asyncio driver configured for {backend}; set ASYNC_DATABASE_URL")
+    return parsed.set(drivername=drivers[backend]).render_as_string(hide_password=False)
+
+def _apply_sqlite_pragmas(engine: Engine, pragmas: Dict[str, Any]):
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+def engine_options(url: str, is_async: bool = False) -> Dict[str, Any]:
+    """create_engine() / create_async_engine() keyword arguments for the backend in `url`"""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    poolclass = MeteredAsyncQueuePool if is_async else MeteredQueuePool
+    if backend == "sqlite":
+        options: Dict[str, Any] = {
+            # Sessions move between request/worker threads; the busy timeout also covers the driver's own wait
+            "connect_args": {"check_same_thread": False, "timeout": SQLITE_PRAGMAS["busy_timeout"] / 1000},
+        }
+        if parsed.database and parsed.database != ":memory:":
+            # One writer at a time in SQLite, so a few connections are plenty
+            options.update({
+                "poolclass": poolclass,
+                "pool_size": min(DB_POOL_SIZE, 5),
+                "max_overflow": min(DB_MAX_OVERFLOW, 10),
+                "pool_timeout": DB_POOL_TIMEOUT,
+            })
+        return options
+
+    options = {
+        "poolclass": poolclass,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,  # before server/proxy idle timeouts close them
+        "pool_pre_ping": True,
+    }
+    if backend == "postgresql" and DB_STATEMENT_TIMEOUT_MS > 0:
+        if parsed.get_driver_name() == "asyncpg":
+            options["connect_args"] = {"server_settings": {"statement_timeout": str(DB_STATEMENT_TIMEOUT_MS)}}
+        elif parsed.get_driver_name() in ("psycopg2", "psycopg"):
+            options["connect_args"] = {"options": f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"}
+    return options
+
+def _instrument(new_engine: Engine) -> Engine:
+    """Pragmas (SQLite) and pool metrics for an engine, or the sync_engine of an async one"""
+    if new_engine.dialect.name == "sqlite":
+        _apply_sqlite_pragmas(new_engine, SQLITE_PRAGMAS)
+    metrics = PoolMetrics()
+    metrics.attach(new_engine)
+    if isinstance(new_engine.pool, MeteredQueuePool):
+        new_engine.pool.metrics = metrics
+    _engine_metrics[new_engine] = metrics
+    return new_engine
+
+def create_db_engine(url: str = DATABASE_URL, **overrides) -> Engine:
+    """
+    Engine with the preset for its backend (see engine_options): SQLite gets WAL,
+    busy timeout, cache and mmap pragmas on every connection; Postgres and others
+    a sized, pre-pinged, recycled pool. Keyword arguments override the preset.
+    """
+    options = {**engine_options(url), **overrides}
+    return _instrument(create_engine(url, **options))
+
+def create_async_db_engine(url: str, **overrides) -> AsyncEngine:
+    """create_db_engine for an asyncio driver URL (see async_database_url)"""
+    options = {**engine_options(url, is_async=True), **overrides}
+    async_db_engine = create_async_engine(url, **options)
+    _instrument(async_db_engine.sync_engine)
+    return async_db_engine
+
+def pool_stats(db_engine: Union[Engine, AsyncEngine] = None) -> Dict[str, Any]:
+    """Checkout counts, waits and timeouts for an engine made by create_db_engine / create_async_db_engine"""
+    db_engine = getattr(db_engine, "sync_engine", db_engine) or engine
+    metrics = _engine_metrics.get(db_engine)
+    stats = metrics.stats(db_engine.pool) if metrics else {}
+    return {"backend": db_engine.dialect.name, "pool": type(db_engine.pool).__name__, **stats}
 
 # Create engine
-if DATABASE_URL.startswith("sqlite"):
-    engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
-else:
-    engine = create_engine(DATABASE_URL)
+engine = create_db_engine(DATABASE_URL)
 
 # Create session maker
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine and sessions for handlers that query without blocking the event loop.
+# Built on first use, so a backend without an asyncio driver only loses the async path
+# (get_async_db then runs sync sessions in the thread pool) instead of failing at import.
+_async_engine: Optional[AsyncEngine] = None
+_async_session_factory = None
+_async_engine_unavailable = False
+_async_engine_lock = threading.Lock()
+_async_engine_hooks: List[Callable[[AsyncEngine], None]] = []
+
+def get_async_engine() -> Optional[AsyncEngine]:
+    """The async engine (created on first call), or None when no asyncio driver is available"""
+    global _async_engine, _async_session_factory, _async_engine_unavailable
+    if _async_engine is not None or _async_engine_unavailable:
+        return _async_engine
+    with _async_engine_lock:
+        if _async_engine is None and not _async_engine_unavailable:
+            try:
+                new_engine = create_async_db_engine(ASYNC_DATABASE_URL or async_database_url(DATABASE_URL))
+            except (ValueError, ImportError, NoSuchModuleError) as e:
+                print(f"⚠️  No async database engine ({e}); async endpoints use the sync engine in threads")
+                _async_engine_unavailable = True
+                return None
+            for hook in _async_engine_hooks:
+                hook(new_engine)
+            _async_session_factory = async_sessionmaker(new_engine, autoflush=False, expire_on_commit=False)
+            _async_engine = new_engine
+    return _async_engine
+
+def on_async_engine(hook: Callable[[AsyncEngine], None]):
+    """Call `hook` with the async engine once it exists (right away if it already does)"""
+    with _async_engine_lock:
+        _async_engine_hooks.append(hook)
+        if _async_engine is not None:
+            hook(_async_engine)
+
+async def dispose_async_engine():
+    """Close the async engine's pooled connections, if it was ever created"""
+    if _async_engine is not None:
+        await _async_engine.dispose()
+
+class ThreadpoolSession:
+    """
+    The part of AsyncSession the async endpoints use, backed by a sync Session whose
+    calls run in the thread pool; what get_async_db yields without an async engine.
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    async def execute(self, statement, params=None):
+        # Fetch everything in the thread, so no cursor I/O happens on the event loop
+        frozen = await run_in_threadpool(lambda: self.session.execute(statement, params).freeze())
+        return frozen()
+
+    async def scalars(self, statement, params=None):
+        return (await self.execute(statement, params)).scalars()
+
+    async def scalar(self, statement, params=None):
+        return await run_in_threadpool(self.session.scalar, statement, params)
+
+    async def get(self, model, ident):
+        return await run_in_threadpool(self.session.get, model, ident)
+
+    async def commit(self):
+        await run_in_threadpool(self.session.commit)
+
+    async def rollback(self):
+        await run_in_threadpool(self.session.rollback)
+
+    async def close(self):
+        await run_in_threadpool(self.session.close)
+
 # Create base class
 Base = declarative_base()
 
@@ -28,3 +293,15 @@ def get_db():
         yield db
     finally:
         db.close()
+
+# Dependency to get an async database session
+async def get_async_db() -> AsyncIterator[Union[AsyncSession, ThreadpoolSession]]:
+    if get_async_engine() is None:
+        db = ThreadpoolSession(SessionLocal())
+        try:
+            yield db
+        finally:
+            await db.close()
+        return
+    async with _async_session_factory() as db:
+        yield db
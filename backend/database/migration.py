@@ -0,0 +1,295 @@
+"""
+JSON log -> database migration.
+
+Each source is streamed entry by entry. The keys already in the database are
+loaded into memory with one query per table, and new rows go in with
+bulk_insert_mappings, one batch per transaction. Every batch also records how
+far into the source it got (migration_checkpoints), so an interrupted run
+resumes where it stopped and a re-run only looks at entries appended since.
+
+    python -m database.migration [--restart] [--batch-size 5000]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.database import SessionLocal
+from database.models import (
+    Agenda, CommunityMember, Event, JuryMember, MigrationCheckpoint, OutreachLog,
+    Speaker, Sponsor, Task, TeamMember
+)
+from services.file_utils import iter_json_log
+
+MIGRATION_BATCH_SIZE = int(os.getenv("MIGRATION_BATCH_SIZE", "5000"))
+PROGRESS_EVERY = int(os.getenv("MIGRATION_PROGRESS_EVERY", "10000"))
+DEFAULT_EVENT = "HackaTwin 2025"
+
+def _timestamp(entry: Dict[str, Any]) -> datetime:
+    return datetime.fromisoformat(entry["timestamp"])
+
+def _fingerprint(entry: Any) -> str:
+    """Identifies a log by its first entry"""
+    return hashlib.sha256(json.dumps(entry, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+class JsonMigration:
+    """
+    Migrates the JSON logs into the database. Sources run in order; each one has
+    a preload step (existing keys, one query per table) and a convert step that
+    turns an entry into rows, or nothing when the entry is already migrated.
+    """
+
+    def __init__(self, batch_size: int = MIGRATION_BATCH_SIZE, restart: bool = False,
+                 progress: Optional[Callable[[str, int, float], None]] = None):
+        self.batch_size = batch_size
+        self.restart = restart
+        self.progress = progress or self._print_progress
+        self.event_id: Optional[int] = None
+        self.sources: List[Tuple[str, str, Callable, Callable]] = [
+            ("outreach", "logs/outreach_log.json", self._preload_outreach, self._convert_outreach),
+            ("team_tasks", "logs/team_tasks.json", self._preload_team, self._convert_team_task),
+            ("jury_invites", "logs/jury_invites_log.json", self._preload_jury, self._convert_jury_invite),
+            ("agenda", "logs/agenda_log.json", self._preload_agenda, self._convert_agenda),
+            ("fundraising", "logs/fundraising_log.json", self._preload_sponsors, self._convert_sponsor),
+            ("community", "logs/community_log.json", self._preload_community, self._convert_community),
+        ]
+
+    @staticmethod
+    def _print_progress(source: str, processed: int, elapsed: float):
+        rate = processed / elapsed if elapsed else 0
+        print(f"   ⏳ {source}: {processed} entries ({rate:,.0f}/s)")
+
+    # ----- preload (one query per table) -----
+
+    def _preload_outreach(self, db):
+        self.outreach_keys = set(db.query(OutreachLog.email, OutreachLog.sent_at).all())
+
+    def _preload_team(self, db):
+        self.member_ids = dict(db.query(TeamMember.email, TeamMember.id).all())
+        # Tasks are unique per (title, assignee); the assignee by email covers members added in this run
+        self.task_keys = set(db.query(Task.title, TeamMember.email).join(
+            TeamMember, Task.assigned_to == TeamMember.id
+        ).all())
+
+    def _preload_jury(self, db):
+        self.jury_emails = {email for (email,) in db.query(JuryMember.email)}
+        self.speaker_emails = {email for (email,) in db.query(Speaker.email)}
+
+    def _preload_agenda(self, db):
+        self.agenda_titles = {title for (title,) in db.query(Agenda.title)}
+
+    def _preload_sponsors(self, db):
+        self.sponsor_emails = {email for (email,) in db.query(Sponsor.contact_email)}
+
+    def _preload_community(self, db):
+        self.community_emails = {email for (email,) in db.query(CommunityMember.email)}
+
+    # ----- convert: entry -> [(model, row)] -----
+    # Rows are built before any key is recorded, so a malformed entry changes nothing
+
+    def _convert_outreach(self, entry):
+        row = {
+            "name": entry["name"],
+            "email": entry["email"],
+            "status": entry["status"],
+            "message_type": "outreach",
+            "event_id": self.event_id,
+            "sent_at": _timestamp(entry)
+        }
+        key = (row["email"], row["sent_at"])
+        if key in self.outreach_keys:
+            return []
+        self.outreach_keys.add(key)
+        return [(OutreachLog, row)]
+
+    def _convert_team_task(self, entry):
+        member = {"name": entry["assigned_to"], "email": entry["email"], "event_id": self.event_id, "role": "Developer"}
+        task = {
+            "title": entry["task"],
+            "assigned_to": entry["email"],  # replaced by the member id in _write
+            "status": entry["status"],
+            "created_at": _timestamp(entry)
+        }
+        rows = []
+        if member["email"] not in self.member_ids:
+            self.member_ids[member["email"]] = None  # id assigned when the batch is written
+            rows.append((TeamMember, member))
+        key = (task["title"], member["email"])
+        if key not in self.task_keys:
+            self.task_keys.add(key)
+            rows.append((Task, task))
+        return rows
+
+    def _convert_jury_invite(self, entry):
+        row = {
+            "name": entry["name"],
+            "email": entry["email"],
+            "event_id": self.event_id,
+            "status": entry["status"],
+            "created_at": _timestamp(entry)
+        }
+        if entry["role"] == "judge" and row["email"] not in self.jury_emails:
+            self.jury_emails.add(row["email"])
+            return [(JuryMember, {**row, "expertise": entry.get("expertise", "")})]
+        if entry["role"] == "speaker" and row["email"] not in self.speaker_emails:
+            self.speaker_emails.add(row["email"])
+            return [(Speaker, {**row, "topic": entry.get("topic", "")})]
+        return []
+
+    def _convert_agenda(self, entry):
+        row = {
+            "event_id": self.event_id,
+            "title": entry["event_name"],
+            "content": entry["generated_agenda"],
+            "created_at": _timestamp(entry)
+        }
+        if row["title"] in self.agenda_titles:
+            return []
+        self.agenda_titles.add(row["title"])
+        return [(Agenda, row)]
+
+    def _convert_sponsor(self, entry):
+        row = {
+            "company_name": entry["company"],
+            "contact_email": entry["contact_email"],
+            "sponsorship_level": entry["proposal_type"],
+            "amount": entry["amount_requested"],
+            "event_id": self.event_id,
+            "status": entry["status"],
+            "created_at": _timestamp(entry)
+        }
+        if row["contact_email"] in self.sponsor_emails:
+            return []
+        self.sponsor_emails.add(row["contact_email"])
+        return [(Sponsor, row)]
+
+    def _convert_community(self, entry):
+        row = {
+            "name": entry["member_name"],
+            "email": entry["email"],
+            "engagement_level": entry["message_type"],
+            "join_date": _timestamp(entry)
+        }
+        if row["email"] in self.community_emails:
+            return []
+        self.community_emails.add(row["email"])
+        return [(CommunityMember, row)]
+
+    # ----- batches -----
+
+    def _write(self, db, rows: List[Tuple[Any, Dict[str, Any]]]):
+        """Bulk insert a batch, one executemany per table (members before their tasks)"""
+        by_model: Dict[Any, List[Dict[str, Any]]] = {}
+        for model, row in rows:
+            by_model.setdefault(model, []).append(row)
+
+        members = by_model.pop(TeamMember, [])
+        if members:
+            db.bulk_insert_mappings(TeamMember, members)
+            emails = [member["email"] for member in members]
+            self.member_ids.update(db.query(TeamMember.email, TeamMember.id).filter(TeamMember.email.in_(emails)).all())
+        for task in by_model.get(Task, []):
+            task["assigned_to"] = self.member_ids[task["assigned_to"]]
+
+        for model, mappings in by_model.items():
+            db.bulk_insert_mappings(model, mappings)
+
+    def _checkpoint(self, db, source: str) -> MigrationCheckpoint:
+        checkpoint = db.get(MigrationCheckpoint, source)
+        if checkpoint is None:
+            checkpoint = MigrationCheckpoint(source=source, position=0, inserted=0)
+            db.add(checkpoint)
+        return checkpoint
+
+    def _flush(self, source: str, rows, position: int, fingerprint: Optional[str]):
+        with SessionLocal() as db:
+            self._write(db, rows)
+            checkpoint = self._checkpoint(db, source)
+            checkpoint.position = position
+            checkpoint.fingerprint = fingerprint
+            checkpoint.inserted = (checkpoint.inserted or 0) + len(rows)
+            db.commit()
+
+    def _default_event(self) -> int:
+        with SessionLocal() as db:
+            event = db.query(Event).filter(Event.name == DEFAULT_EVENT).first()
+            if not event:
+                event = Event(
+                    name=DEFAULT_EVENT,
+                    description="AI-powered hackathon automation platform",
+                    venue="Virtual/Hybrid Event",
+                    status="planning"
+                )
+                db.add(event)
+                db.commit()
+            return event.id
+
+    def migrate_source(self, source: str, path: str, preload: Callable, convert: Callable) -> Dict[str, Any]:
+        start = time.perf_counter()
+        with SessionLocal() as db:
+            if self.restart:
+                db.query(MigrationCheckpoint).filter(MigrationCheckpoint.source == source).delete()
+                db.commit()
+            checkpoint = db.get(MigrationCheckpoint, source)
+            resume_from = checkpoint.position if checkpoint else 0
+            saved_fingerprint = checkpoint.fingerprint if checkpoint else None
+            preload(db)
+
+        stats = {"read": 0, "inserted": 0, "invalid": 0, "resumed_from": resume_from}
+        batch: List[Tuple[Any, Dict[str, Any]]] = []
+        position, fingerprint = resume_from, saved_fingerprint
+        for position, entry in enumerate(iter_json_log(path), start=1):
+            if position == 1:
+                # Positions only carry over while the log is the same one, appended to
+                fingerprint = _fingerprint(entry)
+                if resume_from and fingerprint != saved_fingerprint:
+                    print(f"   ⚠️ {source}: log was replaced since the last run, checking every entry")
+                    resume_from = stats["resumed_from"] = 0
+            if position <= resume_from:
+                continue
+            stats["read"] += 1
+            try:
+                batch += convert(entry)
+            except (KeyError, TypeError, ValueError):
+                stats["invalid"] += 1  # not the shape this source expects
+            if len(batch) >= self.batch_size:
+                self._flush(source, batch, position, fingerprint)
+                stats["inserted"] += len(batch)
+                batch = []
+            if stats["read"] % PROGRESS_EVERY == 0:
+                self.progress(source, stats["read"], time.perf_counter() - start)
+        # Also records the final position when nothing was left to insert
+        self._flush(source, batch, max(position, resume_from), fingerprint)
+        stats["inserted"] += len(batch)
+        stats["seconds"] = round(time.perf_counter() - start, 3)
+        return stats
+
+    def run(self) -> Dict[str, Dict[str, Any]]:
+        self.event_id = self._default_event()
+        report = {}
+        for source, path, preload, convert in self.sources:
+            report[source] = self.migrate_source(source, path, preload, convert)
+            stats = report[source]
+            print(f"   ✅ {source}: {stats['inserted']} rows from {stats['read']} new entries "
+                  f"({stats['invalid']} invalid, resumed at {stats['resumed_from']}) in {stats['seconds']}s")
+        return report
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrate JSON logs into the database")
+    parser.add_argument("--restart", action="store_true", help="Ignore checkpoints and re-read every log")
+    parser.add_argument("--batch-size", type=int, default=MIGRATION_BATCH_SIZE)
+    args = parser.parse_args()
+
+    from database.utils import create_tables
+    create_tables()
+    JsonMigration(batch_size=args.batch_size, restart=args.restart).run()
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Float, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, Float, Boolean, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from database.database import Base
@@ -26,6 +26,11 @@ class Event(Base):
 
 class TeamMember(Base):
     __tablename__ = "team_members"
+    # (event_id, ...) indexes also serve lookups and joins on event_id alone
+    __table_args__ = (
+        Index("ix_team_members_event_status", "event_id", "status"),
+        Index("ix_team_members_event_created_at", "event_id", "created_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False)
@@ -42,15 +47,18 @@ class TeamMember(Base):
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_title_assigned_to", "title", "assigned_to"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
     description = Column(Text)
-    assigned_to = Column(Integer, ForeignKey("team_members.id"))
+    assigned_to = Column(Integer, ForeignKey("team_members.id"), index=True)
     status = Column(String(50), default="pending")
     priority = Column(String(20), default="medium")
     due_date = Column(DateTime)
-    created_at = Column(DateTime, server_default=func.now())
+    created_at = Column(DateTime, server_default=func.now(), index=True)
     completed_at = Column(DateTime)
     
     # Relationships
@@ -58,10 +66,14 @@ class Task(Base):
 
 class JuryMember(Base):
     __tablename__ = "jury_members"
+    __table_args__ = (
+        Index("ix_jury_members_event_status", "event_id", "status"),
+        Index("ix_jury_members_event_created_at", "event_id", "created_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False)
-    email = Column(String(255), nullable=False)
+    email = Column(String(255), nullable=False, index=True)
     expertise = Column(String(255))
     company = Column(String(255))
     bio = Column(Text)
@@ -74,10 +86,14 @@ class JuryMember(Base):
 
 class Speaker(Base):
     __tablename__ = "speakers"
+    __table_args__ = (
+        Index("ix_speakers_event_status", "event_id", "status"),
+        Index("ix_speakers_event_created_at", "event_id", "created_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False)
-    email = Column(String(255), nullable=False)
+    email = Column(String(255), nullable=False, index=True)
     topic = Column(String(255))
     company = Column(String(255))
     bio = Column(Text)
@@ -91,16 +107,20 @@ class Speaker(Base):
 
 class Sponsor(Base):
     __tablename__ = "sponsors"
+    __table_args__ = (
+        Index("ix_sponsors_event_status", "event_id", "status"),
+        Index("ix_sponsors_event_created_at", "event_id", "created_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     company_name = Column(String(255), nullable=False)
-    contact_email = Column(String(255), nullable=False)
+    contact_email = Column(String(255), nullable=False, index=True)
     contact_person = Column(String(255))
     sponsorship_level = Column(String(50))  # gold, silver, bronze
     amount = Column(Float)
     benefits = Column(Text)
     event_id = Column(Integer, ForeignKey("events.id"))
-    status = Column(String(50), default="prospective")
+    status = Column(String(50), default="prospective", index=True)
     created_at = Column(DateTime, server_default=func.now())
     
     # Relationships
@@ -108,6 +128,9 @@ class Sponsor(Base):
 
 class Agenda(Base):
     __tablename__ = "agendas"
+    __table_args__ = (
+        Index("ix_agendas_event_created_at", "event_id", "created_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     event_id = Column(Integer, ForeignKey("events.id"))
@@ -122,6 +145,11 @@ class Agenda(Base):
 
 class OutreachLog(Base):
     __tablename__ = "outreach_logs"
+    __table_args__ = (
+        Index("ix_outreach_logs_email_sent_at", "email", "sent_at"),
+        Index("ix_outreach_logs_event_status", "event_id", "status"),
+        Index("ix_outreach_logs_event_sent_at", "event_id", "sent_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False)
@@ -129,7 +157,7 @@ class OutreachLog(Base):
     message_type = Column(String(50))  # outreach, followup, invitation
     status = Column(String(50))  # sent, delivered, opened, clicked, error
     event_id = Column(Integer, ForeignKey("events.id"))
-    sent_at = Column(DateTime, server_default=func.now())
+    sent_at = Column(DateTime, server_default=func.now(), index=True)
     
     # Relationships
     event = relationship("Event", back_populates="outreach_logs")
@@ -146,6 +174,12 @@ class CommunityMember(Base):
     engagement_level = Column(String(50), default="new")
     join_date = Column(DateTime, server_default=func.now())
     last_active = Column(DateTime)
+    # Welcome email and Slack announcement run after the member is saved
+    onboarding_status = Column(String(20))  # pending, running, completed, failed
+    onboarding_detail = Column(Text)  # JSON: result of each onboarding step
+    onboarding_updated_at = Column(DateTime)
+    onboarding_worker_id = Column(String(100))  # process running the onboarding pipeline
+    onboarding_heartbeat_at = Column(DateTime)  # stale heartbeat: another process may take over
 
 class Fundraising(Base):
     __tablename__ = "fundraising"
@@ -170,3 +204,69 @@ class ModerationLog(Base):
     moderator = Column(String(255))
     timestamp = Column(DateTime, server_default=func.now())
     severity = Column(String(20), default="low")  # low, medium, high
+
+class Job(Base):
+    __tablename__ = "jobs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String(50), nullable=False)  # outreach, invite_jury, invite_jury_speakers, post_event_followup
+    params = Column(Text)  # JSON
+    status = Column(String(20), default="queued")  # queued, running, completed, failed
+    total_items = Column(Integer, default=0)
+    processed_items = Column(Integer, default=0)
+    succeeded_items = Column(Integer, default=0)
+    failed_items = Column(Integer, default=0)
+    queued_items = Column(Integer, default=0)  # handed to the email outbox, not sent yet
+    duplicate_items = Column(Integer, default=0)  # already in the outbox from an earlier run
+    worker_id = Column(String(100))
+    heartbeat_at = Column(DateTime)
+    error = Column(Text)
+    created_at = Column(DateTime, server_default=func.now())
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+    
+    # Relationships
+    items = relationship("JobItem", back_populates="job", order_by="JobItem.position")
+
+class JobItem(Base):
+    __tablename__ = "job_items"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    job_id = Column(Integer, ForeignKey("jobs.id"), nullable=False, index=True)
+    position = Column(Integer, nullable=False)
+    email = Column(String(255))
+    payload = Column(Text, nullable=False)  # JSON recipient snapshot
+    status = Column(String(20), default="pending")  # pending, sending, sent, queued, duplicate, error, skipped, unknown
+    result = Column(Text)  # JSON log entry or error
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    
+    # Relationships
+    job = relationship("Job", back_populates="items")
+
+class OutboxEmail(Base):
+    __tablename__ = "outbox_emails"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    dedup_key = Column(String(64), nullable=False, unique=True)  # sha256(recipient, campaign, content hash)
+    campaign = Column(String(100), nullable=False)
+    recipient = Column(String(255), nullable=False)
+    subject = Column(String(500))
+    content = Column(Text, nullable=False)
+    content_hash = Column(String(64), nullable=False)
+    status = Column(String(20), default="pending", index=True)  # pending, sending, sent, failed
+    attempts = Column(Integer, default=0)
+    next_attempt_at = Column(DateTime, server_default=func.now())
+    claim = Column(String(64))  # sender batch holding the row while status is sending
+    locked_at = Column(DateTime)
+    last_error = Column(Text)
+    created_at = Column(DateTime, server_default=func.now())
+    sent_at = Column(DateTime)
+
+class MigrationCheckpoint(Base):
+    __tablename__ = "migration_checkpoints"
+    
+    source = Column(String(100), primary_key=True)  # JSON log migrated by database/migration.py
+    position = Column(Integer, default=0)  # entries already processed
+    fingerprint = Column(String(64))  # hash of the log's first entry
+    inserted = Column(Integer, default=0)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,248 @@
+import base64
+import json
+import os
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Literal, Optional, Tuple, Union
+
+from fastapi import HTTPException, Query
+from sqlalchemy import DateTime, Select, and_, bindparam, nulls_last, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Query as OrmQuery, load_only
+from sqlalchemy.sql.functions import FunctionElement
+
+DEFAULT_PAGE_SIZE = int(os.getenv("API_PAGE_SIZE", "100"))
+MAX_PAGE_SIZE = int(os.getenv("API_MAX_PAGE_SIZE", "1000"))
+
+# A source whose last page has been served
+DONE = {"done": True}
+
+class PageParams:
+    """
+    Paging, filtering and projection shared by the list endpoints.
+
+    Cursors are opaque tokens holding one keyset position per data source
+    (e.g. {"db": {"id": 120}, "json": {"pos": 40}}), so endpoints that merge
+    database rows with JSON logs can page through both at once.
+    """
+
+    def __init__(self, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None,
+                 order_by: str = "id", status: Optional[str] = None, event_id: Optional[int] = None,
+                 created_after: Optional[datetime] = None, created_before: Optional[datetime] = None,
+                 fields: Optional[str] = None):
+        self.limit = limit
+        self.order_by = order_by
+        self.status = status
+        self.event_id = event_id
+        self.created_after = created_after
+        self.created_before = created_before
+        self.fields = {f.strip() for f in fields.split(",") if f.strip()} if fields else None
+        self.cursors = decode_cursor(cursor) if cursor else {}
+
+    def info(self, next_cursors: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """Pagination block for a response; next_cursor is None once every source is done"""
+        more = any(c != DONE for c in next_cursors.values())
+        return {
+            "limit": self.limit,
+            "order_by": self.order_by,
+            "has_more": more,
+            "next_cursor": encode_cursor(next_cursors) if more else None
+        }
+
+    def select(self, available: Iterable[str], default_exclude: Iterable[str] = ()) -> List[str]:
+        """Fields to return: the requested ones, or the defaults minus heavy columns"""
+        if self.fields is None:
+            return [f for f in available if f not in default_exclude]
+        return [f for f in available if f in self.fields]
+
+    def project(self, record: Dict[str, Any], default_exclude: Iterable[str] = ()) -> Dict[str, Any]:
+        """Same as select() for an already-built dict (JSON log entries)"""
+        return {k: record[k] for k in self.select(record, default_exclude)}
+
+def page_params(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    order_by: Literal["id", "created_at"] = Query("id"),
+    status: Optional[str] = Query(None),
+    event_id: Optional[int] = Query(None),
+    created_after: Optional[Union[datetime, date]] = Query(None, description="ISO date or datetime (inclusive)"),
+    created_before: Optional[Union[datetime, date]] = Query(None, description="ISO date or datetime (exclusive)"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return")
+) -> PageParams:
+    """FastAPI dependency for PageParams"""
+    # A bare date means midnight
+    if isinstance(created_after, date) and not isinstance(created_after, datetime):
+        created_after = datetime.combine(created_after, datetime.min.time())
+    if isinstance(created_before, date) and not isinstance(created_before, datetime):
+        created_before = datetime.combine(created_before, datetime.min.time())
+    return PageParams(limit, cursor, order_by, status, event_id, created_after, created_before, fields)
+
+def encode_cursor(cursors: Dict[str, Any]) -> str:
+    raw = json.dumps(cursors, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(token: str) -> Dict[str, Any]:
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        cursors = json.loads(raw)
+        if not isinstance(cursors, dict):
+            raise ValueError("cursor must be an object")
+        return cursors
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+# ===== DATABASE SOURCES =====
+
+class sort_datetime(FunctionElement):
+    """
+    A datetime as compared by keyset paging: the column itself, except on SQLite, which
+    stores text in mixed formats ("YYYY-MM-DD HH:MM:SS" from server defaults, microseconds
+    from the ORM) that only compare correctly through julianday()
+    """
+    type = DateTime()
+    inherit_cache = True
+
+@compiles(sort_datetime)
+def _compile_sort_datetime(element, compiler, **kw):
+    return compiler.process(element.clauses, **kw)
+
+@compiles(sort_datetime, "sqlite")
+def _compile_sort_datetime_sqlite(element, compiler, **kw):
+    return f"julianday({compiler.process(element.clauses, **kw)})"
+
+def _cursor_date(cursor: Dict[str, Any]) -> Optional[datetime]:
+    """The date key of a created_at cursor; None means the row had no date"""
+    if cursor["key"] is None:
+        return None
+    try:
+        return datetime.fromisoformat(cursor["key"])
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def _next_cursor(last, page: PageParams, date_column: str) -> Dict[str, Any]:
+    next_cursor = {"id": last.id}
+    if page.order_by == "created_at":
+        key = getattr(last, date_column)
+        next_cursor["key"] = key.isoformat() if key is not None else None
+    return next_cursor
+
+def filter_query(query: OrmQuery, model, page: PageParams, date_column: str = "created_at") -> OrmQuery:
+    """Apply the status, event_id and date range filters (unsupported filters are rejected)"""
+    if page.status is not None:
+        if not hasattr(model, "status"):
+            raise HTTPException(status_code=400, detail=f"status filter not supported for {model.__tablename__}")
+        query = query.filter(model.status == page.status)
+    if page.event_id is not None:
+        if not hasattr(model, "event_id"):
+            raise HTTPException(status_code=400, detail=f"event_id filter not supported for {model.__tablename__}")
+        query = query.filter(model.event_id == page.event_id)
+    date_col = getattr(model, date_column)
+    if page.created_after is not None:
+        query = query.filter(date_col >= page.created_after)
+    if page.created_before is not None:
+        query = query.filter(date_col < page.created_before)
+    return query
+
+def _keyset_page(query, model, page: PageParams, cursor: Optional[Dict[str, Any]], date_column: str,
+                 columns: Optional[Iterable[str]]):
+    """
+    Filters, projection, keyset condition, order and limit for one page. Works on a
+    legacy Query and on a select() alike. Rows without a date sort last; their cursor
+    holds a null key rather than a placeholder value.
+    """
+    if cursor and ("id" not in cursor or (page.order_by == "created_at" and "key" not in cursor)):
+        raise HTTPException(status_code=400, detail="Cursor does not match order_by")
+
+    query = filter_query(query, model, page, date_column)
+    date_col = getattr(model, date_column)
+
+    if columns is not None:
+        wanted = set(columns) | {"id", date_column}
+        query = query.options(load_only(*[getattr(model, name) for name in wanted]))
+
+    if page.order_by == "created_at":
+        sort_key = sort_datetime(date_col)
+        if cursor:
+            key = _cursor_date(cursor)
+            if key is None:
+                query = query.filter(date_col.is_(None), model.id > cursor["id"])
+            else:
+                key = sort_datetime(bindparam("cursor_key", key, type_=DateTime))
+                query = query.filter(or_(sort_key > key, and_(sort_key == key, model.id > cursor["id"]),
+                                         date_col.is_(None)))
+        query = query.order_by(nulls_last(sort_key), model.id)
+    else:
+        if cursor:
+            query = query.filter(model.id > cursor["id"])
+        query = query.order_by(model.id)
+    return query.limit(page.limit + 1)
+
+def paginate_query(query: OrmQuery, model, page: PageParams, cursor: Optional[Dict[str, Any]],
+                   date_column: str = "created_at", columns: Optional[Iterable[str]] = None) -> Tuple[List[Any], Dict[str, Any]]:
+    """
+    One keyset page of a filtered query: WHERE (key, id) > cursor ORDER BY key NULLS LAST, id LIMIT n.
+    `columns` are the attributes the serializer needs; only those are loaded, so
+    large text columns stay in the database unless asked for.
+    Returns the rows and the cursor for the next page.
+    """
+    if cursor == DONE:
+        return [], DONE
+    rows = _keyset_page(query, model, page, cursor, date_column, columns).all()
+    if len(rows) <= page.limit:
+        return rows, DONE
+    rows = rows[:page.limit]
+    return rows, _next_cursor(rows[-1], page, date_column)
+
+async def apaginate(db: AsyncSession, model, page: PageParams, cursor: Optional[Dict[str, Any]],
+                    date_column: str = "created_at", columns: Optional[Iterable[str]] = None,
+                    statement: Optional[Select] = None) -> Tuple[List[Any], Dict[str, Any]]:
+    """paginate_query on an AsyncSession (or ThreadpoolSession); `statement` defaults to select(model)"""
+    if cursor == DONE:
+        return [], DONE
+    statement = _keyset_page(statement if statement is not None else select(model), model, page,
+                             cursor, date_column, columns)
+    rows = (await db.scalars(statement)).all()
+    if len(rows) <= page.limit:
+        return rows, DONE
+    rows = rows[:page.limit]
+    return rows, _next_cursor(rows[-1], page, date_column)
+
+def row_to_dict(row, fields: Iterable[str]) -> Dict[str, Any]:
+    """Serialize the selected attributes of a row (datetimes as ISO strings)"""
+    data = {}
+    for name in fields:
+        value = getattr(row, name)
+        data[name] = value.isoformat() if isinstance(value, datetime) else value
+    return data
+
+# ===== JSON LOG SOURCES =====
+
+def filter_entries(entries: List[Dict[str, Any]], page: PageParams, date_key: str = "timestamp") -> List[Dict[str, Any]]:
+    """Status and date range filters for log entries (event_id does not apply to logs)"""
+    if page.status is None and page.created_after is None and page.created_before is None:
+        return entries
+    after = page.created_after.isoformat() if page.created_after else None
+    before = page.created_before.isoformat() if page.created_before else None
+    result = []
+    for entry in entries:
+        if page.status is not None and entry.get("status") != page.status:
+            continue
+        stamp = entry.get(date_key) or ""
+        if after and stamp < after:
+            continue
+        if before and stamp >= before:
+            continue
+        result.append(entry)
+    return result
+
+def paginate_entries(entries: List[Dict[str, Any]], page: PageParams,
+                     cursor: Optional[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    One page of already-filtered log entries. Logs are append-only, so the
+    position is a stable key; order_by=created_at is the same as log order.
+    """
+    if cursor == DONE:
+        return [], DONE
+    start = int(cursor.get("pos", 0)) if cursor else 0
+    end = start + page.limit
+    return entries[start:end], ({"pos": end} if end < len(entries) else DONE)
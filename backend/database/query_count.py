@@ -0,0 +1,55 @@
+"""
+Statement counting for catching N+1 queries.
+
+    with assert_max_queries(2):
+        client.get("/api/db/tasks")
+
+counts every statement sent to the database on the sync and async engines
+(the async engine's statements run through its sync_engine) and raises
+AssertionError, listing them, when there were more than allowed.
+"""
+
+import threading
+from contextlib import contextmanager
+from typing import Iterator, List
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+class QueryCounter:
+    """Records the statements executed on some engines while entered"""
+
+    def __init__(self, *engines: Engine):
+        if not engines:
+            from database.database import engine, get_async_engine
+            engines = tuple(e for e in (engine, get_async_engine()) if e is not None)
+        self.engines = [getattr(e, "sync_engine", e) for e in engines]
+        self.statements: List[str] = []
+        self._lock = threading.Lock()
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        with self._lock:
+            self.statements.append(statement)
+
+    def __enter__(self) -> "QueryCounter":
+        for db_engine in self.engines:
+            event.listen(db_engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc):
+        for db_engine in self.engines:
+            event.remove(db_engine, "before_cursor_execute", self._record)
+        return False
+
+@contextmanager
+def assert_max_queries(limit: int, *engines: Engine) -> Iterator[QueryCounter]:
+    """Fail when the block issues more than `limit` statements"""
+    with QueryCounter(*engines) as counter:
+        yield counter
+    if counter.count > limit:
+        listing = "\n".join(f"  {n}. {' '.join(sql.split())}" for n, sql in enumerate(counter.statements, 1))
+        raise AssertionError(f"{counter.count} statements, expected at most {limit}:\n{listing}")
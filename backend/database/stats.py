@@ -0,0 +1,153 @@
+"""
+Dashboard statistics from the database in two statements: every count as a
+scalar subquery of one SELECT, and the recent activity feed as one ordered
+UNION ALL. Results are kept for DASHBOARD_STATS_CACHE_TTL seconds and dropped
+as soon as a transaction that wrote to one of the counted tables commits.
+"""
+
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event, func, literal, null, select, union_all
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from database.database import engine, on_async_engine
+from database.models import CommunityMember, Event, OutreachLog, Sponsor, Task, TeamMember
+
+DASHBOARD_STATS_CACHE_TTL = float(os.getenv("DASHBOARD_STATS_CACHE_TTL", "5"))  # 0 disables the cache
+
+FUNDS_PER_SPONSOR = 2500  # Estimate per confirmed sponsor
+RECENT_OUTREACH = 3
+RECENT_TASKS = 2
+
+# Tables behind the stats; committed writes to any of them invalidate the cache
+STATS_TABLES = frozenset(model.__tablename__ for model in (Event, TeamMember, OutreachLog, Sponsor, CommunityMember, Task))
+
+def _count(model, *criteria):
+    return select(func.count()).select_from(model).where(*criteria).scalar_subquery()
+
+def counts_statement():
+    """Every dashboard count in one SELECT"""
+    return select(
+        _count(Event).label("total_events"),
+        _count(TeamMember).label("team_members"),
+        _count(OutreachLog).label("emails_sent"),
+        _count(Sponsor, Sponsor.status == "confirmed").label("confirmed_sponsors"),
+        _count(CommunityMember).label("community_growth"),
+    )
+
+def recent_activity_statement():
+    """Latest outreach emails and tasks (with assignee) as one feed, newest first"""
+    outreach = (
+        select(literal("outreach").label("type"), OutreachLog.name.label("subject"),
+               null().label("assignee"), OutreachLog.sent_at.label("at"))
+        .order_by(OutreachLog.sent_at.desc()).limit(RECENT_OUTREACH)
+        .subquery()
+    )
+    tasks = (
+        select(literal("team").label("type"), Task.title.label("subject"),
+               TeamMember.name.label("assignee"), Task.created_at.label("at"))
+        .outerjoin(TeamMember, Task.assigned_to == TeamMember.id)
+        .order_by(Task.created_at.desc()).limit(RECENT_TASKS)
+        .subquery()
+    )
+    # Each branch keeps its own ORDER BY/LIMIT inside a subquery, which every backend accepts in a UNION
+    feed = union_all(select(outreach), select(tasks)).subquery()
+    return select(feed).order_by(feed.c.at.desc())
+
+def _activity(row) -> Dict[str, Any]:
+    time_of_day = row.at.strftime("%H:%M") if row.at else ""
+    if row.type == "outreach":
+        return {"title": f"Email sent to {row.subject}", "description": "Outreach email sent successfully",
+                "time": time_of_day, "type": "outreach"}
+    return {"title": f"Task assigned: {row.subject}", "description": f"Assigned to {row.assignee or 'Unknown'}",
+            "time": time_of_day, "type": "team"}
+
+def query_dashboard_stats(db: Session) -> Dict[str, Any]:
+    """Dashboard statistics straight from the database (two statements)"""
+    counts = db.execute(counts_statement()).one()
+    activities: List[Dict[str, Any]] = [_activity(row) for row in db.execute(recent_activity_statement())]
+    return {
+        "total_events": counts.total_events,
+        "active_projects": counts.total_events,
+        "team_members": counts.team_members,
+        "emails_sent": counts.emails_sent,
+        "funds_raised": counts.confirmed_sponsors * FUNDS_PER_SPONSOR,
+        "community_growth": counts.community_growth,
+        "recent_activities": activities,
+    }
+
+class DashboardStatsCache:
+    """
+    Short-TTL cache for query_dashboard_stats. A result computed while a write
+    committed is not stored, so invalidate() never races with a slow read.
+    """
+
+    def __init__(self, ttl: float = DASHBOARD_STATS_CACHE_TTL):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._value: Optional[Dict[str, Any]] = None
+        self._expires_at = 0.0
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, db: Session) -> Dict[str, Any]:
+        with self._lock:
+            if self._value is not None and self._expires_at > time.monotonic():
+                self.hits += 1
+                return self._value
+            self.misses += 1
+            generation = self._generation
+        stats = query_dashboard_stats(db)
+        if self.ttl > 0:
+            with self._lock:
+                if generation == self._generation:
+                    self._value, self._expires_at = stats, time.monotonic() + self.ttl
+        return stats
+
+    def invalidate(self):
+        with self._lock:
+            self._value = None
+            self._generation += 1
+            self.invalidations += 1
+
+    def watch(self, db_engine: Engine):
+        """Invalidate when a transaction on `db_engine` that wrote to STATS_TABLES commits"""
+        db_engine = getattr(db_engine, "sync_engine", db_engine)
+
+        @event.listens_for(db_engine, "after_cursor_execute")
+        def note_write(conn, cursor, statement, parameters, context, executemany):
+            if context is None or not (context.isinsert or context.isupdate or context.isdelete):
+                return
+            table = getattr(context.compiled.statement, "table", None)
+            if getattr(table, "name", None) in STATS_TABLES:
+                conn.info["dashboard_stats_dirty"] = True
+
+        @event.listens_for(db_engine, "commit")
+        def on_commit(conn):
+            if conn.info.pop("dashboard_stats_dirty", False):
+                self.invalidate()
+
+        @event.listens_for(db_engine, "rollback")
+        def on_rollback(conn):
+            conn.info.pop("dashboard_stats_dirty", None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "ttl": self.ttl,
+                "cached": self._value is not None and self._expires_at > time.monotonic(),
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+            }
+
+# Global instance, invalidated by writes through either engine (the async one once it is created)
+dashboard_stats_cache = DashboardStatsCache()
+dashboard_stats_cache.watch(engine)
+on_async_engine(dashboard_stats_cache.watch)
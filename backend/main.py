@@ -1,26 +1,80 @@
-from fastapi import FastAPI, HTTPException, Depends
+from collections import Counter
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Depends, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Literal, Optional
 from datetime import datetime
+import asyncio
+import json
 import os
-from sqlalchemy.orm import Session
+import tempfile
+import uuid
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
 
 # Import our services
-from services.ai_service import generate_text
-from services.email_service import send_email, send_bulk_emails
-from services.slack_service import send_slack_message, send_slack_dm
-from services.file_utils import load_json_file, save_json_file, append_to_json_file, get_current_timestamp
+from services.ai_service import ai_service, agenerate_text
+from services.email_service import email_service, send_email, send_bulk_emails
+from services.message_render import message_renderer
+from services.slack_service import aqueue_slack_message, asend_slack_dms, slack_service
+from services.file_utils import (
+    load_json_file, update_json_file, append_to_json_file, get_current_timestamp, iter_json_log, load_json_log,
+    read_cache
+)
+from services.dashboard_stats import dashboard_stats
+from services.job_queue import JobWorker, enqueue_job, job_item_to_dict, job_to_dict, resume_job
+from services.outbox import OutboxSender, deliver_email, outbox_email_to_dict, outbox_stats
+from services.onboarding import add_member, onboarding_pipeline, onboarding_to_dict
+from services.member_import import detect_format, import_members
+from services.campaigns import (
+    CampaignRun, OutreachCampaign, JurySpeakerInviteCampaign, CustomJuryInviteCampaign, FollowupCampaign
+)
 
 # Import database components
-from database.database import get_db
-from database.utils import get_dashboard_stats
+from database.database import dispose_async_engine, get_async_db, get_async_engine, get_db, pool_stats
+from database.pagination import (
+    MAX_PAGE_SIZE, PageParams, page_params, paginate_query, apaginate, filter_query, paginate_entries, filter_entries,
+    row_to_dict
+)
+from database.utils import create_tables, get_dashboard_stats as get_db_dashboard_stats
+from database.stats import dashboard_stats_cache
 from database.models import *
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    create_tables()
+    
+    # Run bulk campaign jobs inside the API process unless a separate worker.py is used
+    background_tasks = []
+    if os.getenv("JOB_WORKER_INPROCESS", "true").lower() == "true":
+        background_tasks.append(asyncio.create_task(JobWorker().run_forever()))
+    # Same for the email outbox sender
+    if os.getenv("OUTBOX_WORKER_INPROCESS", "true").lower() == "true":
+        background_tasks.append(asyncio.create_task(OutboxSender().run_forever()))
+    # Finish onboarding interrupted by the last shutdown
+    await onboarding_pipeline.resume_pending()
+    
+    yield
+    
+    await onboarding_pipeline.drain()
+    
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    # Release pooled connections on shutdown
+    await ai_service.aclose()
+    await slack_service.aclose()
+    email_service.close()
+    await dispose_async_engine()
+
 app = FastAPI(
     title="HackaTwin API",
     description="AI Co-organizer for Hackathons",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -33,91 +87,136 @@ app.add_middleware(
 )
 
 # ===== DATABASE-POWERED ENDPOINTS =====
+# List endpoints return one keyset page at a time: pass pagination.next_cursor
+# back as ?cursor= for the next page. See database/pagination.py for filters.
+
+EVENT_FIELDS = ("id", "name", "description", "start_date", "venue", "status")
+TEAM_MEMBER_FIELDS = ("id", "name", "email", "role", "skills", "status")
+TASK_FIELDS = ("id", "title", "description", "assigned_to", "status", "priority", "due_date")
+JURY_FIELDS = ("id", "name", "email", "expertise", "company", "status")
+SPEAKER_FIELDS = ("id", "name", "email", "topic", "company", "status")
+SPONSOR_FIELDS = ("id", "company_name", "contact_email", "sponsorship_level", "amount", "status")
+AGENDA_FIELDS = ("id", "title", "content", "day_number", "version", "created_at")
+COMMUNITY_MEMBER_FIELDS = ("id", "name", "email", "country", "skills", "engagement_level", "onboarding_status")
+
+async def list_rows(db: AsyncSession, model, page: PageParams, fields, date_column: str = "created_at",
+                    default_exclude=()):
+    """One page of a table with only the selected fields loaded and returned"""
+    selected = page.select(fields, default_exclude)
+    rows, next_cursor = await apaginate(db, model, page, page.cursors.get("db"),
+                                        date_column=date_column, columns=selected)
+    return [row_to_dict(row, selected) for row in rows], page.info({"db": next_cursor})
 
 @app.get("/api/db/events")
-async def get_events(db: Session = Depends(get_db)):
-    """Get all events from database"""
+async def get_events(db: AsyncSession = Depends(get_async_db), page: PageParams = Depends(page_params)):
+    """Get events from database"""
     try:
-        events = db.query(Event).all()
-        return {"events": [{"id": e.id, "name": e.name, "description": e.description, 
-                           "start_date": e.start_date, "venue": e.venue, "status": e.status} for e in events]}
+        events, pagination = await list_rows(db, Event, page, EVENT_FIELDS)
+        return {"events": events, "pagination": pagination}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/db/team-members")
-async def get_team_members(db: Session = Depends(get_db)):
-    """Get all team members from database"""
+async def get_team_members(db: AsyncSession = Depends(get_async_db), page: PageParams = Depends(page_params)):
+    """Get team members from database"""
     try:
-        members = db.query(TeamMember).all()
-        return {"team_members": [{"id": m.id, "name": m.name, "email": m.email, 
-                                 "role": m.role, "skills": m.skills, "status": m.status} for m in members]}
+        members, pagination = await list_rows(db, TeamMember, page, TEAM_MEMBER_FIELDS)
+        return {"team_members": members, "pagination": pagination}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/db/tasks")
-async def get_tasks(db: Session = Depends(get_db)):
-    """Get all tasks from database"""
+async def get_tasks(db: AsyncSession = Depends(get_async_db), page: PageParams = Depends(page_params)):
+    """Get tasks from database (unassigned tasks included)"""
     try:
-        tasks = db.query(Task).join(TeamMember).all()
-        return {"tasks": [{"id": t.id, "title": t.title, "description": t.description,
-                          "assigned_to": t.assigned_to_member.name if t.assigned_to_member else "Unassigned",
-                          "status": t.status, "priority": t.priority, "due_date": t.due_date} for t in tasks]}
+        selected = page.select(TASK_FIELDS)
+        # Assignee names come in the same query (LEFT OUTER JOIN), not one lazy load per task
+        statement = select(Task).options(joinedload(Task.assigned_to_member).load_only(TeamMember.name))
+        tasks, next_cursor = await apaginate(db, Task, page, page.cursors.get("db"), columns=selected,
+                                             statement=statement)
+        result = []
+        for t in tasks:
+            task = row_to_dict(t, [f for f in selected if f != "assigned_to"])
+            if "assigned_to" in selected:
+                task["assigned_to"] = t.assigned_to_member.name if t.assigned_to_member else "Unassigned"
+            result.append(task)
+        return {"tasks": result, "pagination": page.info({"db": next_cursor})}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/db/jury-members")
-async def get_jury_members(db: Session = Depends(get_db)):
-    """Get all jury members from database"""
+async def get_jury_members(db: AsyncSession = Depends(get_async_db), page: PageParams = Depends(page_params)):
+    """Get jury members from database"""
     try:
-        jury = db.query(JuryMember).all()
-        return {"jury_members": [{"id": j.id, "name": j.name, "email": j.email,
-                                 "expertise": j.expertise, "company": j.company, "status": j.status} for j in jury]}
+        jury, pagination = await list_rows(db, JuryMember, page, JURY_FIELDS)
+        return {"jury_members": jury, "pagination": pagination}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/db/speakers")
-async def get_speakers(db: Session = Depends(get_db)):
-    """Get all speakers from database"""
+async def get_speakers(db: AsyncSession = Depends(get_async_db), page: PageParams = Depends(page_params)):
+    """Get speakers from database"""
     try:
-        speakers = db.query(Speaker).all()
-        return {"speakers": [{"id": s.id, "name": s.name, "email": s.email,
-                             "topic": s.topic, "company": s.company, "status": s.status} for s in speakers]}
+        speakers, pagination = await list_rows(db, Speaker, page, SPEAKER_FIELDS)
+        return {"speakers": speakers, "pagination": pagination}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/db/sponsors")
-async def get_sponsors(db: Session = Depends(get_db)):
-    """Get all sponsors from database"""
+async def get_sponsors(db: AsyncSession = Depends(get_async_db), page: PageParams = Depends(page_params)):
+    """Get sponsors from database"""
     try:
-        sponsors = db.query(Sponsor).all()
-        return {"sponsors": [{"id": s.id, "company_name": s.company_name, "contact_email": s.contact_email,
-                             "sponsorship_level": s.sponsorship_level, "amount": s.amount, "status": s.status} for s in sponsors]}
+        sponsors, pagination = await list_rows(db, Sponsor, page, SPONSOR_FIELDS)
+        return {"sponsors": sponsors, "pagination": pagination}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/db/agendas")
-async def get_agendas(db: Session = Depends(get_db)):
-    """Get all agendas from database"""
+async def get_agendas(db: AsyncSession = Depends(get_async_db), page: PageParams = Depends(page_params)):
+    """Get agendas from database (the full content is only returned with fields=...,content)"""
     try:
-        agendas = db.query(Agenda).all()
-        return {"agendas": [{"id": a.id, "title": a.title, "content": a.content,
-                            "day_number": a.day_number, "version": a.version, "created_at": a.created_at} for a in agendas]}
+        agendas, pagination = await list_rows(db, Agenda, page, AGENDA_FIELDS, default_exclude=("content",))
+        return {"agendas": agendas, "pagination": pagination}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/db/community-members")
-async def get_community_members(db: Session = Depends(get_db)):
-    """Get all community members from database"""
+async def get_community_members(db: AsyncSession = Depends(get_async_db), page: PageParams = Depends(page_params)):
+    """Get community members from database"""
     try:
-        members = db.query(CommunityMember).all()
-        return {"community_members": [{"id": m.id, "name": m.name, "email": m.email,
-                                      "country": m.country, "skills": m.skills, "engagement_level": m.engagement_level} for m in members]}
+        members, pagination = await list_rows(db, CommunityMember, page, COMMUNITY_MEMBER_FIELDS, date_column="join_date")
+        return {"community_members": members, "pagination": pagination}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 # Pydantic models for request/response
+# "per_recipient" = one model call per person, "template" = one per segment,
+# "batch" = one per segment, sent as SendGrid personalization batches
+GenerationMode = Literal["per_recipient", "template", "batch"]
+
 class OutreachRequest(BaseModel):
     custom_message: Optional[str] = None
+    mode: GenerationMode = "per_recipient"
+    background: bool = True
+    stream: bool = False
+    ai_workers: Optional[int] = None
+    send_workers: Optional[int] = None
 
 class TaskAssignment(BaseModel):
     team: List[Dict[str, str]]
@@ -161,17 +260,131 @@ class JuryInviteRequest(BaseModel):
     judges: List[Dict[str, str]]
     speakers: List[Dict[str, str]]
     event_info: str
+    mode: GenerationMode = "per_recipient"
+    background: bool = True
 
 # Health check endpoint
 @app.get("/health")
 async def health_check():
     return {"status": "ok"}
 
+@app.get("/api/ai/cache")
+async def get_ai_cache_stats():
+    """Get prompt cache hit/miss counters and sizes"""
+    return {"cache": ai_service.cache_stats()}
+
+@app.delete("/api/ai/cache")
+async def clear_ai_cache():
+    """Drop every cached generation"""
+    if ai_service.cache is not None:
+        ai_service.cache.clear()
+    return {"message": "AI cache cleared", "cache": ai_service.cache_stats()}
+
+@app.get("/api/files/cache")
+async def get_file_cache_stats():
+    """Get log/data file read cache memory and hit rate"""
+    return {"cache": read_cache.stats()}
+
+@app.get("/api/slack/stats")
+async def get_slack_stats():
+    """Get Slack API calls, 429s, coalesced messages and cached DM channels"""
+    return {"slack": slack_service.dispatcher.stats()}
+
+@app.get("/api/email/render-cache")
+async def get_email_render_cache_stats():
+    """Get how often outgoing email bodies were reused instead of rebuilt"""
+    return {"cache": message_renderer.stats()}
+
+@app.get("/api/db/pool")
+async def get_db_pool_stats():
+    """Get database connection checkouts, pool waits and timeouts (sync and async engines)"""
+    async_engine = get_async_engine()
+    return {"pool": pool_stats(), "async_pool": pool_stats(async_engine) if async_engine is not None else None}
+
+# ===== EMAIL OUTBOX =====
+
+@app.get("/api/outbox")
+async def get_outbox_stats(db: Session = Depends(get_db)):
+    """Outbox queue depth, retries and age of the oldest unsent email"""
+    try:
+        return {"outbox": outbox_stats(db)}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/outbox/{outbox_id}")
+async def get_outbox_email(outbox_id: int, db: Session = Depends(get_db)):
+    """Delivery status of one email handed to the outbox (the outbox_id a send returned)"""
+    email = db.get(OutboxEmail, outbox_id)
+    if email is None:
+        raise HTTPException(status_code=404, detail="Outbox email not found")
+    return outbox_email_to_dict(email)
+
+# ===== BACKGROUND JOBS =====
+
+def queue_campaign(db: Session, kind: str, recipients: List[Dict[str, Any]], params: Dict[str, Any], message: str):
+    """Store a bulk campaign as a job and return its id right away"""
+    job = enqueue_job(db, kind, recipients, params)
+    return {
+        "message": message,
+        "job_id": job.id,
+        "status": job.status,
+        "status_url": f"/jobs/{job.id}"
+    }
+
+def delivery_summary(statuses) -> str:
+    """What happened to a batch of emails, e.g. "2 sent, 3 queued in the outbox, 1 failed" """
+    counts = Counter(statuses)
+    sent = counts.pop("success", 0)
+    # "duplicate": the outbox already holds this email from an earlier request
+    queued = counts.pop("queued", 0) + counts.pop("duplicate", 0)
+    failed = sum(counts.values())
+    parts = [f"{count} {label}" for count, label in ((sent, "sent"), (queued, "queued in the outbox"), (failed, "failed"))
+             if count]
+    return ", ".join(parts) or "no emails"
+
+@app.get("/jobs")
+async def list_jobs(limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE), db: Session = Depends(get_db)):
+    """List the most recent background jobs"""
+    jobs = db.query(Job).order_by(Job.id.desc()).limit(limit).all()
+    return {"jobs": [job_to_dict(job) for job in jobs]}
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: int, db: Session = Depends(get_db), page: PageParams = Depends(page_params)):
+    """Get job progress and one page of per-recipient status (filter with status=error etc.)"""
+    job = db.get(Job, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    # Items are inserted in recipient order, so id order is position order
+    items, next_cursor = paginate_query(db.query(JobItem).filter(JobItem.job_id == job_id), JobItem, page,
+                                        page.cursors.get("db"), date_column="updated_at")
+    return {
+        **job_to_dict(job),
+        "items": [job_item_to_dict(item) for item in items],
+        "pagination": page.info({"db": next_cursor})
+    }
+
+@app.post("/jobs/{job_id}/resume")
+async def resume_background_job(job_id: int, retry_unknown: bool = False, db: Session = Depends(get_db)):
+    """
+    Requeue a failed or finished job; only items never sent are processed again.
+    retry_unknown=true also retries items whose send was interrupted by a crash.
+    """
+    job = db.get(Job, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status == "running":
+        raise HTTPException(status_code=409, detail="Job is still running")
+    job = resume_job(db, job, retry_unknown=retry_unknown)
+    return {"message": f"Job {job.id} requeued", "job": job_to_dict(job)}
+
 # 1. Global Outreach & Recruitment
 @app.post("/outreach")
-async def global_outreach(request: OutreachRequest):
+async def global_outreach(request: OutreachRequest, db: Session = Depends(get_db)):
     """
-    Generate and send personalized outreach emails
+    Generate and send personalized outreach emails.
+    Runs as a background job by default and returns its id; set "background": false
+    to wait for the results, or "stream": true to receive one NDJSON line per lead
+    as it finishes. "mode": "template" generates one email per segment instead of per lead.
     """
     try:
         # Load outreach leads
@@ -180,53 +393,39 @@ async def global_outreach(request: OutreachRequest):
         if not leads:
             raise HTTPException(status_code=404, detail="No outreach leads found")
         
-        results = []
-        
-        for lead in leads:
-            # Generate personalized email content
-            referral_line = ""
-            if lead.get("source") == "alumni":
-                referral_line = "As a valued alumni of our hackathon community, "
-            
-            prompt = f"""
-            Write a personalized outreach email for {lead['name']} from {lead['country']}.
-            {referral_line}
-            
-            The email should:
-            - Invite them to participate in our upcoming hackathon
-            - Highlight the benefits of joining our global hackathon community
-            - Be professional yet friendly and enthusiastic
-            - Include a call to action to register
-            
-            Custom message to include: {request.custom_message or "Join us for an amazing innovation experience!"}
-            """
-            
-            email_content = generate_text(prompt)
-            subject = f"🚀 Join HackaTwin - Global Hackathon Community"
-            
-            # Send email
-            email_result = send_email(lead['email'], subject, email_content)
-            
-            # Log the result
-            log_entry = {
-                "name": lead['name'],
-                "email": lead['email'],
-                "status": email_result['status'],
-                "timestamp": get_current_timestamp()
-            }
-            append_to_json_file("logs/outreach_log.json", log_entry)
+        if request.background and not request.stream:
+            return queue_campaign(db, "outreach", leads, {
+                "custom_message": request.custom_message,
+                "mode": request.mode,
+                "ai_workers": request.ai_workers,
+                "send_workers": request.send_workers
+            }, f"Outreach queued for {len(leads)} leads")
+        
+        run = CampaignRun(OutreachCampaign(request.custom_message), mode=request.mode,
+                          ai_workers=request.ai_workers, send_workers=request.send_workers)
+        
+        if request.stream:
+            async def stream_results():
+                statuses = []
+                async for entry in run.stream(leads):
+                    statuses.append(entry.get("status"))
+                    yield json.dumps(entry) + "\n"
+                yield json.dumps({"message": f"Outreach finished for {len(statuses)} leads: {delivery_summary(statuses)}",
+                                  "done": True}) + "\n"
             
-            results.append({
-                "name": lead['name'],
-                "email": lead['email'],
-                "status": email_result['status']
-            })
+            return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+        
+        results = await run.run_all(leads)
         
         return {
-            "message": f"Outreach completed for {len(results)} leads",
+            "message": f"Outreach finished for {len(results)} leads: {delivery_summary(r.get('status') for r in results)}",
+            "mode": run.mode,
+            "llm_calls": run.llm_calls if run.llm_calls is not None else len(results),
             "results": results
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -254,7 +453,7 @@ async def assign_tasks(request: TaskAssignment):
         Return the assignments in a clear format showing which team member should handle which task(s).
         """
         
-        assignments = generate_text(prompt, max_tokens=800)
+        assignments = await agenerate_text(prompt, max_tokens=800)
         
         # Save assignments
         assignment_log = {
@@ -266,15 +465,16 @@ async def assign_tasks(request: TaskAssignment):
         append_to_json_file("logs/team_tasks.json", assignment_log)
         
         # Optional: Send Slack DMs to volunteers (if Slack user IDs are provided)
-        slack_notifications = []
-        for member in request.team:
-            if "slack_id" in member:
-                message = f"Hi {member['name']}! You have new task assignments:\n\n{assignments}"
-                slack_result = send_slack_dm(member['slack_id'], message)
-                slack_notifications.append({
-                    "name": member['name'],
-                    "slack_status": slack_result['status']
-                })
+        # Sent concurrently; DM channels are cached and Slack's rate limits respected
+        notified = [member for member in request.team if "slack_id" in member]
+        slack_results = await asend_slack_dms([
+            {"user_id": member['slack_id'], "text": f"Hi {member['name']}! You have new task assignments:\n\n{assignments}"}
+            for member in notified
+        ])
+        slack_notifications = [
+            {"name": member['name'], "slack_status": slack_result['status']}
+            for member, slack_result in zip(notified, slack_results)
+        ]
         
         return {
             "message": "Tasks assigned successfully",
@@ -287,83 +487,33 @@ async def assign_tasks(request: TaskAssignment):
 
 # 3. Speaker & Jury Orchestration
 @app.get("/invite_jury_speakers")
-async def invite_jury_speakers():
+async def invite_jury_speakers(mode: GenerationMode = "per_recipient", background: bool = True,
+                               db: Session = Depends(get_db)):
     """
-    Generate and send personalized invites to jury and speakers
+    Generate and send personalized invites to jury and speakers.
+    mode=template writes one invite per expertise/topic and fills in names locally.
+    Runs as a background job unless background=false.
     """
     try:
         # Load jury and speakers data
         jury_members = load_json_file("data/jury.json")
         speakers = load_json_file("data/speakers.json")
         
-        results = []
+        recipients = ([{**jury, "role": "jury"} for jury in jury_members] +
+                      [{**speaker, "role": "speaker"} for speaker in speakers])
         
-        # Process jury invitations
-        for jury in jury_members:
-            prompt = f"""
-            Write a professional invitation email for {jury['name']} from {jury['company']} to be a jury member.
-            
-            Details:
-            - Expert in: {jury['expertise']}
-            - Experience: {jury['experience']}
-            
-            The email should:
-            - Acknowledge their expertise in {jury['expertise']}
-            - Invite them to judge our hackathon
-            - Highlight the importance of their role
-            - Be respectful and professional
-            """
-            
-            content = generate_text(prompt)
-            subject = f"🏆 Invitation to Judge HackaTwin - {jury['expertise']} Expert"
-            
-            email_result = send_email(jury['email'], subject, content)
-            
-            # Log the invite
-            log_entry = {
-                "name": jury['name'],
-                "role": "jury",
-                "type": "jury",
-                "status": email_result['status'],
-                "timestamp": get_current_timestamp()
-            }
-            append_to_json_file("logs/invites_log.json", log_entry)
-            results.append(log_entry)
+        if background:
+            return queue_campaign(db, "invite_jury_speakers", recipients, {"mode": mode},
+                                  f"Invitations queued for {len(jury_members)} jury members and {len(speakers)} speakers")
         
-        # Process speaker invitations
-        for speaker in speakers:
-            prompt = f"""
-            Write a professional invitation email for {speaker['name']} from {speaker['company']} to be a speaker.
-            
-            Details:
-            - Topic: {speaker['topic']}
-            - Bio: {speaker['bio']}
-            
-            The email should:
-            - Invite them to speak about {speaker['topic']}
-            - Acknowledge their expertise
-            - Highlight the impact they can make
-            - Be enthusiastic and professional
-            """
-            
-            content = generate_text(prompt)
-            subject = f"🎤 Speaking Invitation - HackaTwin: {speaker['topic']}"
-            
-            email_result = send_email(speaker['email'], subject, content)
-            
-            # Log the invite
-            log_entry = {
-                "name": speaker['name'],
-                "role": "speaker",
-                "type": "speaker",
-                "status": email_result['status'],
-                "timestamp": get_current_timestamp()
-            }
-            append_to_json_file("logs/invites_log.json", log_entry)
-            results.append(log_entry)
+        run = CampaignRun(JurySpeakerInviteCampaign(), mode=mode)
+        results = await run.run_all(recipients)
         
         return {
-            "message": f"Invitations sent to {len(jury_members)} jury members and {len(speakers)} speakers",
+            "message": f"Invitations to {len(jury_members)} jury members and {len(speakers)} speakers: "
+                       f"{delivery_summary(r.get('status') for r in results)}",
+            "mode": run.mode,
+            "llm_calls": run.llm_calls if run.llm_calls is not None else len(results),
             "results": results
         }
         
@@ -371,83 +521,30 @@ async def invite_jury_speakers():
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/invite_jury")
-async def invite_jury_custom(request: JuryInviteRequest):
+async def invite_jury_custom(request: JuryInviteRequest, db: Session = Depends(get_db)):
     """
     Send personalized invites to selected jury members and speakers
     """
     try:
-        results = []
-        
-        # Process judge invitations
-        for judge in request.judges:
-            if not judge.get('name') or not judge.get('email'):
-                continue
-                
-            prompt = f"""
-            Write a professional invitation email for {judge['name']} to be a jury member for {request.event_info}.
-            
-            The email should:
-            - Be personalized and professional
-            - Acknowledge their expertise in {judge.get('expertise', 'technology')}
-            - Invite them to judge our hackathon
-            - Mention the event details: {request.event_info}
-            - Express the importance of their role
-            - Be respectful and enthusiastic
-            """
-            
-            content = generate_text(prompt)
-            subject = f"🏆 Invitation to Judge HackaTwin - {judge.get('expertise', 'Expert')}"
-            
-            email_result = send_email(judge['email'], subject, content)
-            
-            # Log the invite
-            log_entry = {
-                "name": judge['name'],
-                "email": judge['email'],
-                "role": "judge",
-                "expertise": judge.get('expertise', 'N/A'),
-                "status": email_result['status'],
-                "timestamp": get_current_timestamp()
-            }
-            append_to_json_file("logs/jury_invites_log.json", log_entry)
-            results.append(log_entry)
-        
-        # Process speaker invitations
-        for speaker in request.speakers:
-            if not speaker.get('name') or not speaker.get('email'):
-                continue
-                
-            prompt = f"""
-            Write a professional speaking invitation email for {speaker['name']} for {request.event_info}.
-            
-            The email should:
-            - Be personalized and engaging
-            - Invite them to speak at our hackathon
-            - Mention their expertise in {speaker.get('topic', 'technology')}
-            - Include event details: {request.event_info}
-            - Highlight the impact they can make
-            - Be enthusiastic and professional
-            """
-            
-            content = generate_text(prompt)
-            subject = f"🎤 Speaking Invitation - HackaTwin: {speaker.get('topic', 'Innovation')}"
-            
-            email_result = send_email(speaker['email'], subject, content)
-            
-            # Log the invite
-            log_entry = {
-                "name": speaker['name'],
-                "email": speaker['email'],
-                "role": "speaker", 
-                "topic": speaker.get('topic', 'N/A'),
-                "status": email_result['status'],
-                "timestamp": get_current_timestamp()
-            }
-            append_to_json_file("logs/jury_invites_log.json", log_entry)
-            results.append(log_entry)
+        recipients = (
+            [{**judge, "role": "judge"} for judge in request.judges
+             if judge.get('name') and judge.get('email')] +
+            [{**speaker, "role": "speaker"} for speaker in request.speakers
+             if speaker.get('name') and speaker.get('email')]
+        )
+        
+        if request.background:
+            return queue_campaign(db, "invite_jury", recipients, {"event_info": request.event_info, "mode": request.mode},
+                                  f"Invitations queued for {len(request.judges)} judges and {len(request.speakers)} speakers")
+        
+        run = CampaignRun(CustomJuryInviteCampaign(request.event_info), mode=request.mode)
+        results = await run.run_all(recipients)
         
         return {
-            "message": f"Invitations sent to {len(request.judges)} judges and {len(request.speakers)} speakers",
+            "message": f"Invitations to {len(request.judges)} judges and {len(request.speakers)} speakers: "
+                       f"{delivery_summary(r.get('status') for r in results)}",
+            "mode": run.mode,
+            "llm_calls": run.llm_calls if run.llm_calls is not None else len(results),
             "results": results
         }
         
@@ -476,7 +573,7 @@ async def generate_agenda(request: AgendaRequest):
         Format as a structured JSON with days, sessions, times, and topics.
         """
         
-        agenda_content = generate_text(prompt, max_tokens=1000)
+        agenda_content = await agenerate_text(prompt, max_tokens=1000)
         
         # Save to content history
         content_entry = {
@@ -521,7 +618,7 @@ async def generate_challenge(request: ChallengeRequest):
         Make it engaging and clear for participants.
         """
         
-        challenge_content = generate_text(prompt, max_tokens=1000)
+        challenge_content = await agenerate_text(prompt, max_tokens=1000)
         
         # Save to content history
         content_entry = {
@@ -558,8 +655,8 @@ async def schedule_call(request: ScheduleCallRequest):
 See you there! 👥
         """
         
-        # Send to Slack
-        slack_result = send_slack_message(os.getenv('SLACK_CHANNEL_ID'), message)
+        # Send to Slack (posts arriving together are coalesced)
+        slack_result = await aqueue_slack_message(os.getenv('SLACK_CHANNEL_ID'), message)
         
         # Log the call
         call_entry = {
@@ -597,7 +694,7 @@ async def answer_question(request: QuestionRequest):
         - Offers practical guidance when applicable
         """
         
-        answer = generate_text(prompt)
+        answer = await agenerate_text(prompt)
         
         return {
             "question": request.question,
@@ -631,7 +728,7 @@ async def generate_sponsor_email(request: SponsorEmailRequest):
         - Have a strong call to action
         """
         
-        email_content = generate_text(prompt, max_tokens=800)
+        email_content = await agenerate_text(prompt, max_tokens=800)
         
         return {
             "company": request.company_name,
@@ -664,11 +761,16 @@ async def send_sponsor_email(request: SendSponsorEmailRequest):
         - Have a strong call to action
         """
         
-        email_content = generate_text(prompt, max_tokens=800)
+        email_content = await agenerate_text(prompt, max_tokens=800)
         subject = f"Partnership Opportunity - HackaTwin Sponsorship"
         
-        # Send email
-        email_result = send_email(request.email, subject, email_content)
+        # Queue (or send) the email without holding up the event loop; every request is its own send
+        campaign = f"sponsor:{uuid.uuid4().hex[:12]}"
+        email_result = await asyncio.to_thread(deliver_email, request.email, subject, email_content, campaign)
+        status = email_result['status']
+        if email_result.get("duplicate"):
+            # Already in the outbox: report where that email is rather than queueing it again
+            status = email_result.get("outbox_status", status)
         
         # Log the interaction
         log_entry = {
@@ -676,14 +778,24 @@ async def send_sponsor_email(request: SendSponsorEmailRequest):
             "email": request.email,
             "industry": request.industry,
             "benefits": request.benefits,
-            "status": email_result['status'],
+            "status": status,
             "timestamp": get_current_timestamp()
         }
         append_to_json_file("logs/sponsor_log.json", log_entry)
         
+        if email_result["status"] == "success":
+            message = f"Sponsorship email sent to {request.company_name}"
+        elif email_result["status"] == "queued":
+            message = f"Sponsorship email to {request.company_name} queued in the outbox"
+        elif email_result["status"] == "duplicate":
+            message = f"Sponsorship email to {request.company_name} already in the outbox ({status})"
+        else:
+            message = f"Sponsorship email to {request.company_name} failed"
         return {
-            "message": f"Sponsorship email sent to {request.company_name}",
-            "status": email_result['status'],
+            "message": message,
+            "status": status,
+            # Poll GET /api/outbox/{outbox_id} for the delivery outcome
+            "outbox_id": email_result.get("outbox_id"),
             "email_content": email_content
         }
         
@@ -694,57 +806,87 @@ async def send_sponsor_email(request: SendSponsorEmailRequest):
 @app.post("/onboard_member")
 async def onboard_member(request: OnboardMemberRequest):
     """
-    Onboard new community member
+    Onboard new community member.
+    The member is saved before responding; the welcome email and Slack
+    announcement run afterwards (see GET /api/members/{member_id}/onboarding).
     """
     try:
-        # Add to community
-        member_data = {
-            "name": request.name,
-            "email": request.email,
-            "country": request.country,
-            "joined_date": get_current_timestamp()
-        }
-        
-        # Load current community
-        community = load_json_file("data/community.json")
-        community.append(member_data)
-        save_json_file("data/community.json", community)
-        
-        # Generate welcome email
-        prompt = f"""
-        Write a warm welcome email for {request.name} from {request.country} who just joined our hackathon community.
-        
-        The email should:
-        - Welcome them enthusiastically
-        - Introduce them to the community
-        - Mention upcoming events and opportunities
-        - Include links to our Discord and resources
-        - Encourage them to participate actively
-        """
-        
-        welcome_email = generate_text(prompt)
-        subject = f"🎉 Welcome to HackaTwin Community, {request.name}!"
-        
-        # Send welcome email
-        email_result = send_email(request.email, subject, welcome_email)
+        member, created = await asyncio.to_thread(add_member, request.name, request.email, request.country)
+        
+        if not created:
+            return {
+                "message": f"{request.email} is already a community member",
+                "member_id": member.id,
+                "onboarding_status": member.onboarding_status,
+                "already_member": True
+            }
         
-        # Send Slack DM if possible (would need Slack user mapping)
-        slack_message = f"🎉 Welcome {request.name} from {request.country} to our HackaTwin community! Check your email for onboarding info."
-        slack_result = send_slack_message(os.getenv('SLACK_CHANNEL_ID'), slack_message)
+        onboarding_pipeline.start(member.id)
         
         return {
             "message": f"Successfully onboarded {request.name}",
-            "email_status": email_result['status'],
-            "slack_status": slack_result['status']
+            "member_id": member.id,
+            "onboarding_status": "pending",
+            "email_status": "pending",
+            "slack_status": "pending",
+            "status_url": f"/api/members/{member.id}/onboarding"
         }
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/members/{member_id}/onboarding")
+async def get_member_onboarding(member_id: int, db: Session = Depends(get_db)):
+    """Status of a member's welcome email and Slack announcement"""
+    member = db.get(CommunityMember, member_id)
+    if member is None:
+        raise HTTPException(status_code=404, detail="Member not found")
+    return onboarding_to_dict(member)
+
+@app.post("/api/members/import")
+async def import_community_members(request: Request, format: Optional[Literal["csv", "jsonl", "json"]] = None):
+    """
+    Bulk import members from CSV (header row: name,email,country,skills,interests),
+    JSONL or a JSON array, sent as the request body or as a multipart `file`. Emails
+    already registered or repeated in the upload are rejected; no onboarding messages are sent.
+    """
+    try:
+        content_type = request.headers.get("content-type", "")
+        # Spool the upload so thousands of rows never sit in memory at once
+        spool = tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024)
+        filename = ""
+        if content_type.startswith("multipart/form-data"):
+            form = await request.form()
+            upload = form.get("file")
+            if upload is None or isinstance(upload, str):
+                raise HTTPException(status_code=400, detail="Expected a 'file' upload")
+            filename = upload.filename or ""
+            content_type = upload.content_type or ""
+            while chunk := await upload.read(1024 * 1024):
+                spool.write(chunk)
+        else:
+            async for chunk in request.stream():
+                spool.write(chunk)
+        spool.seek(0)
+        
+        fmt = format or detect_format(content_type, filename)
+        with spool:
+            return await asyncio.to_thread(import_members, spool, fmt)
+        
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid {fmt} upload: {e}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.post("/post_event_followup")
-async def post_event_followup():
+async def post_event_followup(mode: GenerationMode = "per_recipient", background: bool = True,
+                              db: Session = Depends(get_db)):
     """
-    Send follow-up emails to all community members
+    Send follow-up emails to all community members.
+    mode=template generates a single email and personalizes it per member.
+    Runs as a background job unless background=false.
     """
     try:
         # Load community members
@@ -753,34 +895,18 @@ async def post_event_followup():
         if not community:
             return {"message": "No community members found"}
         
-        results = []
+        if background:
+            return queue_campaign(db, "post_event_followup", community, {"mode": mode},
+                                  f"Follow-up emails queued for {len(community)} community members")
         
-        for member in community:
-            prompt = f"""
-            Write a post-event follow-up email for {member['name']} from {member['country']}.
-            
-            The email should:
-            - Thank them for being part of our community
-            - Share highlights from recent events
-            - Invite them to upcoming challenges
-            - Encourage continued participation
-            - Include links to new opportunities
-            """
-            
-            followup_content = generate_text(prompt)
-            subject = "🚀 Thank You & What's Next - HackaTwin Community"
-            
-            # Send email
-            email_result = send_email(member['email'], subject, followup_content)
-            
-            results.append({
-                "name": member['name'],
-                "email": member['email'],
-                "status": email_result['status']
-            })
+        run = CampaignRun(FollowupCampaign(), mode=mode)
+        results = await run.run_all(community)
         
         return {
-            "message": f"Follow-up emails sent to {len(results)} community members",
+            "message": f"Follow-up emails to {len(results)} community members: "
+                       f"{delivery_summary(r.get('status') for r in results)}",
+            "mode": run.mode,
+            "llm_calls": run.llm_calls if run.llm_calls is not None else len(results),
             "results": results
         }
         
@@ -788,61 +914,53 @@ async def post_event_followup():
         raise HTTPException(status_code=500, detail=str(e))
 
 # API endpoints to fetch logs and statistics
+def stream_log_response(file_path: str, predicate=None) -> StreamingResponse:
+    """Stream {"logs": [...]}, writing each entry as it is read from the file (never the whole log in memory)"""
+    def body():
+        yield '{"logs": ['
+        first = True
+        try:
+            for entry in iter_json_log(file_path):
+                if predicate and not predicate(entry):
+                    continue
+                yield ("" if first else ",") + json.dumps(entry, ensure_ascii=False)
+                first = False
+        except Exception as e:
+            print(f"Error streaming {file_path}: {e}")
+        yield "]}"
+    
+    return StreamingResponse(body(), media_type="application/json")
+
 @app.get("/api/logs/outreach")
 async def get_outreach_logs():
     """Get outreach email logs"""
-    try:
-        logs = load_json_file("logs/outreach_log.json")
-        return {"logs": logs if logs else []}
-    except Exception:
-        return {"logs": []}
+    return stream_log_response("logs/outreach_log.json")
 
 @app.get("/api/logs/team-tasks")
 async def get_team_tasks_logs():
     """Get team task assignment logs"""
-    try:
-        logs = load_json_file("logs/team_tasks.json")
-        return {"logs": logs if logs else []}
-    except Exception:
-        return {"logs": []}
+    return stream_log_response("logs/team_tasks.json")
 
 @app.get("/api/logs/jury-invites")
 async def get_jury_invites_logs():
     """Get jury and speaker invitation logs"""
-    try:
-        logs = load_json_file("logs/invites_log.json")
-        return {"logs": logs if logs else []}
-    except Exception:
-        return {"logs": []}
+    return stream_log_response("logs/invites_log.json")
 
 @app.get("/api/logs/agenda")
 async def get_agenda_logs():
     """Get agenda generation logs"""
-    try:
-        logs = load_json_file("logs/content_history.json")
-        # Filter for agenda entries only
-        agenda_logs = [log for log in (logs or []) if log.get("type") == "agenda"]
-        return {"logs": agenda_logs}
-    except Exception:
-        return {"logs": []}
+    # Filter for agenda entries only
+    return stream_log_response("logs/content_history.json", lambda log: log.get("type") == "agenda")
 
 @app.get("/api/logs/moderation")
 async def get_moderation_logs():
     """Get moderation session logs"""
-    try:
-        logs = load_json_file("logs/event_calls.json")
-        return {"logs": logs if logs else []}
-    except Exception:
-        return {"logs": []}
+    return stream_log_response("logs/event_calls.json")
 
 @app.get("/api/logs/fundraising")
 async def get_fundraising_logs():
     """Get sponsorship outreach logs"""
-    try:
-        logs = load_json_file("logs/sponsor_log.json")
-        return {"logs": logs if logs else []}
-    except Exception:
-        return {"logs": []}
+    return stream_log_response("logs/sponsor_log.json")
 
 @app.get("/api/logs/community")
 async def get_community_logs():
@@ -859,7 +977,7 @@ async def get_dashboard_stats_db(db: Session = Depends(get_db)):
     Get real-time dashboard statistics from database
     """
     try:
-        stats = get_dashboard_stats(db)
+        stats = get_db_dashboard_stats(db)
         return {
             "status": "success",
             "stats": stats
@@ -867,85 +985,22 @@ async def get_dashboard_stats_db(db: Session = Depends(get_db)):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/stats/dashboard/db/cache")
+async def get_dashboard_stats_cache():
+    """Get database dashboard stats cache hits, misses and invalidations"""
+    return {"cache": dashboard_stats_cache.stats()}
+
+@app.delete("/api/stats/dashboard/db/cache")
+async def clear_dashboard_stats_cache():
+    """Drop the cached database dashboard stats"""
+    dashboard_stats_cache.invalidate()
+    return {"message": "Dashboard stats cache cleared", "cache": dashboard_stats_cache.stats()}
+
 @app.get("/api/stats/dashboard")
 async def get_dashboard_stats():
-    """Get dashboard overview statistics"""
+    """Get dashboard overview statistics (maintained on write, O(1) to read)"""
     try:
-        stats = {
-            "total_events": 0,
-            "active_projects": 0,
-            "team_members": 0,
-            "emails_sent": 0,
-            "funds_raised": 0,
-            "community_growth": 0,
-            "recent_activities": []
-        }
-        
-        # Count emails sent from outreach logs
-        outreach_logs = load_json_file("logs/outreach_log.json") or []
-        stats["emails_sent"] = len(outreach_logs)
-        
-        # Count team members from team task logs
-        team_logs = load_json_file("logs/team_tasks.json") or []
-        unique_members = set()
-        for log in team_logs:
-            if "team" in log:
-                for member in log["team"]:
-                    unique_members.add(member.get("email", ""))
-        stats["team_members"] = len(unique_members)
-        
-        # Count community members
-        community = load_json_file("data/community.json") or []
-        stats["community_growth"] = len(community)
-        
-        # Count agenda/events generated
-        content_logs = load_json_file("logs/content_history.json") or []
-        agenda_count = len([log for log in content_logs if log.get("type") == "agenda"])
-        stats["total_events"] = agenda_count
-        
-        # Count active projects (from sponsor logs + team tasks)
-        sponsor_logs = load_json_file("logs/sponsor_log.json") or []
-        stats["active_projects"] = len(team_logs) + len(sponsor_logs)
-        
-        # Calculate estimated funds raised (mock calculation based on sponsors)
-        stats["funds_raised"] = len(sponsor_logs) * 15000  # Estimate $15k per sponsor
-        
-        # Get recent activities from all logs
-        recent_activities = []
-        
-        # Add recent outreach activities
-        for log in outreach_logs[-3:]:
-            recent_activities.append({
-                "title": "Email outreach completed",
-                "description": f"Sent email to {log.get('name', 'contact')}",
-                "time": log.get("timestamp", "Unknown"),
-                "type": "outreach"
-            })
-        
-        # Add recent team activities
-        for log in team_logs[-2:]:
-            recent_activities.append({
-                "title": "Team tasks assigned",
-                "description": f"AI assigned {len(log.get('tasks', []))} tasks to team",
-                "time": log.get("timestamp", "Unknown"),
-                "type": "team"
-            })
-        
-        # Add recent agenda activities
-        for log in content_logs[-2:]:
-            if log.get("type") == "agenda":
-                recent_activities.append({
-                    "title": "Event agenda generated",
-                    "description": f"Created agenda for {log.get('event_name', 'event')}",
-                    "time": log.get("timestamp", "Unknown"),
-                    "type": "agenda"
-                })
-        
-        # Sort activities by timestamp (most recent first)
-        recent_activities.sort(key=lambda x: x["time"], reverse=True)
-        stats["recent_activities"] = recent_activities[:6]
-        
-        return {"stats": stats}
+        return {"stats": dashboard_stats.snapshot()}
         
     except Exception as e:
         return {"stats": {
@@ -958,75 +1013,107 @@ async def get_dashboard_stats():
             "recent_activities": []
         }}
 
+@app.post("/api/stats/dashboard/rebuild")
+async def rebuild_dashboard_stats():
+    """Recompute dashboard counters from the log and data files"""
+    try:
+        return {"status": "success", "stats": await asyncio.to_thread(dashboard_stats.rebuild)}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 # ===== COMPREHENSIVE DATA RETRIEVAL ENDPOINTS =====
 
+# Each /api/all/* response pages every source (database table or JSON log) with the
+# same limit; one cursor carries all their positions. Counts and stats cover every
+# row that matches the filters, not just the current page.
+
+def all_db_page(db: Session, model, page: PageParams, source: str, fields, date_column: str = "created_at",
+                default_exclude=(), extra: Optional[Dict[str, Any]] = None):
+    """One page of a table for /api/all/* plus the filtered row count"""
+    selected = page.select(fields, default_exclude)
+    rows, next_cursor = paginate_query(db.query(model), model, page, page.cursors.get(source),
+                                       date_column=date_column, columns=selected)
+    total = filter_query(db.query(func.count(model.id)), model, page, date_column).scalar()
+    extra = {**(extra or {}), "source": "database"}
+    return [{**row_to_dict(row, selected), **extra} for row in rows], next_cursor, total
+
+def all_log_page(file_path: str, page: PageParams, source: str, to_record):
+    """One page of a JSON log for /api/all/* plus every filtered entry (for counts and stats)"""
+    entries = filter_entries(load_json_log(file_path), page)
+    chunk, next_cursor = paginate_entries(entries, page, page.cursors.get(source))
+    return [page.project(to_record(entry), default_exclude=("content",)) for entry in chunk], next_cursor, entries
+
 @app.get("/api/all/volunteers")
-async def get_all_volunteers(db: Session = Depends(get_db)):
-    """Get all volunteers/team members from database and JSON files"""
+async def get_all_volunteers(db: Session = Depends(get_db), page: PageParams = Depends(page_params)):
+    """Get volunteers/team members from database and JSON files"""
     try:
         result = {
             "database_data": [],
             "json_data": [],
             "total_count": 0
         }
+        next_cursors = {}
         
         # Get from database
         try:
-            db_members = db.query(TeamMember).all()
-            result["database_data"] = [
-                {
-                    "id": m.id,
-                    "name": m.name,
-                    "email": m.email,
-                    "role": m.role,
-                    "skills": m.skills,
-                    "status": m.status,
-                    "created_at": m.created_at.isoformat() if m.created_at else None,
-                    "source": "database"
-                } for m in db_members
-            ]
+            result["database_data"], next_cursors["db"], db_total = all_db_page(
+                db, TeamMember, page, "db", ("id", "name", "email", "role", "skills", "status", "created_at")
+            )
+            result["total_count"] += db_total
+        except HTTPException:
+            raise
         except Exception as e:
             print(f"Database query error: {e}")
         
         # Get from JSON files
         try:
-            team_data = load_json_file("logs/team_tasks.json")
-            for entry in team_data:
-                result["json_data"].append({
+            team_page, next_cursors["team_json"], team_entries = all_log_page(
+                "logs/team_tasks.json", page, "team_json", lambda entry: {
                     "name": entry.get("assigned_to", "Unknown"),
                     "email": entry.get("email", ""),
                     "task": entry.get("task", ""),
                     "status": entry.get("status", ""),
-                    "timestamp": entry.get("timestamp", ""),
-                    "source": "json_team_tasks"
+                    "timestamp": entry.get("timestamp", "")
                 })
+            result["json_data"] += [{**entry, "source": "json_team_tasks"} for entry in team_page]
+            result["total_count"] += len(team_entries)
         except Exception as e:
             print(f"JSON file error: {e}")
         
         # Get community members from JSON
         try:
-            community_data = load_json_file("logs/community_log.json")
-            for entry in community_data:
-                result["json_data"].append({
+            community_page, next_cursors["community_json"], community_entries = all_log_page(
+                "logs/community_log.json", page, "community_json", lambda entry: {
                     "name": entry.get("member_name", "Unknown"),
                     "email": entry.get("email", ""),
                     "message_type": entry.get("message_type", ""),
                     "status": entry.get("status", ""),
-                    "timestamp": entry.get("timestamp", ""),
-                    "source": "json_community"
+                    "timestamp": entry.get("timestamp", "")
                 })
+            result["json_data"] += [{**entry, "source": "json_community"} for entry in community_page]
+            result["total_count"] += len(community_entries)
         except Exception as e:
             print(f"Community JSON error: {e}")
         
-        result["total_count"] = len(result["database_data"]) + len(result["json_data"])
+        result["pagination"] = page.info(next_cursors)
         return result
         
+    except HTTPException:
+        raise
     except Exception as e:
         return {"error": str(e), "database_data": [], "json_data": [], "total_count": 0}
 
+def outreach_outcome(status: Optional[str]) -> str:
+    status = (status or "").lower()
+    if status in ["success", "delivered", "opened"]:
+        return "successful"
+    if status in ["error", "failed", "bounce"]:
+        return "failed"
+    return "pending"
+
 @app.get("/api/all/outreach")
-async def get_all_outreach(db: Session = Depends(get_db)):
-    """Get all outreach data from database and JSON files"""
+async def get_all_outreach(db: Session = Depends(get_db), page: PageParams = Depends(page_params)):
+    """Get outreach data from database and JSON files"""
     try:
         result = {
             "database_data": [],
@@ -1039,132 +1126,115 @@ async def get_all_outreach(db: Session = Depends(get_db)):
                 "pending": 0
             }
         }
+        next_cursors = {}
         
         # Get from database
         try:
-            db_outreach = db.query(OutreachLog).all()
-            result["database_data"] = [
-                {
-                    "id": o.id,
-                    "name": o.name,
-                    "email": o.email,
-                    "message_type": o.message_type,
-                    "status": o.status,
-                    "sent_at": o.sent_at.isoformat() if o.sent_at else None,
-                    "source": "database"
-                } for o in db_outreach
-            ]
+            result["database_data"], next_cursors["db"], _ = all_db_page(
+                db, OutreachLog, page, "db", ("id", "name", "email", "message_type", "status", "sent_at"),
+                date_column="sent_at"
+            )
+            # Statistics from one GROUP BY instead of loading every row
+            by_status = filter_query(
+                db.query(OutreachLog.status, func.count(OutreachLog.id)), OutreachLog, page, "sent_at"
+            ).group_by(OutreachLog.status).all()
+            for status, count in by_status:
+                result["stats"][outreach_outcome(status)] += count
+                result["stats"]["total_emails"] += count
+        except HTTPException:
+            raise
         except Exception as e:
             print(f"Database outreach error: {e}")
         
         # Get from JSON files
         try:
-            outreach_data = load_json_file("logs/outreach_log.json")
-            for entry in outreach_data:
-                result["json_data"].append({
+            outreach_page, next_cursors["json"], outreach_entries = all_log_page(
+                "logs/outreach_log.json", page, "json", lambda entry: {
                     "name": entry.get("name", "Unknown"),
                     "email": entry.get("email", ""),
                     "status": entry.get("status", ""),
-                    "timestamp": entry.get("timestamp", ""),
-                    "source": "json_outreach"
+                    "timestamp": entry.get("timestamp", "")
                 })
+            result["json_data"] = [{**entry, "source": "json_outreach"} for entry in outreach_page]
+            for entry in outreach_entries:
+                result["stats"][outreach_outcome(entry.get("status"))] += 1
+                result["stats"]["total_emails"] += 1
         except Exception as e:
             print(f"Outreach JSON error: {e}")
         
-        # Calculate statistics
-        all_entries = result["database_data"] + result["json_data"]
-        result["stats"]["total_emails"] = len(all_entries)
-        
-        for entry in all_entries:
-            status = entry.get("status", "").lower()
-            if status in ["success", "delivered", "opened"]:
-                result["stats"]["successful"] += 1
-            elif status in ["error", "failed", "bounce"]:
-                result["stats"]["failed"] += 1
-            else:
-                result["stats"]["pending"] += 1
-        
-        result["total_count"] = len(all_entries)
+        result["total_count"] = result["stats"]["total_emails"]
+        result["pagination"] = page.info(next_cursors)
         return result
         
+    except HTTPException:
+        raise
     except Exception as e:
         return {"error": str(e), "database_data": [], "json_data": [], "total_count": 0}
 
 @app.get("/api/all/jury-speakers")
-async def get_all_jury_speakers(db: Session = Depends(get_db)):
-    """Get all jury members and speakers from database and JSON files"""
+async def get_all_jury_speakers(db: Session = Depends(get_db), page: PageParams = Depends(page_params)):
+    """Get jury members and speakers from database and JSON files"""
     try:
         result = {
             "database_jury": [],
             "database_speakers": [],
             "json_data": [],
-            "total_count": 0
+            "total_count": 0,
+            "counts": {"jury": 0, "speakers": 0, "json": 0}
         }
+        next_cursors = {}
         
         # Get jury from database
         try:
-            db_jury = db.query(JuryMember).all()
-            result["database_jury"] = [
-                {
-                    "id": j.id,
-                    "name": j.name,
-                    "email": j.email,
-                    "expertise": j.expertise,
-                    "company": j.company,
-                    "status": j.status,
-                    "created_at": j.created_at.isoformat() if j.created_at else None,
-                    "role": "judge",
-                    "source": "database"
-                } for j in db_jury
-            ]
+            result["database_jury"], next_cursors["jury"], result["counts"]["jury"] = all_db_page(
+                db, JuryMember, page, "jury", ("id", "name", "email", "expertise", "company", "status", "created_at"),
+                extra={"role": "judge"}
+            )
+        except HTTPException:
+            raise
         except Exception as e:
             print(f"Database jury error: {e}")
         
         # Get speakers from database
         try:
-            db_speakers = db.query(Speaker).all()
-            result["database_speakers"] = [
-                {
-                    "id": s.id,
-                    "name": s.name,
-                    "email": s.email,
-                    "topic": s.topic,
-                    "company": s.company,
-                    "status": s.status,
-                    "created_at": s.created_at.isoformat() if s.created_at else None,
-                    "role": "speaker",
-                    "source": "database"
-                } for s in db_speakers
-            ]
+            result["database_speakers"], next_cursors["speakers"], result["counts"]["speakers"] = all_db_page(
+                db, Speaker, page, "speakers", ("id", "name", "email", "topic", "company", "status", "created_at"),
+                extra={"role": "speaker"}
+            )
+        except HTTPException:
+            raise
         except Exception as e:
             print(f"Database speakers error: {e}")
         
         # Get from JSON files
         try:
-            jury_data = load_json_file("logs/jury_invites_log.json")
-            for entry in jury_data:
-                result["json_data"].append({
+            jury_page, next_cursors["json"], jury_entries = all_log_page(
+                "logs/jury_invites_log.json", page, "json", lambda entry: {
                     "name": entry.get("name", "Unknown"),
                     "email": entry.get("email", ""),
                     "role": entry.get("role", ""),
                     "expertise": entry.get("expertise", ""),
                     "topic": entry.get("topic", ""),
                     "status": entry.get("status", ""),
-                    "timestamp": entry.get("timestamp", ""),
-                    "source": "json_jury_invites"
+                    "timestamp": entry.get("timestamp", "")
                 })
+            result["json_data"] = [{**entry, "source": "json_jury_invites"} for entry in jury_page]
+            result["counts"]["json"] = len(jury_entries)
         except Exception as e:
             print(f"Jury JSON error: {e}")
         
-        result["total_count"] = len(result["database_jury"]) + len(result["database_speakers"]) + len(result["json_data"])
+        result["total_count"] = sum(result["counts"].values())
+        result["pagination"] = page.info(next_cursors)
         return result
         
+    except HTTPException:
+        raise
     except Exception as e:
         return {"error": str(e), "database_jury": [], "database_speakers": [], "json_data": [], "total_count": 0}
 
 @app.get("/api/all/sponsors")
-async def get_all_sponsors(db: Session = Depends(get_db)):
-    """Get all sponsors and fundraising data"""
+async def get_all_sponsors(db: Session = Depends(get_db), page: PageParams = Depends(page_params)):
+    """Get sponsors and fundraising data"""
     try:
         result = {
             "database_data": [],
@@ -1176,118 +1246,120 @@ async def get_all_sponsors(db: Session = Depends(get_db)):
                 "pending_amount": 0
             }
         }
+        next_cursors = {}
         
         # Get from database
         try:
-            db_sponsors = db.query(Sponsor).all()
-            result["database_data"] = [
-                {
-                    "id": s.id,
-                    "company_name": s.company_name,
-                    "contact_email": s.contact_email,
-                    "contact_person": s.contact_person,
-                    "sponsorship_level": s.sponsorship_level,
-                    "amount": s.amount,
-                    "status": s.status,
-                    "created_at": s.created_at.isoformat() if s.created_at else None,
-                    "source": "database"
-                } for s in db_sponsors
-            ]
+            result["database_data"], next_cursors["db"], db_total = all_db_page(
+                db, Sponsor, page, "db",
+                ("id", "company_name", "contact_email", "contact_person", "sponsorship_level", "amount", "status", "created_at")
+            )
+            result["total_count"] += db_total
+            # Funding totals from one aggregate query
+            amounts = filter_query(
+                db.query(Sponsor.status == "confirmed", func.coalesce(func.sum(Sponsor.amount), 0)), Sponsor, page
+            ).group_by(Sponsor.status == "confirmed").all()
+            for confirmed, amount in amounts:
+                result["funding_stats"]["total_requested"] += amount
+                result["funding_stats"]["total_confirmed" if confirmed else "pending_amount"] += amount
+        except HTTPException:
+            raise
         except Exception as e:
             print(f"Database sponsors error: {e}")
         
         # Get from JSON files
         try:
-            funding_data = load_json_file("logs/fundraising_log.json")
-            for entry in funding_data:
-                result["json_data"].append({
+            funding_page, next_cursors["json"], funding_entries = all_log_page(
+                "logs/fundraising_log.json", page, "json", lambda entry: {
                     "company": entry.get("company", "Unknown"),
                     "contact_email": entry.get("contact_email", ""),
                     "amount_requested": entry.get("amount_requested", 0),
                     "status": entry.get("status", ""),
                     "proposal_type": entry.get("proposal_type", ""),
-                    "timestamp": entry.get("timestamp", ""),
-                    "source": "json_fundraising"
+                    "timestamp": entry.get("timestamp", "")
                 })
+            result["json_data"] = [{**entry, "source": "json_fundraising"} for entry in funding_page]
+            result["total_count"] += len(funding_entries)
+            for entry in funding_entries:
+                amount = entry.get("amount_requested", 0) or 0
+                result["funding_stats"]["total_requested"] += amount
+                if entry.get("status") == "confirmed":
+                    result["funding_stats"]["total_confirmed"] += amount
+                else:
+                    result["funding_stats"]["pending_amount"] += amount
         except Exception as e:
             print(f"Fundraising JSON error: {e}")
         
-        # Calculate funding statistics
-        for sponsor in result["database_data"]:
-            amount = sponsor.get("amount", 0) or 0
-            result["funding_stats"]["total_requested"] += amount
-            if sponsor.get("status") == "confirmed":
-                result["funding_stats"]["total_confirmed"] += amount
-            else:
-                result["funding_stats"]["pending_amount"] += amount
-        
-        for entry in result["json_data"]:
-            amount = entry.get("amount_requested", 0) or 0
-            result["funding_stats"]["total_requested"] += amount
-            if entry.get("status") == "confirmed":
-                result["funding_stats"]["total_confirmed"] += amount
-            else:
-                result["funding_stats"]["pending_amount"] += amount
-        
-        result["total_count"] = len(result["database_data"]) + len(result["json_data"])
+        result["pagination"] = page.info(next_cursors)
         return result
         
+    except HTTPException:
+        raise
     except Exception as e:
         return {"error": str(e), "database_data": [], "json_data": [], "total_count": 0}
 
+def content_preview(content: Optional[str]) -> str:
+    content = content or ""
+    return content[:500] + "..." if len(content) > 500 else content
+
 @app.get("/api/all/agendas")
-async def get_all_agendas(db: Session = Depends(get_db)):
-    """Get all agendas with full content preview"""
+async def get_all_agendas(db: Session = Depends(get_db), page: PageParams = Depends(page_params)):
+    """Get agendas with a content preview (the full content only with fields=...,content)"""
     try:
         result = {
             "database_data": [],
             "json_data": [],
             "total_count": 0
         }
+        next_cursors = {}
         
         # Get from database
         try:
-            db_agendas = db.query(Agenda).all()
-            result["database_data"] = [
-                {
-                    "id": a.id,
-                    "title": a.title,
-                    "content": a.content,
-                    "content_preview": a.content[:500] + "..." if len(a.content) > 500 else a.content,
-                    "day_number": a.day_number,
-                    "version": a.version,
-                    "created_at": a.created_at.isoformat() if a.created_at else None,
-                    "source": "database"
-                } for a in db_agendas
-            ]
+            selected = page.select(("id", "title", "content", "content_preview", "day_number", "version", "created_at"),
+                                   default_exclude=("content",))
+            columns = [f for f in selected if f != "content_preview"]
+            if "content_preview" in selected and "content" not in columns:
+                columns.append("content")
+            rows, next_cursors["db"] = paginate_query(db.query(Agenda), Agenda, page, page.cursors.get("db"),
+                                                      columns=columns)
+            for a in rows:
+                agenda = row_to_dict(a, [f for f in selected if f != "content_preview"])
+                if "content_preview" in selected:
+                    agenda["content_preview"] = content_preview(a.content)
+                agenda["source"] = "database"
+                result["database_data"].append(agenda)
+            result["total_count"] += filter_query(db.query(func.count(Agenda.id)), Agenda, page).scalar()
+        except HTTPException:
+            raise
         except Exception as e:
             print(f"Database agendas error: {e}")
         
         # Get from JSON files
         try:
-            agenda_data = load_json_file("logs/agenda_log.json")
-            for entry in agenda_data:
-                content = entry.get("generated_agenda", "")
-                result["json_data"].append({
+            agenda_page, next_cursors["json"], agenda_entries = all_log_page(
+                "logs/agenda_log.json", page, "json", lambda entry: {
                     "event_name": entry.get("event_name", "Unknown"),
                     "event_date": entry.get("event_date", ""),
-                    "content": content,
-                    "content_preview": content[:500] + "..." if len(content) > 500 else content,
-                    "timestamp": entry.get("timestamp", ""),
-                    "source": "json_agenda"
+                    "content": entry.get("generated_agenda", ""),
+                    "content_preview": content_preview(entry.get("generated_agenda", "")),
+                    "timestamp": entry.get("timestamp", "")
                 })
+            result["json_data"] = [{**entry, "source": "json_agenda"} for entry in agenda_page]
+            result["total_count"] += len(agenda_entries)
         except Exception as e:
             print(f"Agenda JSON error: {e}")
         
-        result["total_count"] = len(result["database_data"]) + len(result["json_data"])
+        result["pagination"] = page.info(next_cursors)
         return result
         
+    except HTTPException:
+        raise
     except Exception as e:
         return {"error": str(e), "database_data": [], "json_data": [], "total_count": 0}
 
 @app.get("/api/all/summary")
 async def get_complete_summary(db: Session = Depends(get_db)):
-    """Get a complete summary of all data"""
+    """Get a summary of all data (volunteer details are the first page only)"""
     try:
         summary = {
             "volunteers": {"count": 0, "details": []},
@@ -1297,9 +1369,10 @@ async def get_complete_summary(db: Session = Depends(get_db)):
             "agendas": {"count": 0},
             "total_records": 0
         }
+        first_page = PageParams(fields="id,name,email,status,created_at")
         
         # Get volunteers summary
-        volunteers_data = await get_all_volunteers(db)
+        volunteers_data = await get_all_volunteers(db, first_page)
         summary["volunteers"]["count"] = volunteers_data.get("total_count", 0)
         summary["volunteers"]["details"] = [
             {"name": v.get("name"), "email": v.get("email"), "source": v.get("source")}
@@ -1307,7 +1380,7 @@ async def get_complete_summary(db: Session = Depends(get_db)):
         ]
         
         # Get outreach summary
-        outreach_data = await get_all_outreach(db)
+        outreach_data = await get_all_outreach(db, first_page)
         summary["outreach"]["count"] = outreach_data.get("total_count", 0)
         stats = outreach_data.get("stats", {})
         if stats.get("total_emails", 0) > 0:
@@ -1315,17 +1388,17 @@ async def get_complete_summary(db: Session = Depends(get_db)):
             summary["outreach"]["success_rate"] = f"{success_rate:.1f}%"
         
         # Get jury/speakers summary
-        jury_data = await get_all_jury_speakers(db)
-        summary["jury_speakers"]["judges"] = len(jury_data.get("database_jury", []))
-        summary["jury_speakers"]["speakers"] = len(jury_data.get("database_speakers", []))
+        jury_data = await get_all_jury_speakers(db, first_page)
+        summary["jury_speakers"]["judges"] = jury_data.get("counts", {}).get("jury", 0)
+        summary["jury_speakers"]["speakers"] = jury_data.get("counts", {}).get("speakers", 0)
         
         # Get sponsors summary
-        sponsors_data = await get_all_sponsors(db)
+        sponsors_data = await get_all_sponsors(db, first_page)
         summary["sponsors"]["count"] = sponsors_data.get("total_count", 0)
         summary["sponsors"]["total_funding"] = sponsors_data.get("funding_stats", {}).get("total_requested", 0)
         
         # Get agendas summary
-        agendas_data = await get_all_agendas(db)
+        agendas_data = await get_all_agendas(db, PageParams(fields="id"))
         summary["agendas"]["count"] = agendas_data.get("total_count", 0)
         
         # Calculate total records
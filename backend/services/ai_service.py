@@ -1,111 +1,445 @@
+import asyncio
+import hashlib
 import os
 import requests
 import json
+import sqlite3
+import threading
+import time
+import httpx
+from collections import OrderedDict
+from pathlib import Path
+from requests.adapters import HTTPAdapter
+from typing import Dict, List, Optional, Tuple
 from dotenv import load_dotenv
 
 load_dotenv()
 
+SUPPORTED_BACKENDS = ("ollama", "localai", "lmstudio")
+
+SYSTEM_PROMPT = "You are HackaTwin, an AI co-organizer for hackathons. You are helpful, professional, and enthusiastic about innovation and collaboration."
+
+# ===== PROMPT RESULT CACHE =====
+
+def make_cache_key(backend: str, model: str, prompt: str, max_tokens: int, temperature: float) -> str:
+    """Hash (backend, model, whitespace-normalized prompt, max_tokens, temperature) into a cache key"""
+    normalized_prompt = " ".join(prompt.split())
+    raw = json.dumps([backend, model, normalized_prompt, max_tokens, temperature], ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+class MemoryLRUCache:
+    """In-process LRU tier with per-entry TTL"""
+    
+    blocking = False  # safe to call on the event loop
+    
+    def __init__(self, max_entries: int = 1024, ttl: float = 3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.time():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+    
+    def set(self, key: str, value: str):
+        with self._lock:
+            self._entries[key] = (time.time() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self) -> Dict:
+        return {
+            "tier": "memory",
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+class SQLiteCache:
+    """
+    On-disk tier that survives restarts, evicting least recently used rows past max_entries.
+    The database is opened on first use; if it cannot be, the tier turns itself off.
+    """
+    
+    blocking = True  # disk I/O and fsync: keep off the event loop
+    
+    def __init__(self, path: str, max_entries: int = 10000, ttl: float = 86400):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.disabled = False
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+    
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        """The open connection (created on first use), or None when the tier is off; call under _lock"""
+        if self._conn is None and not self.disabled:
+            try:
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(self.path, check_same_thread=False)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS prompt_cache ("
+                    "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, last_used REAL NOT NULL)"
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS ix_prompt_cache_last_used ON prompt_cache (last_used)")
+                conn.commit()
+                self._conn = conn
+            except (sqlite3.Error, OSError) as e:
+                print(f"AI cache disk tier disabled: {e}")
+                self.disabled = True
+        return self._conn
+    
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            if conn is None:
+                return None
+            row = conn.execute(
+                "SELECT value, expires_at FROM prompt_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or row[1] < now:
+                if row is not None:
+                    conn.execute("DELETE FROM prompt_cache WHERE key = ?", (key,))
+                    conn.commit()
+                self.misses += 1
+                return None
+            conn.execute("UPDATE prompt_cache SET last_used = ? WHERE key = ?", (now, key))
+            conn.commit()
+            self.hits += 1
+            return row[0]
+    
+    def set(self, key: str, value: str):
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            if conn is None:
+                return
+            conn.execute(
+                "INSERT OR REPLACE INTO prompt_cache (key, value, expires_at, last_used) VALUES (?, ?, ?, ?)",
+                (key, value, now + self.ttl, now)
+            )
+            conn.execute(
+                "DELETE FROM prompt_cache WHERE key IN ("
+                "SELECT key FROM prompt_cache ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+            conn.commit()
+    
+    def clear(self):
+        with self._lock:
+            conn = self._connection()
+            if conn is not None:
+                conn.execute("DELETE FROM prompt_cache")
+                conn.commit()
+    
+    def stats(self) -> Dict:
+        with self._lock:
+            # Not opened yet: nothing cached in this process, and no file is created just to report that
+            entries = self._conn.execute("SELECT COUNT(*) FROM prompt_cache").fetchone()[0] if self._conn else None
+        return {
+            "tier": "sqlite",
+            "path": self.path,
+            "open": self._conn is not None,
+            "disabled": self.disabled,
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+class TieredCache:
+    """Checks tiers in order and promotes lower-tier hits into the faster tiers"""
+    
+    def __init__(self, tiers: List):
+        self.tiers = tiers
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key: str) -> Optional[str]:
+        for index, tier in enumerate(self.tiers):
+            value = tier.get(key)
+            if value is not None:
+                for upper in self.tiers[:index]:
+                    upper.set(key, value)
+                self.hits += 1
+                return value
+        self.misses += 1
+        return None
+    
+    def set(self, key: str, value: str):
+        for tier in self.tiers:
+            tier.set(key, value)
+    
+    async def aget(self, key: str) -> Optional[str]:
+        """get() for the event loop: in-memory tiers inline, blocking tiers on a worker thread"""
+        for index, tier in enumerate(self.tiers):
+            value = await asyncio.to_thread(tier.get, key) if tier.blocking else tier.get(key)
+            if value is not None:
+                for upper in self.tiers[:index]:
+                    if upper.blocking:
+                        await asyncio.to_thread(upper.set, key, value)
+                    else:
+                        upper.set(key, value)
+                self.hits += 1
+                return value
+        self.misses += 1
+        return None
+    
+    async def aset(self, key: str, value: str):
+        """set() for the event loop, with blocking tiers written on a worker thread"""
+        for tier in self.tiers:
+            if tier.blocking:
+                await asyncio.to_thread(tier.set, key, value)
+            else:
+                tier.set(key, value)
+    
+    def clear(self):
+        for tier in self.tiers:
+            tier.clear()
+    
+    def stats(self) -> Dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "tiers": [tier.stats() for tier in self.tiers]
+        }
+
+def build_cache_from_env() -> Optional[TieredCache]:
+    """Build the prompt cache from AI_CACHE_* settings, or None when disabled"""
+    if os.getenv("AI_CACHE_ENABLED", "true").lower() != "true":
+        return None
+    
+    tiers = [MemoryLRUCache(
+        max_entries=int(os.getenv("AI_CACHE_MAX_ENTRIES", "1024")),
+        ttl=float(os.getenv("AI_CACHE_TTL", "3600"))
+    )]
+    db_path = os.getenv("AI_CACHE_DB_PATH", "cache/ai_cache.db")
+    if db_path:
+        # Opened on first use, so importing the service never touches the disk
+        tiers.append(SQLiteCache(
+            db_path,
+            max_entries=int(os.getenv("AI_CACHE_DB_MAX_ENTRIES", "10000")),
+            ttl=float(os.getenv("AI_CACHE_DB_TTL", "86400"))
+        ))
+    return TieredCache(tiers)
+
 class LocalAIService:
-    def __init__(self):
+    def __init__(self, cache=None):
         # Support multiple local AI backends
         self.api_type = os.getenv("LOCAL_AI_TYPE", "ollama")  # ollama, localai, lmstudio
         self.base_url = os.getenv("LOCAL_AI_URL", "http://localhost:11434")  # Ollama default
         self.model_name = os.getenv("LOCAL_AI_MODEL", "llama3.2:3b")  # Lightweight model
+        self.temperature = float(os.getenv("LOCAL_AI_TEMPERATURE", "0.7"))
+        
+        # Connection pooling and timeouts (seconds)
+        self.pool_size = int(os.getenv("LOCAL_AI_POOL_SIZE", "10"))
+        self.timeout = float(os.getenv("LOCAL_AI_TIMEOUT", "30"))
+        self.connect_timeout = float(os.getenv("LOCAL_AI_CONNECT_TIMEOUT", "5"))
         
         # Fallback to simple text generation if no local AI is available
         self.fallback_mode = os.getenv("AI_FALLBACK", "true").lower() == "true"
+        
+        # Keep-alive session for the sync path
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        
+        # Async client is created lazily on the running event loop
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._async_client_loop = None
+        self._closing_clients = set()
+        
+        # Any object with get/set/clear/stats works as a cache
+        self.cache = cache if cache is not None else build_cache_from_env()
     
-    def generate_text(self, prompt: str, max_tokens: int = 500) -> str:
+    def generate_text(self, prompt: str, max_tokens: int = 500, timeout: Optional[float] = None,
+                      use_cache: bool = True) -> str:
         """
         Generate text using local AI model
         """
+        if self.api_type not in SUPPORTED_BACKENDS:
+            return self._generate_fallback(prompt)
+        
+        cache_key = self._cache_key(prompt, max_tokens) if use_cache else None
+        if cache_key:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
         try:
-            if self.api_type == "ollama":
-                return self._generate_ollama(prompt, max_tokens)
-            elif self.api_type == "localai":
-                return self._generate_localai(prompt, max_tokens)
-            elif self.api_type == "lmstudio":
-                return self._generate_lmstudio(prompt, max_tokens)
-            else:
+            url, data = self._build_request(prompt, max_tokens)
+            response = self.session.post(url, json=data, timeout=(self.connect_timeout, timeout or self.timeout))
+            response.raise_for_status()
+            text = self._parse_response(response.json())
+            if cache_key and text:
+                self.cache.set(cache_key, text)
+            return text
+                
+        except Exception as e:
+            print(f"Error generating text with local AI ({self.api_type}): {e}")
+            if self.fallback_mode:
                 return self._generate_fallback(prompt)
+            return "Sorry, I couldn't generate a response at the moment."
+    
+    async def agenerate_text(self, prompt: str, max_tokens: int = 500, timeout: Optional[float] = None,
+                             use_cache: bool = True) -> str:
+        """
+        Generate text without blocking the event loop, reusing pooled keep-alive connections
+        """
+        if self.api_type not in SUPPORTED_BACKENDS:
+            return self._generate_fallback(prompt)
+        
+        cache_key = self._cache_key(prompt, max_tokens) if use_cache else None
+        if cache_key:
+            cached = await self._acache_get(cache_key)
+            if cached is not None:
+                return cached
+        
+        try:
+            url, data = self._build_request(prompt, max_tokens)
+            client = self._get_async_client()
+            response = await client.post(
+                url, json=data,
+                timeout=httpx.Timeout(timeout or self.timeout, connect=self.connect_timeout)
+            )
+            response.raise_for_status()
+            text = self._parse_response(response.json())
+            if cache_key and text:
+                await self._acache_set(cache_key, text)
+            return text
                 
         except Exception as e:
-            print(f"Error generating text with local AI: {e}")
+            print(f"Error generating text with local AI ({self.api_type}): {e}")
             if self.fallback_mode:
                 return self._generate_fallback(prompt)
             return "Sorry, I couldn't generate a response at the moment."
     
-    def _generate_ollama(self, prompt: str, max_tokens: int) -> str:
-        """Generate text using Ollama"""
+    async def _acache_get(self, key: str) -> Optional[str]:
+        # Caches without an async API (e.g. a plain in-memory one) are called directly
+        aget = getattr(self.cache, "aget", None)
+        return await aget(key) if aget else self.cache.get(key)
+    
+    async def _acache_set(self, key: str, value: str):
+        aset = getattr(self.cache, "aset", None)
+        if aset:
+            await aset(key, value)
+        else:
+            self.cache.set(key, value)
+    
+    def _cache_key(self, prompt: str, max_tokens: int) -> Optional[str]:
+        """Cache key for this request, or None when caching is off"""
+        if self.cache is None:
+            return None
+        return make_cache_key(self.api_type, self.model_name, prompt, max_tokens, self.temperature)
+    
+    def cache_stats(self) -> Dict:
+        """Hit/miss counters and sizes for each cache tier"""
+        if self.cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **self.cache.stats()}
+    
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """Return the pooled async client, rebuilding it if the event loop changed"""
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_client_loop is not loop:
+            if self._async_client is not None:
+                self._retire_async_client(self._async_client, self._async_client_loop)
+            self._async_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.pool_size,
+                    max_keepalive_connections=self.pool_size
+                ),
+                timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout)
+            )
+            self._async_client_loop = loop
+        return self._async_client
+    
+    def _retire_async_client(self, client: httpx.AsyncClient, loop: asyncio.AbstractEventLoop):
+        """Close the client of a loop we moved away from: on that loop while it still runs, else from this one"""
+        if loop.is_running() and not loop.is_closed():
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+            return
+        task = asyncio.get_running_loop().create_task(self._aclose_client(client))
+        self._closing_clients.add(task)
+        task.add_done_callback(self._closing_clients.discard)
+    
+    @staticmethod
+    async def _aclose_client(client: httpx.AsyncClient):
         try:
-            url = f"{self.base_url}/api/generate"
-            data = {
+            await client.aclose()
+        except Exception as e:
+            # Connections opened on a loop that has been closed can't be shut down cleanly
+            print(f"Error closing AI HTTP client: {e}")
+    
+    async def aclose(self):
+        """Close pooled connections"""
+        if self._async_client is not None:
+            if self._async_client_loop is asyncio.get_running_loop():
+                await self._async_client.aclose()
+            else:
+                self._retire_async_client(self._async_client, self._async_client_loop)
+            self._async_client = None
+            self._async_client_loop = None
+        if self._closing_clients:
+            await asyncio.gather(*self._closing_clients, return_exceptions=True)
+        self.session.close()
+    
+    def _build_request(self, prompt: str, max_tokens: int) -> Tuple[str, dict]:
+        """Build the URL and JSON payload for the configured backend"""
+        if self.api_type == "ollama":
+            return f"{self.base_url}/api/generate", {
                 "model": self.model_name,
-                "prompt": f"You are HackaTwin, an AI co-organizer for hackathons. You are helpful, professional, and enthusiastic about innovation and collaboration.\n\nUser: {prompt}\n\nHackaTwin:",
+                "prompt": f"{SYSTEM_PROMPT}\n\nUser: {prompt}\n\nHackaTwin:",
                 "stream": False,
                 "options": {
                     "num_predict": max_tokens,
-                    "temperature": 0.7
+                    "temperature": self.temperature
                 }
             }
-            
-            response = requests.post(url, json=data, timeout=30)
-            response.raise_for_status()
-            
-            result = response.json()
-            return result.get("response", "").strip()
-            
-        except Exception as e:
-            print(f"Ollama API error: {e}")
-            raise
-    
-    def _generate_localai(self, prompt: str, max_tokens: int) -> str:
-        """Generate text using LocalAI"""
-        try:
-            url = f"{self.base_url}/v1/chat/completions"
-            data = {
+        elif self.api_type in ("localai", "lmstudio"):
+            # LocalAI and LM Studio both expose the OpenAI chat completions API
+            return f"{self.base_url}/v1/chat/completions", {
                 "model": self.model_name,
                 "messages": [
-                    {"role": "system", "content": "You are HackaTwin, an AI co-organizer for hackathons. You are helpful, professional, and enthusiastic about innovation and collaboration."},
+                    {"role": "system", "content": SYSTEM_PROMPT},
                     {"role": "user", "content": prompt}
                 ],
                 "max_tokens": max_tokens,
-                "temperature": 0.7
+                "temperature": self.temperature
             }
-            
-            response = requests.post(url, json=data, timeout=30)
-            response.raise_for_status()
-            
-            result = response.json()
-            return result["choices"][0]["message"]["content"].strip()
-            
-        except Exception as e:
-            print(f"LocalAI API error: {e}")
-            raise
+        raise ValueError(f"Unsupported LOCAL_AI_TYPE: {self.api_type}")
     
-    def _generate_lmstudio(self, prompt: str, max_tokens: int) -> str:
-        """Generate text using LM Studio"""
-        try:
-            url = f"{self.base_url}/v1/chat/completions"
-            data = {
-                "model": self.model_name,
-                "messages": [
-                    {"role": "system", "content": "You are HackaTwin, an AI co-organizer for hackathons. You are helpful, professional, and enthusiastic about innovation and collaboration."},
-                    {"role": "user", "content": prompt}
-                ],
-                "max_tokens": max_tokens,
-                "temperature": 0.7
-            }
-            
-            response = requests.post(url, json=data, timeout=30)
-            response.raise_for_status()
-            
-            result = response.json()
-            return result["choices"][0]["message"]["content"].strip()
-            
-        except Exception as e:
-            print(f"LM Studio API error: {e}")
-            raise
+    def _parse_response(self, result: dict) -> str:
+        """Extract the generated text from a backend response"""
+        if self.api_type == "ollama":
+            return result.get("response", "").strip()
+        return result["choices"][0]["message"]["content"].strip()
     
     def _generate_fallback(self, prompt: str) -> str:
         """
@@ -138,8 +472,14 @@ class LocalAIService:
 # Create a global instance
 ai_service = LocalAIService()
 
-def generate_text(prompt: str, max_tokens: int = 500) -> str:
+def generate_text(prompt: str, max_tokens: int = 500, use_cache: bool = True) -> str:
     """
     Global helper function for generating text
     """
-    return ai_service.generate_text(prompt, max_tokens)
+    return ai_service.generate_text(prompt, max_tokens, use_cache=use_cache)
+
+async def agenerate_text(prompt: str, max_tokens: int = 500, use_cache: bool = True) -> str:
+    """
+    Global async helper function for generating text
+    """
+    return await ai_service.agenerate_text(prompt, max_tokens, use_cache=use_cache)
@@ -0,0 +1,357 @@
+import asyncio
+import uuid
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+
+from services.ai_service import agenerate_text
+from services.email_service import send_batch_emails
+from services.file_utils import append_to_json_file, get_current_timestamp
+from services.outbox import deliver_email
+from services.pipeline import CampaignPipeline
+from services.templating import SegmentTemplates, prepare_template, render_template, slot, template_instructions
+
+# per_recipient: one model call per person
+# template: one model call per segment, filled in locally
+# batch: like template, and sent as one provider request per segment (SendGrid personalizations)
+GENERATION_MODES = ("per_recipient", "template", "batch")
+
+class Campaign(ABC):
+    """
+    Prompt, subject, segmentation and log shape for one bulk email campaign.
+    Subclasses implement prompt() and subject(); the rest has sensible defaults.
+    """
+    log_file: Optional[str] = None
+    slot_names: tuple = ("name",)
+
+    @abstractmethod
+    def prompt(self, recipient: Dict[str, Any]) -> str:
+        """Model prompt for one recipient's email"""
+
+    @abstractmethod
+    def subject(self, recipient: Dict[str, Any]) -> str:
+        """Subject line for one recipient"""
+
+    def segment(self, recipient: Dict[str, Any]) -> str:
+        """Recipients in the same segment share one generated template"""
+        return "all"
+
+    def slot_names_for(self, recipient: Dict[str, Any]) -> tuple:
+        """Per-recipient details that a template leaves as placeholders"""
+        return self.slot_names
+
+    def slots(self, recipient: Dict[str, Any]) -> Dict[str, str]:
+        return {name: str(recipient.get(name, "")) for name in self.slot_names_for(recipient)}
+
+    def template_prompt(self, recipient: Dict[str, Any]) -> str:
+        """Same prompt as per-recipient mode, with slot placeholders instead of personal details"""
+        names = self.slot_names_for(recipient)
+        placeholder = {**recipient, **{name: slot(name) for name in names}}
+        return self.prompt(placeholder) + template_instructions(names)
+
+    def log_entry(self, recipient: Dict[str, Any], status: str) -> Dict[str, Any]:
+        return {
+            "name": recipient['name'],
+            "email": recipient['email'],
+            "status": status,
+            "timestamp": get_current_timestamp()
+        }
+
+    def response_entry(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """What the HTTP response reports per recipient"""
+        return entry
+
+class OutreachCampaign(Campaign):
+    log_file = "logs/outreach_log.json"
+    slot_names = ("name", "country")
+
+    def __init__(self, custom_message: Optional[str] = None):
+        self.custom_message = custom_message
+
+    def prompt(self, lead):
+        referral_line = ""
+        if lead.get("source") == "alumni":
+            referral_line = "As a valued alumni of our hackathon community, "
+
+        return f"""
+            Write a personalized outreach email for {lead['name']} from {lead['country']}.
+            {referral_line}
+
+            The email should:
+            - Invite them to participate in our upcoming hackathon
+            - Highlight the benefits of joining our global hackathon community
+            - Be professional yet friendly and enthusiastic
+            - Include a call to action to register
+
+            Custom message to include: {self.custom_message or "Join us for an amazing innovation experience!"}
+            """
+
+    def subject(self, lead):
+        return f"🚀 Join HackaTwin - Global Hackathon Community"
+
+    def segment(self, lead):
+        return "alumni" if lead.get("source") == "alumni" else "general"
+
+    def response_entry(self, entry):
+        return {"name": entry['name'], "email": entry['email'], "status": entry['status']}
+
+class JurySpeakerInviteCampaign(Campaign):
+    """Invites from data/jury.json and data/speakers.json; recipients carry a "role" of jury or speaker"""
+    log_file = "logs/invites_log.json"
+
+    def prompt(self, person):
+        if person['role'] == "jury":
+            return f"""
+            Write a professional invitation email for {person['name']} from {person['company']} to be a jury member.
+
+            Details:
+            - Expert in: {person['expertise']}
+            - Experience: {person['experience']}
+
+            The email should:
+            - Acknowledge their expertise in {person['expertise']}
+            - Invite them to judge our hackathon
+            - Highlight the importance of their role
+            - Be respectful and professional
+            """
+        return f"""
+            Write a professional invitation email for {person['name']} from {person['company']} to be a speaker.
+
+            Details:
+            - Topic: {person['topic']}
+            - Bio: {person['bio']}
+
+            The email should:
+            - Invite them to speak about {person['topic']}
+            - Acknowledge their expertise
+            - Highlight the impact they can make
+            - Be enthusiastic and professional
+            """
+
+    def subject(self, person):
+        if person['role'] == "jury":
+            return f"🏆 Invitation to Judge HackaTwin - {person['expertise']} Expert"
+        return f"🎤 Speaking Invitation - HackaTwin: {person['topic']}"
+
+    def segment(self, person):
+        if person['role'] == "jury":
+            return f"jury:{person['expertise']}"
+        return f"speaker:{person['topic']}"
+
+    def slot_names_for(self, person):
+        # Experience and bio are personal, so they are slots too
+        if person['role'] == "jury":
+            return ("name", "company", "experience")
+        return ("name", "company", "bio")
+
+    def log_entry(self, person, status):
+        return {
+            "name": person['name'],
+            "role": person['role'],
+            "type": person['role'],
+            "status": status,
+            "timestamp": get_current_timestamp()
+        }
+
+class CustomJuryInviteCampaign(Campaign):
+    """Invites for judges and speakers picked in the dashboard; recipients carry a "role" of judge or speaker"""
+    log_file = "logs/jury_invites_log.json"
+
+    def __init__(self, event_info: str):
+        self.event_info = event_info
+
+    def prompt(self, person):
+        if person['role'] == "judge":
+            return f"""
+            Write a professional invitation email for {person['name']} to be a jury member for {self.event_info}.
+
+            The email should:
+            - Be personalized and professional
+            - Acknowledge their expertise in {person.get('expertise', 'technology')}
+            - Invite them to judge our hackathon
+            - Mention the event details: {self.event_info}
+            - Express the importance of their role
+            - Be respectful and enthusiastic
+            """
+        return f"""
+            Write a professional speaking invitation email for {person['name']} for {self.event_info}.
+
+            The email should:
+            - Be personalized and engaging
+            - Invite them to speak at our hackathon
+            - Mention their expertise in {person.get('topic', 'technology')}
+            - Include event details: {self.event_info}
+            - Highlight the impact they can make
+            - Be enthusiastic and professional
+            """
+
+    def subject(self, person):
+        if person['role'] == "judge":
+            return f"🏆 Invitation to Judge HackaTwin - {person.get('expertise', 'Expert')}"
+        return f"🎤 Speaking Invitation - HackaTwin: {person.get('topic', 'Innovation')}"
+
+    def segment(self, person):
+        if person['role'] == "judge":
+            return f"judge:{person.get('expertise', 'technology')}"
+        return f"speaker:{person.get('topic', 'technology')}"
+
+    def log_entry(self, person, status):
+        entry = {
+            "name": person['name'],
+            "email": person['email'],
+            "role": person['role'],
+        }
+        if person['role'] == "judge":
+            entry["expertise"] = person.get('expertise', 'N/A')
+        else:
+            entry["topic"] = person.get('topic', 'N/A')
+        entry["status"] = status
+        entry["timestamp"] = get_current_timestamp()
+        return entry
+
+class FollowupCampaign(Campaign):
+    """Post-event follow-up to every community member (not logged)"""
+    slot_names = ("name", "country")
+
+    def prompt(self, member):
+        return f"""
+            Write a post-event follow-up email for {member['name']} from {member['country']}.
+
+            The email should:
+            - Thank them for being part of our community
+            - Share highlights from recent events
+            - Invite them to upcoming challenges
+            - Encourage continued participation
+            - Include links to new opportunities
+            """
+
+    def subject(self, member):
+        return "🚀 Thank You & What's Next - HackaTwin Community"
+
+    def response_entry(self, entry):
+        return {"name": entry['name'], "email": entry['email'], "status": entry['status']}
+
+# Job kinds that can run in the background, built from their stored params
+CAMPAIGN_KINDS = {
+    "outreach": lambda params: OutreachCampaign(params.get("custom_message")),
+    "invite_jury_speakers": lambda params: JurySpeakerInviteCampaign(),
+    "invite_jury": lambda params: CustomJuryInviteCampaign(params.get("event_info", "")),
+    "post_event_followup": lambda params: FollowupCampaign(),
+}
+
+def build_campaign(kind: str, params: Dict[str, Any]) -> Campaign:
+    if kind not in CAMPAIGN_KINDS:
+        raise ValueError(f"Unknown campaign kind: {kind}")
+    return CAMPAIGN_KINDS[kind](params)
+
+class CampaignRun:
+    """
+    One execution of a campaign through the generate -> send -> log pipeline.
+
+    mode="per_recipient" makes one model call per person; mode="template"
+    makes one call per segment and fills the per-recipient slots locally;
+    mode="batch" also sends each segment as provider batches instead of one
+    request per recipient.
+    """
+
+    def __init__(self, campaign: Campaign, mode: str = "per_recipient",
+                 ai_workers: Optional[int] = None, send_workers: Optional[int] = None):
+        if mode not in GENERATION_MODES:
+            raise ValueError(f"Unknown generation mode: {mode}")
+        self.campaign = campaign
+        self.mode = mode
+        # Outbox dedup scope: the same email to the same person is stored once per run
+        self.campaign_key = f"{type(campaign).__name__}:{uuid.uuid4().hex[:12]}"
+        self.templates = SegmentTemplates(agenerate_text) if mode in ("template", "batch") else None
+        self.pipeline = CampaignPipeline(self._generate, self._send, self._log,
+                                         ai_workers=ai_workers, send_workers=send_workers)
+
+    @property
+    def llm_calls(self) -> Optional[int]:
+        return self.templates.generated if self.templates else None
+
+    async def _generate(self, recipient):
+        if self.templates:
+            return await self.templates.render(
+                self.campaign.segment(recipient),
+                self.campaign.template_prompt(recipient),
+                self.campaign.slots(recipient)
+            )
+        return await agenerate_text(self.campaign.prompt(recipient))
+
+    def _send(self, recipient, content):
+        # Recorded in the outbox (or sent directly with retries when EMAIL_DELIVERY=direct)
+        return deliver_email(recipient['email'], self.campaign.subject(recipient), content, self.campaign_key)
+
+    def _log(self, result):
+        entry = result["entry"] = self.campaign.log_entry(result["item"], result["status"])
+        if self.campaign.log_file:
+            append_to_json_file(self.campaign.log_file, entry)
+
+    def _send_batch(self, recipients, subject, template):
+        return send_batch_emails(subject, template, [
+            {"to_email": r['email'], "substitutions": {slot(k): v for k, v in self.campaign.slots(r).items()}}
+            for r in recipients
+        ])
+
+    async def _run_group(self, segment: str, subject: str, members) -> List[Dict[str, Any]]:
+        """Generate a segment's template once and send it to all its members as batches"""
+        recipients = [recipient for _, recipient in members]
+        try:
+            template = await self.templates.template_for(segment, self.campaign.template_prompt(recipients[0]))
+            template = prepare_template(template, self.campaign.slot_names_for(recipients[0]))
+            send_results = await asyncio.to_thread(self._send_batch, recipients, subject, template)
+        except Exception as e:
+            print(f"Batch send error for segment {segment}: {e}")
+            template, send_results = None, [{"status": "error", "message": str(e)}] * len(members)
+
+        results = [
+            {
+                "index": index,
+                "item": recipient,
+                "message": render_template(template, self.campaign.slots(recipient)) if template else None,
+                "status": send_result.get("status", "error"),
+                "send_result": send_result
+            }
+            for (index, recipient), send_result in zip(members, send_results)
+        ]
+        await asyncio.to_thread(self._log_all, results)
+        return results
+
+    def _log_all(self, results):
+        for result in results:
+            try:
+                self._log(result)
+            except Exception as e:
+                print(f"Campaign log error: {e}")
+
+    async def _run_batched(self, recipients: List[Dict[str, Any]]):
+        groups: Dict[tuple, list] = {}
+        for index, recipient in enumerate(recipients):
+            key = (self.campaign.segment(recipient), self.campaign.subject(recipient))
+            groups.setdefault(key, []).append((index, recipient))
+        tasks = [asyncio.ensure_future(self._run_group(segment, subject, members))
+                 for (segment, subject), members in groups.items()]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                for result in await finished:
+                    yield result
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def results(self, recipients: List[Dict[str, Any]]):
+        """Yield raw pipeline results (with "entry" set by _log) as they finish"""
+        source = self._run_batched(recipients) if self.mode == "batch" else self.pipeline.run(recipients)
+        async for result in source:
+            yield result
+
+    async def stream(self, recipients: List[Dict[str, Any]]):
+        """Yield one response entry per recipient as each one finishes"""
+        async for result in self.results(recipients):
+            yield self.campaign.response_entry(result["entry"])
+
+    async def run_all(self, recipients: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Run to completion and return response entries in input order"""
+        results = [result async for result in self.results(recipients)]
+        results.sort(key=lambda result: result["index"])
+        return [self.campaign.response_entry(result["entry"]) for result in results]
@@ -0,0 +1,183 @@
+import os
+import threading
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+from services.file_utils import add_write_listener, file_signature, jsonl_path, load_json_file, load_json_log
+
+OUTREACH_LOG = "logs/outreach_log.json"
+TEAM_LOG = "logs/team_tasks.json"
+CONTENT_LOG = "logs/content_history.json"
+SPONSOR_LOG = "logs/sponsor_log.json"
+COMMUNITY_FILE = "data/community.json"
+SOURCES = (OUTREACH_LOG, TEAM_LOG, CONTENT_LOG, SPONSOR_LOG, COMMUNITY_FILE)
+
+FUNDS_PER_SPONSOR = 15000  # Estimate $15k per sponsor
+
+def _signature(paths: List[str]) -> tuple:
+    """(inode, size, mtime) of each file backing a source; None for missing files"""
+    return tuple(file_signature(path) for path in paths)
+
+def _normalize(path: str) -> str:
+    return os.path.normpath(path).replace(os.sep, "/")
+
+class DashboardStats:
+    """
+    Dashboard counters and recent activity, kept up to date by the write paths.
+
+    Every append/save in this process updates the counters in O(1). Each source
+    also remembers the file signature it has accounted for, so writes from other
+    processes (e.g. `python worker.py`) are noticed on read and only that source
+    is recounted.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        # None = not counted yet; the first read counts each source once
+        self._signatures: Dict[str, Optional[tuple]] = dict.fromkeys(SOURCES)
+        for source in SOURCES:
+            self._reset(source)
+        self.rebuilds = 0
+
+    # ----- per-source state -----
+
+    def _reset(self, source: str):
+        if source == OUTREACH_LOG:
+            self.emails_sent = 0
+            self.recent_outreach = deque(maxlen=3)
+        elif source == TEAM_LOG:
+            self.team_logs = 0
+            self.team_emails = set()
+            self.recent_team = deque(maxlen=2)
+        elif source == CONTENT_LOG:
+            self.agenda_count = 0
+            self.recent_content = deque(maxlen=2)
+        elif source == SPONSOR_LOG:
+            self.sponsor_logs = 0
+        elif source == COMMUNITY_FILE:
+            self.community = 0
+
+    def _apply(self, source: str, entry: Dict[str, Any]):
+        """Account for one new log entry"""
+        if source == OUTREACH_LOG:
+            self.emails_sent += 1
+            self.recent_outreach.append(entry)
+        elif source == TEAM_LOG:
+            self.team_logs += 1
+            for member in entry.get("team", []):
+                self.team_emails.add(member.get("email", ""))
+            self.recent_team.append(entry)
+        elif source == CONTENT_LOG:
+            if entry.get("type") == "agenda":
+                self.agenda_count += 1
+            self.recent_content.append(entry)
+        elif source == SPONSOR_LOG:
+            self.sponsor_logs += 1
+
+    @staticmethod
+    def _files(source: str) -> List[str]:
+        if source == COMMUNITY_FILE:
+            return [COMMUNITY_FILE]
+        return [source, jsonl_path(source)]
+
+    def _recount(self, source: str):
+        self._reset(source)
+        if source == COMMUNITY_FILE:
+            self.community = len(load_json_file(COMMUNITY_FILE) or [])
+        else:
+            for entry in load_json_log(source):
+                self._apply(source, entry)
+        self._signatures[source] = _signature(self._files(source))
+
+    # ----- write path -----
+
+    def on_write(self, file_path: str, entry: Optional[Dict] = None, data: Any = None,
+                 change: Optional[tuple] = None):
+        source = _normalize(file_path)
+        if source not in self._signatures:
+            return
+        with self._lock:
+            signature = self._signatures[source]
+            if signature is None:
+                return  # counted in full on first read
+            files = [_normalize(path) for path in self._files(source)]
+            written = _normalize(change[0]) if change else None
+            if written not in files or (entry is None and source != COMMUNITY_FILE):
+                self._recount(source)
+                return
+            index = files.index(written)
+            if signature[index] != change[1]:
+                # Another process wrote since this source was last accounted for: count it again
+                self._recount(source)
+                return
+            if source == COMMUNITY_FILE:
+                self.community = len(data or [])
+            else:
+                self._apply(source, entry)
+            # The file as this write left it, taken under its lock (not re-read after the fact)
+            self._signatures[source] = signature[:index] + (change[2],) + signature[index + 1:]
+
+    # ----- read path -----
+
+    def rebuild(self) -> Dict[str, Any]:
+        """Recompute every counter from the source files"""
+        with self._lock:
+            for source in SOURCES:
+                self._recount(source)
+            self.rebuilds += 1
+            return self.snapshot()
+
+    def _refresh_changed(self):
+        for source, signature in self._signatures.items():
+            if _signature(self._files(source)) != signature:
+                self._recount(source)
+
+    def _recent_activities(self) -> List[Dict[str, Any]]:
+        activities = []
+        for log in self.recent_outreach:
+            activities.append({
+                "title": "Email outreach completed",
+                "description": f"Sent email to {log.get('name', 'contact')}",
+                "time": log.get("timestamp", "Unknown"),
+                "type": "outreach"
+            })
+        for log in self.recent_team:
+            activities.append({
+                "title": "Team tasks assigned",
+                "description": f"AI assigned {len(log.get('tasks', []))} tasks to team",
+                "time": log.get("timestamp", "Unknown"),
+                "type": "team"
+            })
+        for log in self.recent_content:
+            if log.get("type") == "agenda":
+                activities.append({
+                    "title": "Event agenda generated",
+                    "description": f"Created agenda for {log.get('event_name', 'event')}",
+                    "time": log.get("timestamp", "Unknown"),
+                    "type": "agenda"
+                })
+        # Most recent first
+        activities.sort(key=lambda x: x["time"], reverse=True)
+        return activities[:6]
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current dashboard stats (same shape as the old full-scan response)"""
+        with self._lock:
+            self._refresh_changed()
+            return {
+                "total_events": self.agenda_count,
+                "active_projects": self.team_logs + self.sponsor_logs,
+                "team_members": len(self.team_emails),
+                "emails_sent": self.emails_sent,
+                "funds_raised": self.sponsor_logs * FUNDS_PER_SPONSOR,
+                "community_growth": self.community,
+                "recent_activities": self._recent_activities()
+            }
+
+dashboard_stats = DashboardStats()
+add_write_listener(dashboard_stats.on_write)
+
+if __name__ == "__main__":
+    # Recompute from source: python -m services.dashboard_stats
+    import json
+    print(json.dumps(dashboard_stats.rebuild(), indent=2))
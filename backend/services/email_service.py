@@ -1,13 +1,344 @@
+import atexit
 import os
+import queue
+import random
 import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+import socket
+import ssl
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from sendgrid import SendGridAPIClient
-from sendgrid.helpers.mail import Mail
+from sendgrid.helpers.mail import Mail, Personalization, Substitution, To
 from dotenv import load_dotenv
 
+from services.message_render import message_renderer
+
 load_dotenv()
 
+class _PooledSMTP:
+    """One authenticated SMTP session and its usage counters"""
+
+    def __init__(self, smtp: smtplib.SMTP):
+        self.smtp = smtp
+        self.messages = 0
+        self.last_used = time.monotonic()
+
+class SMTPConnectionPool:
+    """
+    Keeps up to `size` authenticated SMTP sessions open and reuses them across messages.
+    A session is replaced when the server drops it, after `max_messages` messages
+    (providers cap messages per connection) or after `idle_timeout` seconds unused.
+    Safe to share between threads: each send checks out its own session.
+    """
+
+    def __init__(self, host: str, port: int, username: str = None, password: str = None,
+                 use_tls: bool = True, size: int = 4, max_messages: int = 100,
+                 idle_timeout: float = 60.0, timeout: float = 30.0):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.size = size
+        self.max_messages = max_messages
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()  # most recently used first, so spare sessions age out
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self.connections_opened = 0
+        self.reconnects = 0
+        self.messages_sent = 0
+    
+    def _connect(self) -> _PooledSMTP:
+        smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.use_tls:
+                smtp.starttls(context=ssl.create_default_context())
+            if self.password:
+                smtp.login(self.username, self.password)
+        except Exception:
+            self._close(smtp)
+            raise
+        with self._lock:
+            self.connections_opened += 1
+        return _PooledSMTP(smtp)
+    
+    @staticmethod
+    def _close(smtp: smtplib.SMTP):
+        try:
+            smtp.quit()
+        except Exception:
+            smtp.close()
+    
+    def _checkout(self):
+        """An open session (reused when possible) and whether it was reused"""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                return self._connect(), False
+            if time.monotonic() - conn.last_used > self.idle_timeout:
+                self._close(conn.smtp)  # the server has likely timed it out already
+                continue
+            return conn, True
+    
+    def _checkin(self, conn: _PooledSMTP):
+        conn.messages += 1
+        conn.last_used = time.monotonic()
+        if conn.messages >= self.max_messages:
+            self._close(conn.smtp)
+        else:
+            self._idle.put(conn)
+    
+    @contextmanager
+    def _slot(self):
+        self._slots.acquire()
+        try:
+            yield
+        finally:
+            self._slots.release()
+    
+    def send_message(self, msg):
+        """Send an email.message.Message on a pooled session"""
+        self._send(lambda smtp: smtp.send_message(msg))
+    
+    def sendmail(self, from_addr: str, to_addrs, data: bytes):
+        """Send an already serialized message on a pooled session"""
+        self._send(lambda smtp: smtp.sendmail(from_addr, to_addrs, data))
+    
+    def _send(self, deliver):
+        """
+        Run `deliver(smtp)` on a pooled session. A reused session that turns out
+        to be dead (dropped by the server before the message was accepted) is
+        replaced and the message is tried once more on a fresh connection.
+        """
+        with self._slot():
+            conn, reused = self._checkout()
+            try:
+                deliver(conn.smtp)
+            except Exception as e:
+                if not self._session_broken(e):
+                    # e.g. a refused recipient: the session itself is still fine
+                    self._checkin(conn)
+                    raise
+                self._close(conn.smtp)
+                if not reused or isinstance(e, (socket.timeout, TimeoutError)):
+                    raise  # a timeout may hide a delivered message; never resend it
+                with self._lock:
+                    self.reconnects += 1
+                conn = self._connect()
+                try:
+                    deliver(conn.smtp)
+                except Exception:
+                    self._close(conn.smtp)
+                    raise
+            self._checkin(conn)
+            with self._lock:
+                self.messages_sent += 1
+    
+    @staticmethod
+    def _session_broken(error: Exception) -> bool:
+        if isinstance(error, (smtplib.SMTPServerDisconnected, OSError)):
+            return True
+        # 421: the server is closing this connection
+        return isinstance(error, smtplib.SMTPResponseException) and error.smtp_code == 421
+    
+    def close(self):
+        """Close every idle session"""
+        while True:
+            try:
+                self._close(self._idle.get_nowait().smtp)
+            except queue.Empty:
+                return
+    
+    def stats(self) -> dict:
+        return {
+            "size": self.size,
+            "idle": self._idle.qsize(),
+            "connections_opened": self.connections_opened,
+            "reconnects": self.reconnects,
+            "messages_sent": self.messages_sent
+        }
+
+def _smtp_error_is_transient(error: Exception) -> bool:
+    """Connection problems and 4xx replies are worth retrying; 5xx are permanent"""
+    if isinstance(error, TimeoutError):
+        return False  # the message may have been delivered; resending could duplicate it
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(400 <= code < 500 for code, _ in error.recipients.values())
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 400 <= error.smtp_code < 500
+    return isinstance(error, (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, OSError))
+
+def _sendgrid_error_is_transient(error: Exception) -> bool:
+    """429 and 5xx responses and network errors are worth retrying"""
+    status = getattr(error, "status_code", None)
+    if status is not None:
+        return status == 429 or status >= 500
+    return isinstance(error, OSError) and not isinstance(error, TimeoutError)
+
+def _retry_after(error: Exception):
+    """Seconds the provider asked us to wait, if it said"""
+    headers = getattr(error, "headers", None)
+    value = headers.get("Retry-After") if headers is not None else None
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+def substitute(text: str, substitutions: dict) -> str:
+    """Literal token replacement, the same way SendGrid applies substitutions"""
+    for token, value in substitutions.items():
+        text = text.replace(token, str(value))
+    return text
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: `rate` sends per second on average, bursts up to `capacity`.
+    A rate of 0 disables limiting.
+    """
+
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+    
+    def pause(self, seconds: float):
+        """Hold every caller for `seconds` (e.g. the provider answered 429 with Retry-After)"""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+    
+    def reserve(self) -> float:
+        """
+        Take one token now, going into debt if needed, and return how long the
+        caller must wait before using it (asyncio callers sleep on this themselves)
+        """
+        with self._lock:
+            now = time.monotonic()
+            paused = max(0.0, self._paused_until - now)
+            if self.rate <= 0:
+                return paused
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return max(paused, -self._tokens / self.rate)
+    
+    def acquire(self) -> float:
+        """Take one token, sleeping until one is available; returns seconds waited"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    delay = self._paused_until - now
+                elif self.rate <= 0:
+                    return waited
+                else:
+                    self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                    self._updated = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return waited
+                    delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+class BulkEmailSender:
+    """
+    Sends many emails through an EmailService with a worker pool, a token bucket
+    per provider and retries with jittered exponential backoff for transient errors.
+    send() is the single-message path (used by campaign pipelines, which bring their
+    own workers); send_all()/iter_results() fan out over this sender's own pool.
+    """
+
+    def __init__(self, service: "EmailService", workers: int = None, max_retries: int = None,
+                 base_delay: float = None, max_delay: float = None):
+        self.service = service
+        self.workers = workers or int(os.getenv('EMAIL_SEND_WORKERS', '8'))
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv('EMAIL_MAX_RETRIES', '3'))
+        self.base_delay = base_delay if base_delay is not None else float(os.getenv('EMAIL_RETRY_BASE_DELAY', '1.0'))
+        self.max_delay = max_delay if max_delay is not None else float(os.getenv('EMAIL_RETRY_MAX_DELAY', '30'))
+        burst = os.getenv('EMAIL_RATE_BURST')
+        self.limiters = {
+            "gmail_smtp": TokenBucket(float(os.getenv('EMAIL_RATE_GMAIL', '5')), float(burst) if burst else None),
+            "sendgrid": TokenBucket(float(os.getenv('EMAIL_RATE_SENDGRID', '50')), float(burst) if burst else None),
+        }
+    
+    def _backoff(self, attempt: int, retry_after: float = None) -> float:
+        # Full jitter keeps retrying workers from hitting the provider in lockstep
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        return max(delay, retry_after or 0.0)
+    
+    def _with_retry(self, call, max_retries: int = None) -> dict:
+        """Run one provider call under the rate limit, retrying transient failures"""
+        max_retries = self.max_retries if max_retries is None else max_retries
+        limiter = self.limiters[self.service.provider]
+        attempt = 0
+        while True:
+            limiter.acquire()
+            result = call()
+            attempt += 1
+            if result.get("status") == "success" or not result.get("transient") or attempt > max_retries:
+                result["attempts"] = attempt
+                return result
+            time.sleep(self._backoff(attempt - 1, result.get("retry_after")))
+    
+    def send(self, to_email: str, subject: str, content: str, max_retries: int = None) -> dict:
+        """Send one email, waiting for the provider's rate limit and retrying transient failures"""
+        return self._with_retry(lambda: self.service.send_email(to_email, subject, content), max_retries)
+    
+    def send_batch(self, subject: str, template: str, recipients: list) -> list:
+        """
+        One template to many recipients, each with its own substitutions
+        ({"{{name}}": "Ada", ...}). SendGrid gets up to SENDGRID_BATCH_SIZE
+        personalizations per request; other providers get one message each.
+        Returns one result per recipient, in order.
+        """
+        if self.service.provider != "sendgrid":
+            return self.send_all([
+                {
+                    "to_email": r["to_email"],
+                    "subject": substitute(subject, r.get("substitutions", {})),
+                    "content": substitute(template, r.get("substitutions", {}))
+                }
+                for r in recipients
+            ])
+        
+        results = []
+        size = self.service.sendgrid_batch_size
+        for start in range(0, len(recipients), size):
+            chunk = recipients[start:start + size]
+            result = self._with_retry(lambda: self.service._send_sendgrid_batch(subject, template, chunk))
+            results += [{**result, "recipient": r["to_email"], "batch_size": len(chunk)} for r in chunk]
+        return results
+    
+    def _send_item(self, email_data: dict) -> dict:
+        result = self.send(email_data['to_email'], email_data['subject'], email_data['content'])
+        result['recipient'] = email_data['to_email']
+        return result
+    
+    def iter_results(self, emails: list):
+        """Yield (index, result) pairs as each email finishes"""
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="email-send") as executor:
+            futures = {executor.submit(self._send_item, email_data): index for index, email_data in enumerate(emails)}
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+    
+    def send_all(self, emails: list, on_result=None) -> list:
+        """Send everything and return results in input order"""
+        results = [None] * len(emails)
+        for index, result in self.iter_results(emails):
+            results[index] = result
+            if on_result:
+                on_result(index, result)
+        return results
+
 class EmailService:
     def __init__(self):
         self.use_gmail = os.getenv('USE_GMAIL_SMTP', 'false').lower() == 'true'
@@ -18,10 +349,30 @@ class EmailService:
             self.smtp_port = int(os.getenv('SMTP_PORT', '587'))
             self.from_email = os.getenv('FROM_EMAIL')
             self.email_password = os.getenv('EMAIL_PASSWORD')
+            # Local relays and test servers may not offer STARTTLS
+            self.smtp_use_tls = os.getenv('SMTP_USE_TLS', 'true').lower() == 'true'
+            # Reuse authenticated sessions; SMTP_POOL_SIZE=0 opens one connection per message
+            pool_size = int(os.getenv('SMTP_POOL_SIZE', '4'))
+            self.smtp_pool = SMTPConnectionPool(
+                self.smtp_server, self.smtp_port,
+                username=self.from_email, password=self.email_password, use_tls=self.smtp_use_tls,
+                size=pool_size,
+                max_messages=int(os.getenv('SMTP_POOL_MAX_MESSAGES', '100')),
+                idle_timeout=float(os.getenv('SMTP_POOL_IDLE_TIMEOUT', '60'))
+            ) if pool_size > 0 else None
         else:
-            # SendGrid configuration
-            self.sg = SendGridAPIClient(api_key=os.getenv('SENDGRID_API_KEY'))
+            # SendGrid configuration (SENDGRID_API_HOST points at a fake endpoint in tests)
+            self.sg = SendGridAPIClient(
+                api_key=os.getenv('SENDGRID_API_KEY'),
+                host=os.getenv('SENDGRID_API_HOST', 'https://api.sendgrid.com')
+            )
             self.from_email = os.getenv('FROM_EMAIL')
+            self.smtp_pool = None
+        
+        # SendGrid accepts at most 1000 personalizations per request
+        self.sendgrid_batch_size = min(1000, int(os.getenv('SENDGRID_BATCH_SIZE', '1000')))
+        
+        self.bulk_sender = BulkEmailSender(self)
     
     def send_email(self, to_email: str, subject: str, content: str) -> dict:
         """
@@ -37,24 +388,19 @@ class EmailService:
         Send email using Gmail SMTP
         """
         try:
-            # Create message
-            msg = MIMEMultipart('alternative')
-            msg['Subject'] = subject
-            msg['From'] = self.from_email
-            msg['To'] = to_email
-            
-            # Create HTML and plain text parts
-            html_part = MIMEText(content, 'html')
-            text_part = MIMEText(content.replace('<br>', '\n').replace('<p>', '').replace('</p>', '\n'), 'plain')
-            
-            msg.attach(text_part)
-            msg.attach(html_part)
+            # The HTML/text body is built once per distinct content; only the headers are per recipient
+            data = message_renderer.render(self.from_email, to_email, subject, content)
             
             # Send email
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.from_email, self.email_password)
-                server.send_message(msg)
+            if self.smtp_pool:
+                self.smtp_pool.sendmail(self.from_email, [to_email], data)
+            else:
+                with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
+                    if self.smtp_use_tls:
+                        server.starttls()
+                    if self.email_password:
+                        server.login(self.from_email, self.email_password)
+                    server.sendmail(self.from_email, [to_email], data)
             
             return {
                 "status": "success",
@@ -67,7 +413,8 @@ class EmailService:
             return {
                 "status": "error",
                 "message": str(e),
-                "method": "gmail_smtp"
+                "method": "gmail_smtp",
+                "transient": _smtp_error_is_transient(e)
             }
     
     def _send_sendgrid(self, to_email: str, subject: str, content: str) -> dict:
@@ -92,30 +439,77 @@ class EmailService:
             }
         except Exception as e:
             print(f"Error sending email via SendGrid: {e}")
+            return self._sendgrid_error(e)
+    
+    def _send_sendgrid_batch(self, subject: str, template: str, recipients: list) -> dict:
+        """
+        Send one template to up to 1000 recipients in a single SendGrid request,
+        one personalization (with its own substitutions) per recipient
+        """
+        try:
+            message = Mail(
+                from_email=self.from_email,
+                subject=subject,
+                html_content=template
+            )
+            for recipient in recipients:
+                personalization = Personalization()
+                personalization.add_to(To(recipient['to_email']))
+                for token, value in recipient.get('substitutions', {}).items():
+                    personalization.add_substitution(Substitution(token, str(value)))
+                message.add_personalization(personalization)
+            
+            response = self.sg.send(message)
+            
             return {
-                "status": "error",
-                "message": str(e),
-                "method": "sendgrid"
+                "status": "success",
+                "status_code": response.status_code,
+                "message": "Email batch sent successfully via SendGrid",
+                "method": "sendgrid_batch"
             }
+        except Exception as e:
+            print(f"Error sending email batch via SendGrid: {e}")
+            return {**self._sendgrid_error(e), "method": "sendgrid_batch"}
+    
+    def _sendgrid_error(self, error: Exception) -> dict:
+        result = {
+            "status": "error",
+            "message": str(error),
+            "method": "sendgrid",
+            "transient": _sendgrid_error_is_transient(error)
+        }
+        retry_after = _retry_after(error)
+        if retry_after is not None:
+            result["retry_after"] = retry_after
+        return result
     
-    def send_bulk_emails(self, emails: list) -> list:
+    @property
+    def provider(self) -> str:
+        return "gmail_smtp" if self.use_gmail else "sendgrid"
+    
+    def send_bulk_emails(self, emails: list, on_result=None) -> list:
         """
-        Send multiple emails
+        Send multiple emails in parallel (rate limited, transient errors retried)
         emails: list of dicts with keys: to_email, subject, content
+        on_result: optional callback(index, result) called as each email finishes
         """
-        results = []
-        for email_data in emails:
-            result = self.send_email(
-                email_data['to_email'],
-                email_data['subject'],
-                email_data['content']
-            )
-            result['recipient'] = email_data['to_email']
-            results.append(result)
-        return results
+        return self.bulk_sender.send_all(emails, on_result=on_result)
+    
+    def send_batch(self, subject: str, template: str, recipients: list) -> list:
+        """
+        Send one template to many recipients (SendGrid personalizations when available)
+        recipients: list of dicts with keys: to_email, substitutions
+        """
+        return self.bulk_sender.send_batch(subject, template, recipients)
+
+    def close(self):
+        """Close pooled SMTP sessions"""
+        if self.smtp_pool:
+            self.smtp_pool.close()
 
 # Create global instance
 email_service = EmailService()
+atexit.register(email_service.close)
 
 def send_email(to_email: str, subject: str, content: str) -> dict:
     """
@@ -123,8 +517,20 @@ def send_email(to_email: str, subject: str, content: str) -> dict:
     """
     return email_service.send_email(to_email, subject, content)
 
-def send_bulk_emails(emails: list) -> list:
+def send_email_with_retry(to_email: str, subject: str, content: str) -> dict:
+    """
+    Global helper for campaign sends: rate limited per provider, transient errors retried
+    """
+    return email_service.bulk_sender.send(to_email, subject, content)
+
+def send_batch_emails(subject: str, template: str, recipients: list) -> list:
+    """
+    Global helper for template campaigns: one request per 1000 recipients on SendGrid
+    """
+    return email_service.send_batch(subject, template, recipients)
+
+def send_bulk_emails(emails: list, on_result=None) -> list:
     """
     Global helper function for sending bulk emails
     """
-    return email_service.send_bulk_emails(emails)
+    return email_service.send_bulk_emails(emails, on_result=on_result)
@@ -1,47 +1,496 @@
+import atexit
 import json
 import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Iterator, Optional, TextIO, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
 
 def ensure_directory_exists(directory: str):
     """Ensure a directory exists, create if it doesn't"""
     Path(directory).mkdir(parents=True, exist_ok=True)
 
-def load_json_file(file_path: str) -> List[Dict]:
-    """Load JSON file, return empty list if file doesn't exist"""
-    if not os.path.exists(file_path):
-        # Create directory if it doesn't exist
-        directory = os.path.dirname(file_path)
-        ensure_directory_exists(directory)
-        # Create empty file
-        save_json_file(file_path, [])
-        return []
-    
+# ===== CRASH-SAFE, PROCESS-SAFE WRITES =====
+
+@contextmanager
+def file_lock(file_path: str):
+    """
+    Exclusive cross-process lock for a file, held on a <file>.lock sidecar.
+    Not re-entrant: never take the same lock twice in one call chain.
+    """
+    lock_path = file_path + ".lock"
+    ensure_directory_exists(os.path.dirname(lock_path) or ".")
+    with open(lock_path, 'a+') as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        else:
+            lock_file.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue  # LK_LOCK gives up after ~10s; keep waiting
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+def file_signature(file_path: str) -> Optional[Tuple[int, int, int]]:
+    """(inode, size, mtime) of a file, None when it does not exist; changes with every write"""
+    try:
+        stat = os.stat(file_path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+def _fsync_directory(directory: str):
+    """Make a rename durable (no-op where directories cannot be opened)"""
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def _atomic_write_text(file_path: str, text: str):
+    """Write to a temp file in the same directory, fsync, then rename over the target"""
+    directory = os.path.dirname(file_path) or "."
+    ensure_directory_exists(directory)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(file_path) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    _fsync_directory(directory)
+
+def _journal_path(file_path: str) -> str:
+    return file_path + ".journal"
+
+def _write_journaled(file_path: str, data: Any):
+    """
+    Write-ahead: the new content is committed to <file>.journal first, then
+    installed atomically. A crash in between is repaired by _recover_journal.
+    Caller must hold file_lock(file_path).
+    """
+    text = json.dumps(data, indent=2, ensure_ascii=False)
+    journal = _journal_path(file_path)
+    _atomic_write_text(journal, text)
+    _atomic_write_text(file_path, text)
+    os.remove(journal)
+
+def _recover_journal(file_path: str):
+    """Replay a journal left behind by a crash. Caller must hold file_lock(file_path)."""
+    journal = _journal_path(file_path)
+    if not os.path.exists(journal):
+        return
+    with open(journal, 'r', encoding='utf-8') as f:
+        text = f.read()
+    try:
+        json.loads(text)
+        _atomic_write_text(file_path, text)
+    except json.JSONDecodeError:
+        pass  # journal is written atomically, so this only happens if it was tampered with
+    os.remove(journal)
+
+def _read_json(file_path: str) -> Any:
+    """
+    Read a JSON file. A corrupt file is copied aside before returning [] so the
+    next write cannot silently destroy what was there.
+    """
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
             return json.load(f)
-    except (json.JSONDecodeError, FileNotFoundError):
+    except FileNotFoundError:
+        return []
+    except json.JSONDecodeError as e:
+        backup = f"{file_path}.corrupt-{datetime.now().strftime('%Y%m%d%H%M%S')}"
+        shutil.copy2(file_path, backup)
+        print(f"Corrupt JSON in {file_path} ({e}); kept a copy at {backup}")
         return []
 
+def load_json_file(file_path: str) -> List[Dict]:
+    """Load JSON file, return empty list if file doesn't exist"""
+    if os.path.exists(_journal_path(file_path)):
+        with file_lock(file_path):
+            _recover_journal(file_path)
+    
+    if not os.path.exists(file_path):
+        # Create the empty file under the lock, unless another process created (and filled) it meanwhile
+        created = False
+        with file_lock(file_path):
+            if not os.path.exists(file_path):
+                _write_journaled(file_path, [])
+                created = True
+                change = (file_path, None, file_signature(file_path))
+        if created:
+            _notify_write(file_path, data=[], change=change)
+            return []
+    
+    return read_cache.load_json(file_path)
+
 def save_json_file(file_path: str, data: Any):
-    """Save data to JSON file"""
-    directory = os.path.dirname(file_path)
-    ensure_directory_exists(directory)
+    """Save data to JSON file (locked, journaled and atomic)"""
+    with file_lock(file_path):
+        before = file_signature(file_path)
+        _write_journaled(file_path, data)
+        change = (file_path, before, file_signature(file_path))
+    _notify_write(file_path, data=data, change=change)
+
+def update_json_file(file_path: str, mutate: Callable[[Any], Any]) -> Any:
+    """
+    Read-modify-write a JSON file under the cross-process lock.
+    `mutate` receives the current data and either changes it in place or returns new data.
+    """
+    with file_lock(file_path):
+        _recover_journal(file_path)
+        before = file_signature(file_path)
+        data = _read_json(file_path)
+        result = mutate(data)
+        if result is not None:
+            data = result
+        _write_journaled(file_path, data)
+        change = (file_path, before, file_signature(file_path))
+    _notify_write(file_path, data=data, change=change)
+    return data
+
+# ===== WRITE LISTENERS =====
+# Called after every write from this process: listener(file_path, entry=..., data=..., change=...).
+# Appends pass the new entry; full rewrites pass the whole new data. change is
+# (path written, file_signature before, file_signature after), both taken under
+# the file lock, so a listener can tell whether anything else wrote in between.
+
+_write_listeners: List[Callable[..., None]] = []
+
+def add_write_listener(listener: Callable[..., None]):
+    _write_listeners.append(listener)
+
+def _notify_write(file_path: str, entry: Optional[Dict] = None, data: Any = None,
+                  change: Optional[Tuple[str, Optional[tuple], Optional[tuple]]] = None):
+    for listener in _write_listeners:
+        try:
+            listener(file_path, entry=entry, data=data, change=change)
+        except Exception as e:
+            print(f"Write listener error for {file_path}: {e}")
+
+# ===== APPEND-ONLY LOG STORE =====
+# Logs are written as JSON Lines next to the legacy array file:
+# logs/outreach_log.json (old entries, read-only) + logs/outreach_log.jsonl (new entries).
+
+def jsonl_path(file_path: str) -> str:
+    """JSON Lines file that receives appends for a log path"""
+    return str(Path(file_path).with_suffix(".jsonl"))
+
+class JsonlLogWriter:
+    """
+    O(1) appends to JSON Lines files, safe across processes. Each entry is
+    flushed to the OS right away; fsync is batched every `fsync_every`
+    entries or `fsync_interval` seconds. A background thread (started by the
+    first append) fsyncs what is left every `fsync_interval` seconds, so the
+    last entries before a quiet period are not left unsynced indefinitely.
+    """
+    
+    def __init__(self, fsync_every: int = 50, fsync_interval: float = 1.0):
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self._handles: Dict[str, Any] = {}
+        self._unsynced: Dict[str, int] = {}
+        self._last_sync: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._flusher: Optional[threading.Thread] = None
+        self._stop_flusher = threading.Event()
+    
+    def _start_flusher(self):
+        if self._flusher is None and self.fsync_interval > 0:
+            self._stop_flusher.clear()
+            self._flusher = threading.Thread(target=self._flush_periodically, name="jsonl-fsync", daemon=True)
+            self._flusher.start()
+    
+    def _flush_periodically(self):
+        while not self._stop_flusher.wait(self.fsync_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Error syncing logs: {e}")
+    
+    def _handle(self, path: str):
+        handle = self._handles.get(path)
+        if handle is None or handle.closed:
+            ensure_directory_exists(os.path.dirname(path) or ".")
+            handle = open(path, 'a', encoding='utf-8')
+            self._handles[path] = handle
+            self._unsynced[path] = 0
+            self._last_sync[path] = time.monotonic()
+        return handle
     
-    with open(file_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    def _repair_tail(self, path: str, handle):
+        """Terminate a line torn by a crashed writer so the next entry is not glued to it"""
+        if os.path.getsize(path) == 0:
+            return
+        with open(path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                handle.write("\n")
+    
+    def append(self, file_path: str, entry: Dict) -> Tuple[str, Optional[tuple], Optional[tuple]]:
+        """Append one entry; returns (path, signature before, signature after) taken under the file lock"""
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        path = jsonl_path(file_path)
+        with self._lock, file_lock(path):
+            self._start_flusher()
+            # Other processes append to the same file, so hold the file lock for the whole line
+            before = file_signature(path)
+            handle = self._handle(path)
+            self._repair_tail(path, handle)
+            handle.write(line)
+            handle.flush()
+            self._unsynced[path] += 1
+            if (self._unsynced[path] >= self.fsync_every or
+                    time.monotonic() - self._last_sync[path] >= self.fsync_interval):
+                self._sync(path)
+            return path, before, file_signature(path)
+    
+    def _sync(self, path: str):
+        os.fsync(self._handles[path].fileno())
+        self._unsynced[path] = 0
+        self._last_sync[path] = time.monotonic()
+    
+    def flush(self):
+        """fsync every file with pending entries"""
+        with self._lock:
+            for path, handle in self._handles.items():
+                if not handle.closed and self._unsynced.get(path):
+                    self._sync(path)
+    
+    def close(self):
+        """Stop the background fsync, then sync and close every file"""
+        flusher, self._flusher = self._flusher, None
+        if flusher is not None:
+            self._stop_flusher.set()
+            flusher.join(timeout=self.fsync_interval + 1)
+        self.flush()
+        with self._lock:
+            for handle in self._handles.values():
+                handle.close()
+            self._handles.clear()
+
+log_writer = JsonlLogWriter(
+    fsync_every=int(os.getenv("LOG_FSYNC_EVERY", "50")),
+    fsync_interval=float(os.getenv("LOG_FSYNC_INTERVAL", "1.0"))
+)
+atexit.register(log_writer.close)
 
 def append_to_json_file(file_path: str, new_data: Dict):
-    """Append new data to JSON file"""
-    current_data = load_json_file(file_path)
-    
+    """Append new data to a log (O(1): one JSON line, no rewrite)"""
     # Add timestamp if not present
     if 'timestamp' not in new_data:
         new_data['timestamp'] = datetime.now().isoformat()
     
-    current_data.append(new_data)
-    save_json_file(file_path, current_data)
+    change = log_writer.append(file_path, new_data)
+    _notify_write(file_path, entry=new_data, change=change)
+
+def iter_json_array(f: TextIO, chunk_size: int = 65536, strict: bool = False) -> Iterator[Any]:
+    """
+    Stream the elements of a JSON array from a text stream without loading it whole.
+    A truncated or malformed tail ends the stream quietly; with `strict` it raises
+    ValueError, as does input that is not an array.
+    """
+    decoder = json.JSONDecoder()
+    buffer, pos, eof, started = "", 0, False, False
+    while True:
+        # Skip whitespace and separators, reading more when the buffer runs dry
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos < len(buffer) or eof:
+                break
+            chunk = f.read(chunk_size)
+            buffer, pos, eof = buffer[pos:] + chunk, 0, not chunk
+        if pos >= len(buffer):
+            return
+        
+        if not started:
+            if buffer[pos] != "[":
+                if strict:
+                    raise ValueError("Expected a JSON array")
+                return
+            started = True
+            pos += 1
+            continue
+        if buffer[pos] == "]":
+            return
+        
+        try:
+            entry, pos = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if eof:
+                if strict:
+                    raise ValueError("Malformed JSON array element")
+                return  # truncated file: keep whatever was readable
+            chunk = f.read(chunk_size)
+            buffer, pos, eof = buffer[pos:] + chunk, 0, not chunk
+            continue
+        yield entry
+
+def _iter_json_array(file_path: str, chunk_size: int = 65536) -> Iterator[Dict]:
+    """Stream the elements of a legacy JSON array file without loading it whole"""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        yield from iter_json_array(f, chunk_size)
+
+def iter_json_log(file_path: str) -> Iterator[Dict]:
+    """Yield log entries oldest first: legacy array entries, then JSON Lines entries"""
+    if os.path.exists(file_path):
+        yield from _iter_json_array(file_path)
+    
+    path = jsonl_path(file_path)
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # torn final line from a crash
+
+def load_json_log(file_path: str) -> List[Dict]:
+    """All entries of a log as a list (served from the read cache when unchanged)"""
+    return read_cache.load_json(file_path, legacy_log=True) + read_cache.load_jsonl(jsonl_path(file_path))
+
+# ===== READ CACHE =====
+
+class FileReadCache:
+    """
+    Parsed-content cache keyed by path and invalidated by (inode, size, mtime).
+    JSON Lines files that only grew are parsed incrementally from the last offset.
+    Returned lists are fresh copies, but their entries are shared: treat them as read-only.
+    """
+    
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.incremental_reads = 0
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _signature(stat: os.stat_result) -> tuple:
+        return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+    
+    def _lookup(self, path: str, signature: tuple) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry["signature"] == signature:
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return entry
+            self.misses += 1
+            return entry
+    
+    def _store(self, path: str, entry: Dict[str, Any]):
+        with self._lock:
+            self._entries[path] = entry
+            self._entries.move_to_end(path)
+            while len(self._entries) > 1 and self.memory_bytes() > self.max_bytes:
+                self._entries.popitem(last=False)
+    
+    def load_json(self, path: str, legacy_log: bool = False) -> List[Dict]:
+        """Parsed JSON array file; legacy_log tolerates a truncated tail"""
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return []
+        signature = self._signature(stat)
+        entry = self._lookup(path, signature)
+        if entry is None or entry["signature"] != signature:
+            value = list(_iter_json_array(path)) if legacy_log else _read_json(path)
+            entry = {"signature": signature, "value": value, "bytes": stat.st_size}
+            self._store(path, entry)
+        value = entry["value"]
+        return list(value) if isinstance(value, list) else value
+    
+    def load_jsonl(self, path: str) -> List[Dict]:
+        """Parsed JSON Lines file, reading only the bytes appended since the last call"""
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return []
+        signature = self._signature(stat)
+        entry = self._lookup(path, signature)
+        if entry is not None and entry["signature"] == signature:
+            return list(entry["value"])
+        
+        # Same file that only grew: parse the tail. Anything else: start over.
+        if entry is not None and entry["signature"][0] == stat.st_ino and entry["offset"] <= stat.st_size:
+            value, offset = list(entry["value"]), entry["offset"]
+            self.incremental_reads += 1
+        else:
+            value, offset = [], 0
+        
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            data = f.read()
+        # Only consume complete lines; a partial last line is picked up next time
+        complete = data.rfind(b"\n") + 1
+        for line in data[:complete].splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                value.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue  # torn line from a crashed writer
+        
+        self._store(path, {"signature": signature, "value": value,
+                           "offset": offset + complete, "bytes": offset + complete})
+        return list(value)
+    
+    def memory_bytes(self) -> int:
+        """Approximate memory held, measured as the bytes of source parsed"""
+        return sum(entry["bytes"] for entry in self._entries.values())
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        with self._lock:
+            return {
+                "files": len(self._entries),
+                "approx_bytes": self.memory_bytes(),
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "incremental_reads": self.incremental_reads,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0
+            }
+
+read_cache = FileReadCache(max_bytes=int(os.getenv("FILE_CACHE_MAX_BYTES", str(64 * 1024 * 1024))))
 
 def get_current_timestamp() -> str:
     """Get current timestamp in ISO format"""
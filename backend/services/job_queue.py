@@ -0,0 +1,309 @@
+import asyncio
+import json
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from dotenv import load_dotenv
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.orm import Session
+
+from database.database import SessionLocal
+from database.models import Job, JobItem
+from services.campaigns import CampaignRun, build_campaign
+
+load_dotenv()
+
+def enqueue_job(db: Session, kind: str, recipients: List[Dict[str, Any]], params: Dict[str, Any]) -> Job:
+    """
+    Store a job and one item per recipient in a single transaction.
+    Duplicate emails inside one job are stored as skipped so nobody is emailed twice.
+    """
+    build_campaign(kind, params)  # fail fast on unknown kinds
+
+    job = Job(kind=kind, params=json.dumps(params), status="queued", total_items=len(recipients))
+    db.add(job)
+    db.flush()
+
+    seen_emails = set()
+    for position, recipient in enumerate(recipients):
+        email = (recipient.get("email") or "").strip().lower()
+        duplicate = bool(email) and email in seen_emails
+        seen_emails.add(email)
+        db.add(JobItem(
+            job_id=job.id,
+            position=position,
+            email=recipient.get("email"),
+            payload=json.dumps(recipient, ensure_ascii=False),
+            status="skipped" if duplicate else "pending",
+            result=json.dumps({"reason": "duplicate recipient in job"}) if duplicate else None
+        ))
+        if duplicate:
+            job.processed_items += 1
+
+    db.commit()
+    db.refresh(job)
+    return job
+
+def job_to_dict(job: Job) -> Dict[str, Any]:
+    """Serialize a job with progress (items are paged separately, see job_item_to_dict)"""
+    return {
+        "id": job.id,
+        "kind": job.kind,
+        "status": job.status,
+        "params": json.loads(job.params) if job.params else {},
+        "progress": {
+            "total": job.total_items,
+            "processed": job.processed_items,
+            "succeeded": job.succeeded_items,
+            # In the outbox (see /api/outbox): queued by this job, or already there from an earlier run
+            "queued": job.queued_items or 0,
+            "duplicate": job.duplicate_items or 0,
+            "failed": job.failed_items,
+            "percent": round(100 * job.processed_items / job.total_items, 1) if job.total_items else 100.0
+        },
+        "worker_id": job.worker_id,
+        "error": job.error,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "heartbeat_at": job.heartbeat_at.isoformat() if job.heartbeat_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None
+    }
+
+def job_item_to_dict(item: JobItem) -> Dict[str, Any]:
+    """Serialize one recipient's status within a job"""
+    return {
+        "id": item.id,
+        "position": item.position,
+        "email": item.email,
+        "status": item.status,
+        "result": json.loads(item.result) if item.result else None,
+        "updated_at": item.updated_at.isoformat() if item.updated_at else None
+    }
+
+def resume_job(db: Session, job: Job, retry_unknown: bool = False) -> Job:
+    """
+    Requeue a job so a worker picks up its remaining pending items.
+    Items whose send was interrupted ("unknown") are only retried when asked,
+    since the email may already have gone out.
+    """
+    if retry_unknown:
+        retried = db.query(JobItem).filter(
+            JobItem.job_id == job.id, JobItem.status == "unknown"
+        ).update({"status": "pending", "result": None}, synchronize_session=False)
+        job.processed_items -= retried
+    job.status = "queued"
+    job.error = None
+    job.finished_at = None
+    db.commit()
+    db.refresh(job)
+    return job
+
+# Send results that leave an item handed to the email outbox rather than sent
+ITEM_OUTBOX_STATUSES = ("queued", "duplicate")
+
+# Send result for items this worker could not claim: nothing was sent and nothing is recorded
+NOT_CLAIMED = {"status": "skipped", "message": "item not claimed: job taken over or item already handled"}
+
+class JobCampaignRun(CampaignRun):
+    """CampaignRun that checkpoints each item in the job tables around the send"""
+
+    def __init__(self, worker: "JobWorker", job_id: int, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.worker = worker
+        self.job_id = job_id
+        # Stable across resumes, so a re-run never queues the same email twice
+        self.campaign_key = f"job:{job_id}"
+
+    def _send(self, recipient, content):
+        # Claimed (and committed) before the email leaves, so a crash mid-send is never retried blindly
+        if not self.worker.claim_item(self.job_id, recipient["_item_id"]):
+            return NOT_CLAIMED
+        return super()._send(recipient, content)
+
+    def _send_batch(self, recipients, subject, template):
+        claimed = [r for r in recipients if self.worker.claim_item(self.job_id, r["_item_id"])]
+        sent = iter(super()._send_batch(claimed, subject, template) if claimed else [])
+        claimed_ids = {r["_item_id"] for r in claimed}
+        return [next(sent) if r["_item_id"] in claimed_ids else NOT_CLAIMED for r in recipients]
+
+    def _log(self, result):
+        if result.get("send_result") is NOT_CLAIMED:
+            return  # another worker owns the job (or already handled the item)
+        super()._log(result)
+        # With the outbox the email has only been queued ("duplicate": an earlier run of this
+        # job already queued it); the outbox_id in the result is where its delivery shows up
+        status = result["status"]
+        outcome = "sent" if status == "success" else status if status in ITEM_OUTBOX_STATUSES else "error"
+        detail = result.get("entry") or {"error": result.get("error")}
+        outbox_id = (result.get("send_result") or {}).get("outbox_id")
+        if outbox_id is not None:
+            detail = {**detail, "outbox_id": outbox_id}
+        self.worker.record_item_result(self.job_id, result["item"]["_item_id"], outcome, detail)
+
+class JobWorker:
+    """
+    Polls the jobs table and runs campaigns in the background.
+    Several workers (in-process or `python worker.py`) can share one database:
+    claiming is a conditional UPDATE, and jobs whose heartbeat goes stale are
+    taken over by another worker.
+    """
+
+    def __init__(self, worker_id: Optional[str] = None, poll_interval: Optional[float] = None,
+                 stale_after: Optional[float] = None, heartbeat_interval: Optional[float] = None):
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.poll_interval = poll_interval or float(os.getenv("JOB_POLL_INTERVAL", "2"))
+        self.stale_after = stale_after or float(os.getenv("JOB_STALE_SECONDS", "60"))
+        self.heartbeat_interval = heartbeat_interval or float(os.getenv("JOB_HEARTBEAT_INTERVAL", "10"))
+        self._stopping = False
+
+    def stop(self):
+        self._stopping = True
+
+    def _claimable(self, now: datetime):
+        stale_before = now - timedelta(seconds=self.stale_after)
+        return or_(
+            Job.status == "queued",
+            and_(Job.status == "running", or_(Job.heartbeat_at == None, Job.heartbeat_at < stale_before))
+        )
+
+    def claim_next_job(self) -> Optional[int]:
+        """Atomically take ownership of the oldest queued (or abandoned) job"""
+        now = datetime.utcnow()
+        with SessionLocal() as db:
+            candidates = db.query(Job.id).filter(self._claimable(now)).order_by(Job.id).limit(5).all()
+            for (job_id,) in candidates:
+                claimed = db.query(Job).filter(Job.id == job_id, self._claimable(now)).update({
+                    "status": "running",
+                    "worker_id": self.worker_id,
+                    "heartbeat_at": now,
+                    "started_at": now
+                }, synchronize_session=False)
+                db.commit()
+                if not claimed:
+                    continue  # another worker won the race
+
+                # Sends that were in flight when the previous owner died have an unknown outcome
+                interrupted = db.query(JobItem).filter(
+                    JobItem.job_id == job_id, JobItem.status == "sending"
+                ).update({
+                    "status": "unknown",
+                    "result": json.dumps({"reason": "worker stopped while sending; not retried to avoid a duplicate email"})
+                }, synchronize_session=False)
+                if interrupted:
+                    db.query(Job).filter(Job.id == job_id).update({
+                        "processed_items": Job.processed_items + interrupted
+                    }, synchronize_session=False)
+                db.commit()
+                return job_id
+        return None
+
+    def _owns(self, job_id: int):
+        """Criterion for items of a job this worker still owns"""
+        return JobItem.job_id.in_(select(Job.id).where(Job.id == job_id, Job.worker_id == self.worker_id))
+
+    def claim_item(self, job_id: int, item_id: int) -> bool:
+        """
+        Mark a pending item "sending" if this worker still owns its job. False means
+        the item must not be sent: a worker that took the job over (or this one,
+        earlier) already has it.
+        """
+        with SessionLocal() as db:
+            claimed = db.query(JobItem).filter(
+                JobItem.id == item_id, JobItem.status == "pending", self._owns(job_id)
+            ).update({"status": "sending"}, synchronize_session=False)
+            db.commit()
+            return claimed == 1
+
+    def record_item_result(self, job_id: int, item_id: int, status: str, detail: Dict[str, Any]):
+        with SessionLocal() as db:
+            # Pending when generation failed before the claim; ignored once the job changed hands
+            updated = db.query(JobItem).filter(
+                JobItem.id == item_id, JobItem.status.in_(("pending", "sending")), self._owns(job_id)
+            ).update({
+                "status": status,
+                "result": json.dumps(detail, ensure_ascii=False, default=str)
+            }, synchronize_session=False)
+            if not updated:
+                db.rollback()
+                return
+            db.query(Job).filter(Job.id == job_id, Job.worker_id == self.worker_id).update({
+                "processed_items": Job.processed_items + 1,
+                "succeeded_items": Job.succeeded_items + (1 if status == "sent" else 0),
+                "queued_items": func.coalesce(Job.queued_items, 0) + (1 if status == "queued" else 0),
+                "duplicate_items": func.coalesce(Job.duplicate_items, 0) + (1 if status == "duplicate" else 0),
+                "failed_items": Job.failed_items + (1 if status == "error" else 0),
+                "heartbeat_at": datetime.utcnow()
+            }, synchronize_session=False)
+            db.commit()
+
+    def _heartbeat(self, job_id: int):
+        with SessionLocal() as db:
+            db.query(Job).filter(Job.id == job_id, Job.worker_id == self.worker_id).update(
+                {"heartbeat_at": datetime.utcnow()}, synchronize_session=False
+            )
+            db.commit()
+
+    def _finish(self, job_id: int, status: str, error: Optional[str] = None):
+        with SessionLocal() as db:
+            db.query(Job).filter(Job.id == job_id, Job.worker_id == self.worker_id).update({
+                "status": status,
+                "error": error,
+                "finished_at": datetime.utcnow()
+            }, synchronize_session=False)
+            db.commit()
+
+    def _load(self, job_id: int):
+        with SessionLocal() as db:
+            job = db.get(Job, job_id)
+            items = db.query(JobItem).filter(
+                JobItem.job_id == job_id, JobItem.status == "pending"
+            ).order_by(JobItem.position).all()
+            recipients = [{**json.loads(item.payload), "_item_id": item.id} for item in items]
+            return job.kind, json.loads(job.params or "{}"), recipients
+
+    async def _keep_alive(self, job_id: int):
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                await asyncio.to_thread(self._heartbeat, job_id)
+            except Exception as e:
+                # Keep beating: a missed heartbeat or two must not hand the job to another worker
+                print(f"Job {job_id} heartbeat error: {e}")
+
+    async def process_job(self, job_id: int):
+        """Run the remaining pending items of a claimed job"""
+        heartbeat = asyncio.create_task(self._keep_alive(job_id))
+        try:
+            kind, params, recipients = await asyncio.to_thread(self._load, job_id)
+            run = JobCampaignRun(self, job_id, build_campaign(kind, params),
+                                 mode=params.get("mode", "per_recipient"),
+                                 ai_workers=params.get("ai_workers"),
+                                 send_workers=params.get("send_workers"))
+            async for _ in run.results(recipients):
+                pass
+            await asyncio.to_thread(self._finish, job_id, "completed")
+        except asyncio.CancelledError:
+            # Shutdown: leave the job running so its stale heartbeat lets a worker resume it
+            raise
+        except Exception as e:
+            print(f"Job {job_id} failed: {e}")
+            await asyncio.to_thread(self._finish, job_id, "failed", str(e))
+        finally:
+            heartbeat.cancel()
+
+    async def run_forever(self):
+        print(f"👷 Job worker {self.worker_id} started")
+        while not self._stopping:
+            try:
+                job_id = await asyncio.to_thread(self.claim_next_job)
+            except Exception as e:
+                print(f"Job worker poll error: {e}")
+                job_id = None
+            if job_id is None:
+                await asyncio.sleep(self.poll_interval)
+                continue
+            print(f"👷 Processing job {job_id}")
+            await self.process_job(job_id)
@@ -0,0 +1,161 @@
+import csv
+import io
+import json
+import os
+import re
+import time
+from collections import Counter
+from typing import Any, BinaryIO, Dict, Iterator, List, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+
+from database.database import SessionLocal
+from database.models import CommunityMember
+from services.file_utils import iter_json_array
+from services.onboarding import list_in_community
+
+IMPORT_CHUNK_SIZE = int(os.getenv("MEMBER_IMPORT_CHUNK_SIZE", "1000"))
+# Rejected rows listed individually in the report; the rest are only counted
+MAX_REPORTED_REJECTIONS = 100
+IMPORT_FIELDS = ("name", "email", "country", "skills", "interests")
+
+EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+def detect_format(content_type: str = "", filename: str = "") -> str:
+    """csv, jsonl or json (one array of members), from the upload's file name or content type"""
+    name = (filename or "").lower()
+    content_type = (content_type or "").lower()
+    if name.endswith((".jsonl", ".ndjson")) or "ndjson" in content_type or "jsonl" in content_type:
+        return "jsonl"
+    if name.endswith(".json") or "json" in content_type:
+        return "json"
+    return "csv"
+
+def iter_records(stream: BinaryIO, fmt: str) -> Iterator[Tuple[int, Any]]:
+    """
+    (row number, record) pairs read lazily from a binary stream; bad JSON lines
+    yield None. For json the row number is the position in the array, and input
+    that is not an array raises ValueError.
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    if fmt == "csv":
+        reader = csv.DictReader(text)
+        if reader.fieldnames:
+            reader.fieldnames = [field.strip().lower() for field in reader.fieldnames]
+        for record in reader:
+            yield reader.line_num, record
+        return
+    if fmt == "json":
+        index = 0
+        try:
+            for index, record in enumerate(iter_json_array(text, strict=True), start=1):
+                yield index, record if isinstance(record, dict) else None
+        except ValueError:
+            if not index:
+                raise
+            yield index + 1, None  # the rest of the array can't be read past a malformed element
+        return
+    for line_no, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            record = None
+        yield line_no, record if isinstance(record, dict) else None
+
+def clean_record(record: Any) -> Tuple[Dict[str, Any], str]:
+    """Normalized member fields, or the reason the row is rejected"""
+    if record is None:
+        return {}, "invalid_json"
+    member = {field: str(record.get(field) or "").strip() for field in IMPORT_FIELDS}
+    member["email"] = member["email"].lower()
+    if not member["name"]:
+        return member, "missing_name"
+    if not EMAIL_RE.match(member["email"]):
+        return member, "invalid_email"
+    # Same keys on every row, so bulk_insert_mappings runs as one executemany
+    return {k: v or None for k, v in member.items()}, ""
+
+class MemberImport:
+    """
+    Imports members chunk by chunk: one `lower(email) IN (...)` query per chunk
+    finds existing members (emails compare case-insensitively, as in add_member),
+    and the new ones go in with a single bulk_insert_mappings call.
+    """
+
+    def __init__(self, chunk_size: int = IMPORT_CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self.accepted = 0
+        self.reasons = Counter()
+        self.rejections: List[Dict[str, Any]] = []
+        self.seen = set()
+        self.added: List[Dict[str, Any]] = []
+
+    def reject(self, row: int, email: str, reason: str):
+        self.reasons[reason] += 1
+        if len(self.rejections) < MAX_REPORTED_REJECTIONS:
+            self.rejections.append({"row": row, "email": email, "reason": reason})
+
+    def _insert_chunk(self, chunk: List[Tuple[int, Dict[str, Any]]]):
+        with SessionLocal() as db:
+            for attempt in range(2):
+                emails = [member["email"] for _, member in chunk]
+                existing = {email.lower() for (email,) in db.query(CommunityMember.email).filter(
+                    func.lower(CommunityMember.email).in_(emails)
+                )}
+                new_rows = [(row, member) for row, member in chunk if member["email"] not in existing]
+                try:
+                    db.bulk_insert_mappings(CommunityMember, [member for _, member in new_rows])
+                    db.commit()
+                    ids = dict(db.query(CommunityMember.email, CommunityMember.id).filter(
+                        CommunityMember.email.in_([member["email"] for _, member in new_rows])
+                    ))
+                    break
+                except IntegrityError:
+                    # Someone else added one of these emails since the lookup; look again
+                    db.rollback()
+                    if attempt:
+                        raise
+        for row, member in chunk:
+            if member["email"] in existing:
+                self.reject(row, member["email"], "already_member")
+        self.accepted += len(new_rows)
+        self.added += [{**member, "member_id": ids[member["email"]]} for _, member in new_rows]
+
+    def run(self, stream: BinaryIO, fmt: str) -> Dict[str, Any]:
+        start = time.perf_counter()
+        chunk: List[Tuple[int, Dict[str, Any]]] = []
+        for row, record in iter_records(stream, fmt):
+            member, reason = clean_record(record)
+            if not reason and member["email"] in self.seen:
+                reason = "duplicate_in_file"
+            if reason:
+                self.reject(row, member.get("email", ""), reason)
+                continue
+            self.seen.add(member["email"])
+            chunk.append((row, member))
+            if len(chunk) >= self.chunk_size:
+                self._insert_chunk(chunk)
+                chunk = []
+        if chunk:
+            self._insert_chunk(chunk)
+
+        # One rewrite of the JSON community list for the whole import; members it
+        # already lists (added before the database) are linked, not listed twice
+        listed = list_in_community(self.added) if self.added else set()
+
+        return {
+            "format": fmt,
+            "accepted": self.accepted,
+            "already_listed": len(listed),  # accepted, and linked to their existing community.json entry
+            "rejected": sum(self.reasons.values()),
+            "rejected_by_reason": dict(self.reasons),
+            "rejections": self.rejections,
+            "elapsed_seconds": round(time.perf_counter() - start, 3)
+        }
+
+def import_members(stream: BinaryIO, fmt: str = "csv", chunk_size: int = IMPORT_CHUNK_SIZE) -> Dict[str, Any]:
+    """Import a CSV (with a header row), JSONL or JSON array stream of members; returns accepted/rejected counts"""
+    return MemberImport(chunk_size).run(stream, fmt)
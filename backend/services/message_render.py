@@ -0,0 +1,168 @@
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+from email.generator import BytesGenerator
+from email.header import Header
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from email.policy import SMTP
+from html.parser import HTMLParser
+from io import BytesIO
+from typing import Dict, List, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Tags that start a new line in the text version; the first group also leaves a blank line
+_PARAGRAPH_TAGS = {"p", "h1", "h2", "h3", "h4", "h5", "h6", "ul", "ol", "table", "blockquote", "pre"}
+_LINE_TAGS = {"div", "tr", "li", "section", "article", "header", "footer"}
+_SKIP_TAGS = {"head", "title", "script", "style"}
+# A tag we know (or a doctype/comment) means the body is HTML; a bare "<" as in
+# "3 < 5" or "<Registration Link>" in generated plain text does not
+_MARKUP = re.compile(
+    r"<(?:!doctype|!--|/?(?:html|body|br|a|span|b|strong|em|i|u|img|td|th|"
+    + "|".join(sorted(_PARAGRAPH_TAGS | _LINE_TAGS | _SKIP_TAGS)) + r")\b[^<>]*>)",
+    re.IGNORECASE
+)
+
+class _TextExtractor(HTMLParser):
+    """Collects readable text: block tags become line breaks, links keep their URL"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: List[str] = []
+        self._skip = 0
+        self._links: List[Optional[str]] = []
+
+    def _newline(self, count: int = 1):
+        """End the current line, leaving at least `count` line breaks (not adding to existing ones)"""
+        tail = "".join(self.parts[-4:]).rstrip(" ")
+        have = len(tail) - len(tail.rstrip("\n"))
+        if count > have:
+            self.parts.append("\n" * (count - have))
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIP_TAGS:
+            self._skip += 1
+        elif tag == "br":
+            self.parts.append("\n")
+        elif tag in _PARAGRAPH_TAGS:
+            self._newline(2)
+        elif tag in _LINE_TAGS:
+            self._newline()
+            if tag == "li":
+                self.parts.append("- ")
+        elif tag == "a":
+            self._links.append(dict(attrs).get("href"))
+            self.parts.append("\x00")  # marks where the link text starts
+
+    def handle_endtag(self, tag):
+        if tag in _SKIP_TAGS:
+            self._skip = max(0, self._skip - 1)
+        elif tag in _PARAGRAPH_TAGS:
+            self._newline(2)
+        elif tag in _LINE_TAGS:
+            self._newline()
+        elif tag == "a" and self._links:
+            href = self._links.pop()
+            start = len(self.parts) - 1 - self.parts[::-1].index("\x00")
+            text = "".join(self.parts[start + 1:]).strip()
+            self.parts[start:] = [text]
+            if href and not href.startswith(("#", "mailto:")) and href != text:
+                self.parts.append(f" ({href})")
+
+    def handle_data(self, data):
+        if not self._skip:
+            self.parts.append(re.sub(r"\s+", " ", data))
+
+def html_to_text(content: str) -> str:
+    """Plain-text alternative for an HTML body; content without markup is returned as is"""
+    if not _MARKUP.search(content):
+        return content
+    parser = _TextExtractor()
+    parser.feed(content)
+    parser.close()
+    text = "".join(p for p in parser.parts if p != "\x00")
+    lines = [line.strip() for line in text.split("\n")]
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip() + "\n"
+
+def _one_line(value: str) -> str:
+    """Header values never carry line breaks of their own (no header injection)"""
+    return " ".join(str(value).splitlines())
+
+def _subject_header(subject: str) -> str:
+    """Folded Subject value, RFC 2047-encoded when it is not ASCII"""
+    subject = _one_line(subject)
+    charset = "us-ascii" if subject.isascii() else "utf-8"
+    return Header(subject, charset, header_name="Subject").encode(linesep="\r\n")
+
+class MessageRenderer:
+    """
+    Builds each distinct email body once.
+
+    The multipart/alternative body (text part derived from the HTML, both parts
+    encoded, boundary fixed) is serialized to wire bytes and kept in an LRU
+    keyed by content hash; a message for one recipient is its From/To/Subject
+    lines followed by those cached bytes.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._bodies: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def build_body(content: str) -> bytes:
+        """Serialize the MIME body for `content` (MIME headers included, no addressing headers)"""
+        msg = MIMEMultipart("alternative")
+        msg.attach(MIMEText(html_to_text(content), "plain"))
+        msg.attach(MIMEText(content, "html"))
+        out = BytesIO()
+        BytesGenerator(out, policy=SMTP).flatten(msg)
+        return out.getvalue()
+
+    def body(self, content: str) -> bytes:
+        key = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        with self._lock:
+            cached = self._bodies.get(key)
+            if cached is not None:
+                self._bodies.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+        rendered = self.build_body(content)
+        with self._lock:
+            self._bodies[key] = rendered
+            while len(self._bodies) > self.max_entries:
+                self._bodies.popitem(last=False)
+        return rendered
+
+    def render(self, from_email: str, to_email: str, subject: str, content: str) -> bytes:
+        """Wire bytes of the message for one recipient"""
+        headers = (
+            f"Subject: {_subject_header(subject)}\r\n"
+            f"From: {_one_line(from_email)}\r\n"
+            f"To: {_one_line(to_email)}\r\n"
+        )
+        return headers.encode("utf-8") + self.body(content)
+
+    def clear(self):
+        with self._lock:
+            self._bodies.clear()
+
+    def stats(self) -> Dict:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._bodies),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0
+        }
+
+message_renderer = MessageRenderer(max_entries=int(os.getenv("EMAIL_RENDER_CACHE_SIZE", "256")))
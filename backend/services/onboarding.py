@@ -0,0 +1,290 @@
+import asyncio
+import json
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import and_, func, or_
+from sqlalchemy.exc import IntegrityError
+
+from database.database import SessionLocal
+from database.models import CommunityMember
+from services.ai_service import agenerate_text
+from services.file_utils import get_current_timestamp, update_json_file
+from services.outbox import deliver_email, email_delivery_mode
+from services.slack_service import aqueue_slack_message
+
+ONBOARDING_STEPS = ("welcome_email", "slack_announcement")
+# Step results that count as done: the outbox reports "queued", or "duplicate" when a resumed
+# run finds this member's welcome email already pending or sent (failed ones are re-queued)
+DONE_STATUSES = ("success", "queued", "duplicate")
+# Recorded before a step's side effect, so a run taken over mid-step knows it may already have happened
+IN_FLIGHT = "sending"
+
+def onboarding_to_dict(member: CommunityMember) -> Dict[str, Any]:
+    """Onboarding state of a member as returned by the API"""
+    return {
+        "member_id": member.id,
+        "name": member.name,
+        "email": member.email,
+        "status": member.onboarding_status,
+        "steps": json.loads(member.onboarding_detail or "{}"),
+        "updated_at": member.onboarding_updated_at.isoformat() if member.onboarding_updated_at else None
+    }
+
+def list_in_community(members: List[Dict[str, Any]]) -> Set[str]:
+    """
+    Add members ({"member_id", "name", "email", "country"}, emails lower-cased) to
+    data/community.json in one rewrite. An email already listed there, in any case,
+    has its entry linked to the member_id instead of a second entry; returns those emails.
+    """
+    by_email = {member["email"]: member for member in members}
+    joined = get_current_timestamp()
+    already_listed: Set[str] = set()
+
+    def add_to_community(community):
+        listed = set()
+        for entry in community:
+            email = str(entry.get("email") or "").strip().lower()
+            if email in by_email:
+                entry["member_id"] = by_email[email]["member_id"]
+                listed.add(email)
+        community.extend({
+            "member_id": member["member_id"],
+            "name": member["name"],
+            "email": member["email"],
+            "country": member["country"] or "",
+            "joined_date": joined
+        } for member in members if member["email"] not in listed)
+        already_listed.update(listed)
+
+    update_json_file("data/community.json", add_to_community)
+    return already_listed
+
+def add_member(name: str, email: str, country: str) -> Tuple[CommunityMember, bool]:
+    """
+    Save a new member with onboarding pending; returns (member, created).
+    Emails are stored trimmed and lower-cased (as the bulk importer does); an
+    email that is already registered, in any case, returns the existing member.
+    A member only listed in data/community.json so far gets a database record
+    marked onboarded, and no second welcome.
+    """
+    email = email.strip().lower()
+    with SessionLocal() as db:
+        existing = db.query(CommunityMember).filter(func.lower(CommunityMember.email) == email).first()
+        if existing is not None:
+            return existing, False
+        member = CommunityMember(
+            name=name,
+            email=email,
+            country=country,
+            onboarding_status="pending",
+            onboarding_detail="{}",
+            onboarding_updated_at=datetime.utcnow()
+        )
+        db.add(member)
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            return db.query(CommunityMember).filter(func.lower(CommunityMember.email) == email).one(), False
+        db.refresh(member)
+
+    # Keep the JSON community list (dashboard, follow-up campaigns) in step
+    listed = list_in_community([{"member_id": member.id, "name": name, "email": email, "country": country}])
+    if listed:
+        # Listed (and welcomed) before the database knew them
+        with SessionLocal() as db:
+            db.query(CommunityMember).filter(CommunityMember.id == member.id).update({
+                "onboarding_status": "completed",
+                "onboarding_detail": json.dumps({"note": "onboarded before database records"}),
+                "onboarding_updated_at": datetime.utcnow()
+            }, synchronize_session=False)
+            db.commit()
+            return db.get(CommunityMember, member.id), False
+    return member, True
+
+class OnboardingPipeline:
+    """
+    Runs onboarding side effects after /onboard_member has responded: the welcome
+    email (generated, then handed to the outbox) and the Slack announcement, in
+    parallel. Each step's result is written to the member as it finishes, so
+    GET /api/members/{id}/onboarding shows progress; members left pending or
+    running by a restart are picked up again by resume_pending().
+
+    Like JobWorker, a run first claims the member with a conditional UPDATE and
+    keeps a heartbeat, so with several app processes only one runs a member's
+    pipeline, and another takes over only once that heartbeat is stale.
+    """
+
+    def __init__(self, worker_id: Optional[str] = None, stale_after: Optional[float] = None,
+                 heartbeat_interval: Optional[float] = None):
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.stale_after = stale_after or float(os.getenv("ONBOARDING_STALE_SECONDS", "60"))
+        self.heartbeat_interval = heartbeat_interval or float(os.getenv("ONBOARDING_HEARTBEAT_INTERVAL", "10"))
+        self._tasks = set()
+
+    def start(self, member_id: int) -> asyncio.Task:
+        """Fire and forget; the task is kept referenced until it finishes"""
+        task = asyncio.get_running_loop().create_task(self.run(member_id))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def _claimable(self, now: datetime):
+        stale_before = now - timedelta(seconds=self.stale_after)
+        return and_(
+            CommunityMember.onboarding_status.in_(("pending", "running")),
+            or_(CommunityMember.onboarding_heartbeat_at == None, CommunityMember.onboarding_heartbeat_at < stale_before)
+        )
+
+    def claim(self, member_id: int) -> bool:
+        """Take over a member's onboarding unless another process is (still) running it"""
+        now = datetime.utcnow()
+        with SessionLocal() as db:
+            claimed = db.query(CommunityMember).filter(
+                CommunityMember.id == member_id, self._claimable(now)
+            ).update({
+                "onboarding_status": "running",
+                "onboarding_worker_id": self.worker_id,
+                "onboarding_heartbeat_at": now,
+                "onboarding_updated_at": now
+            }, synchronize_session=False)
+            db.commit()
+            return claimed == 1
+
+    def _heartbeat(self, member_id: int):
+        with SessionLocal() as db:
+            db.query(CommunityMember).filter(
+                CommunityMember.id == member_id, CommunityMember.onboarding_worker_id == self.worker_id
+            ).update({"onboarding_heartbeat_at": datetime.utcnow()}, synchronize_session=False)
+            db.commit()
+
+    async def _keep_alive(self, member_id: int):
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                await asyncio.to_thread(self._heartbeat, member_id)
+            except Exception as e:
+                print(f"Onboarding {member_id} heartbeat error: {e}")
+
+    def _load(self, member_id: int) -> Optional[Dict[str, Any]]:
+        with SessionLocal() as db:
+            member = db.get(CommunityMember, member_id)
+            if member is None:
+                return None
+            return {
+                "id": member.id,
+                "name": member.name,
+                "email": member.email,
+                "country": member.country,
+                "steps": json.loads(member.onboarding_detail or "{}")
+            }
+
+    def _save(self, member_id: int, status: str, steps: Dict[str, Any]) -> bool:
+        """Write progress if this process still owns the member; False once another took over"""
+        now = datetime.utcnow()
+        with SessionLocal() as db:
+            saved = db.query(CommunityMember).filter(
+                CommunityMember.id == member_id, CommunityMember.onboarding_worker_id == self.worker_id
+            ).update({
+                "onboarding_status": status,
+                "onboarding_detail": json.dumps(steps),
+                "onboarding_updated_at": now,
+                "onboarding_heartbeat_at": now
+            }, synchronize_session=False)
+            db.commit()
+            return saved == 1
+
+    async def _welcome_email(self, member: Dict[str, Any]) -> Dict[str, Any]:
+        prompt = f"""
+        Write a warm welcome email for {member['name']} from {member['country']} who just joined our hackathon community.
+
+        The email should:
+        - Welcome them enthusiastically
+        - Introduce them to the community
+        - Mention upcoming events and opportunities
+        - Include links to our Discord and resources
+        - Encourage them to participate actively
+        """
+
+        welcome_email = await agenerate_text(prompt)
+        subject = f"🎉 Welcome to HackaTwin Community, {member['name']}!"
+        # One welcome per member whatever the text: a resumed run regenerates it, then finds the email it queued
+        return await asyncio.to_thread(deliver_email, member['email'], subject, welcome_email,
+                                       f"welcome:{member['id']}", False)
+
+    async def _slack_announcement(self, member: Dict[str, Any]) -> Dict[str, Any]:
+        slack_message = f"🎉 Welcome {member['name']} from {member['country']} to our HackaTwin community! Check your email for onboarding info."
+        return await aqueue_slack_message(os.getenv('SLACK_CHANNEL_ID'), slack_message)
+
+    async def run(self, member_id: int):
+        if not await asyncio.to_thread(self.claim, member_id):
+            return  # another process is onboarding this member, or it is done
+        heartbeat = asyncio.create_task(self._keep_alive(member_id))
+        try:
+            await self._run_steps(member_id)
+        finally:
+            heartbeat.cancel()
+
+    async def _run_steps(self, member_id: int):
+        member = await asyncio.to_thread(self._load, member_id)
+        if member is None:
+            return
+        steps = member["steps"]
+        save_lock = asyncio.Lock()
+
+        async def record(status: str) -> bool:
+            async with save_lock:
+                return await asyncio.to_thread(self._save, member_id, status, steps)
+
+        async def run_step(name: str, step, retry_safe: bool):
+            state = steps.get(name, {}).get("status")
+            if state in DONE_STATUSES:
+                return  # finished before a restart
+            if state == IN_FLIGHT and not retry_safe:
+                # The previous run stopped mid-step: it may have gone out already, so don't repeat it
+                steps[name] = {"status": "unknown", "message": "interrupted while sending; not retried to avoid a duplicate",
+                               "finished_at": get_current_timestamp()}
+                await record("running")
+                return
+            steps[name] = {"status": IN_FLIGHT, "started_at": get_current_timestamp()}
+            if not await record("running"):
+                return  # taken over by another process
+            try:
+                result = await step(member)
+            except Exception as e:
+                result = {"status": "error", "message": str(e)}
+            steps[name] = {**result, "finished_at": get_current_timestamp()}
+            await record("running")
+
+        await asyncio.gather(
+            # The outbox keeps one welcome per member, so a retried step can't queue a second one
+            run_step("welcome_email", self._welcome_email, email_delivery_mode() == "outbox"),
+            run_step("slack_announcement", self._slack_announcement, False)
+        )
+        done = all(steps.get(name, {}).get("status") in DONE_STATUSES for name in ONBOARDING_STEPS)
+        await record("completed" if done else "failed")
+
+    async def resume_pending(self) -> int:
+        """
+        Restart onboarding interrupted by a shutdown; returns how many were started.
+        Members another process is still running (fresh heartbeat) are left alone.
+        """
+        def pending_ids():
+            with SessionLocal() as db:
+                return [row.id for row in db.query(CommunityMember.id).filter(self._claimable(datetime.utcnow()))]
+
+        member_ids = await asyncio.to_thread(pending_ids)
+        for member_id in member_ids:
+            self.start(member_id)
+        return len(member_ids)
+
+    async def drain(self, timeout: float = 10.0):
+        """Give in-flight pipelines a chance to finish on shutdown"""
+        if self._tasks:
+            await asyncio.wait(list(self._tasks), timeout=timeout)
+
+onboarding_pipeline = OnboardingPipeline()
@@ -0,0 +1,214 @@
+import asyncio
+import hashlib
+import os
+import random
+import socket
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from dotenv import load_dotenv
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+
+from database.database import SessionLocal
+from database.models import OutboxEmail
+from services.email_service import email_service, send_email_with_retry
+
+load_dotenv()
+
+def email_delivery_mode() -> str:
+    """"outbox" (record, then send from the outbox worker) or "direct" (send in the request)"""
+    return os.getenv("EMAIL_DELIVERY", "outbox").lower()
+
+def content_hash(subject: str, content: str) -> str:
+    return hashlib.sha256(f"{subject}\n{content}".encode("utf-8")).hexdigest()
+
+def dedup_key(recipient: str, campaign: str, body_hash: str) -> str:
+    return hashlib.sha256(f"{recipient.strip().lower()}|{campaign}|{body_hash}".encode("utf-8")).hexdigest()
+
+def enqueue_email(to_email: str, subject: str, content: str, campaign: Optional[str] = None,
+                  dedup_content: bool = True) -> Dict[str, Any]:
+    """
+    Durably record an email for the outbox worker to send.
+    The same content to the same recipient within a campaign is only stored once
+    (with dedup_content=False, any content: one email per recipient and campaign):
+    while that email is pending or sent, enqueueing it again returns
+    status "duplicate" (with its outbox_status); once it has failed, it is
+    queued for another round of attempts. Without a campaign the email gets
+    a key of its own, so ad-hoc sends are never deduplicated against each other.
+    """
+    campaign = campaign or f"adhoc:{uuid.uuid4().hex[:12]}"
+    body_hash = content_hash(subject, content)
+    key = dedup_key(to_email, campaign, body_hash if dedup_content else "")
+    with SessionLocal() as db:
+        existing = db.query(OutboxEmail).filter(OutboxEmail.dedup_key == key).first()
+        if existing is None:
+            email = OutboxEmail(
+                dedup_key=key,
+                campaign=campaign,
+                recipient=to_email,
+                subject=subject,
+                content=content,
+                content_hash=body_hash,
+                status="pending",
+                next_attempt_at=datetime.utcnow()
+            )
+            db.add(email)
+            try:
+                db.commit()
+                return {"status": "queued", "outbox_id": email.id, "duplicate": False, "method": "outbox"}
+            except IntegrityError:
+                # Another request stored the same email first
+                db.rollback()
+                existing = db.query(OutboxEmail).filter(OutboxEmail.dedup_key == key).first()
+
+        if existing.status == "failed":
+            requeued = db.query(OutboxEmail).filter(
+                OutboxEmail.id == existing.id, OutboxEmail.status == "failed"
+            ).update({"status": "pending", "attempts": 0, "next_attempt_at": datetime.utcnow(),
+                      "last_error": None, "claim": None}, synchronize_session=False)
+            db.commit()
+            if requeued:
+                return {"status": "queued", "outbox_id": existing.id, "duplicate": False, "method": "outbox",
+                        "requeued": True}
+            db.refresh(existing)  # another request re-queued it first
+        return {"status": "duplicate", "outbox_id": existing.id, "duplicate": True, "method": "outbox",
+                "outbox_status": existing.status}
+
+def deliver_email(to_email: str, subject: str, content: str, campaign: Optional[str] = None,
+                  dedup_content: bool = True) -> Dict[str, Any]:
+    """Send through the outbox or directly, depending on EMAIL_DELIVERY"""
+    if email_delivery_mode() == "outbox":
+        return enqueue_email(to_email, subject, content, campaign, dedup_content)
+    return send_email_with_retry(to_email, subject, content)
+
+def outbox_email_to_dict(email: OutboxEmail) -> Dict[str, Any]:
+    """Delivery state of one outbox email as returned by the API"""
+    return {
+        "id": email.id,
+        "campaign": email.campaign,
+        "recipient": email.recipient,
+        "subject": email.subject,
+        "status": email.status,
+        "attempts": email.attempts,
+        "last_error": email.last_error,
+        "next_attempt_at": email.next_attempt_at.isoformat() if email.next_attempt_at else None,
+        "created_at": email.created_at.isoformat() if email.created_at else None,
+        "sent_at": email.sent_at.isoformat() if email.sent_at else None
+    }
+
+def outbox_stats(db) -> Dict[str, Any]:
+    """Queue depth by status and how long the oldest unsent email has waited"""
+    by_status = dict(db.query(OutboxEmail.status, func.count(OutboxEmail.id)).group_by(OutboxEmail.status).all())
+    oldest_pending = db.query(func.min(OutboxEmail.created_at)).filter(
+        OutboxEmail.status.in_(("pending", "sending"))
+    ).scalar()
+    retrying = db.query(func.count(OutboxEmail.id)).filter(
+        OutboxEmail.status == "pending", OutboxEmail.attempts > 0
+    ).scalar()
+    if isinstance(oldest_pending, str):
+        oldest_pending = datetime.fromisoformat(oldest_pending)
+    return {
+        "depth": by_status.get("pending", 0) + by_status.get("sending", 0),
+        "by_status": by_status,
+        "retrying": retrying,
+        "oldest_pending_age_seconds": round((datetime.utcnow() - oldest_pending).total_seconds(), 1) if oldest_pending else 0.0
+    }
+
+class OutboxSender:
+    """
+    Drains the outbox: claims due emails in batches, sends them concurrently and
+    reschedules transient failures with jittered exponential backoff.
+    Delivery is at-least-once: emails left "sending" by a crashed sender are
+    picked up again once their claim goes stale.
+    """
+
+    def __init__(self, sender_id: Optional[str] = None, batch_size: Optional[int] = None,
+                 concurrency: Optional[int] = None, poll_interval: Optional[float] = None):
+        self.sender_id = sender_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.batch_size = batch_size or int(os.getenv("OUTBOX_BATCH_SIZE", "50"))
+        self.concurrency = concurrency or int(os.getenv("OUTBOX_SEND_WORKERS", "8"))
+        self.poll_interval = poll_interval or float(os.getenv("OUTBOX_POLL_INTERVAL", "1"))
+        self.max_attempts = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "8"))
+        self.base_delay = float(os.getenv("OUTBOX_RETRY_BASE_DELAY", "5"))
+        self.max_delay = float(os.getenv("OUTBOX_RETRY_MAX_DELAY", "900"))
+        self.stale_after = float(os.getenv("OUTBOX_STALE_SECONDS", "300"))
+        self._stopping = False
+
+    def stop(self):
+        self._stopping = True
+
+    def claim_batch(self):
+        """Atomically take up to batch_size due emails; returns (id, recipient, subject, content, attempts)"""
+        now = datetime.utcnow()
+        claim = uuid.uuid4().hex
+        with SessionLocal() as db:
+            # Sends interrupted by a crash go back in the queue
+            db.query(OutboxEmail).filter(
+                OutboxEmail.status == "sending",
+                OutboxEmail.locked_at < now - timedelta(seconds=self.stale_after)
+            ).update({"status": "pending", "claim": None}, synchronize_session=False)
+
+            due = db.query(OutboxEmail.id).filter(
+                OutboxEmail.status == "pending", OutboxEmail.next_attempt_at <= now
+            ).order_by(OutboxEmail.next_attempt_at, OutboxEmail.id).limit(self.batch_size)
+            db.query(OutboxEmail).filter(
+                OutboxEmail.id.in_(due.scalar_subquery()), OutboxEmail.status == "pending"
+            ).update({"status": "sending", "claim": claim, "locked_at": now}, synchronize_session=False)
+            db.commit()
+
+            return db.query(
+                OutboxEmail.id, OutboxEmail.recipient, OutboxEmail.subject, OutboxEmail.content, OutboxEmail.attempts
+            ).filter(OutboxEmail.claim == claim).all()
+
+    def _backoff(self, attempts: int) -> float:
+        return random.uniform(0.5, 1.0) * min(self.max_delay, self.base_delay * (2 ** (attempts - 1)))
+
+    def record_result(self, email_id: int, attempts: int, result: Dict[str, Any]):
+        now = datetime.utcnow()
+        if result.get("status") == "success":
+            values = {"status": "sent", "sent_at": now, "last_error": None}
+        elif result.get("transient") and attempts < self.max_attempts:
+            values = {"status": "pending", "next_attempt_at": now + timedelta(seconds=self._backoff(attempts)),
+                      "last_error": result.get("message")}
+        else:
+            values = {"status": "failed", "last_error": result.get("message")}
+        values.update({"attempts": attempts, "claim": None})
+        with SessionLocal() as db:
+            db.query(OutboxEmail).filter(OutboxEmail.id == email_id).update(values, synchronize_session=False)
+            db.commit()
+
+    def _send_one(self, email_id: int, recipient: str, subject: str, content: str, attempts: int):
+        try:
+            # Rate limited like every other send; retries are scheduled here instead of slept on
+            result = email_service.bulk_sender.send(recipient, subject, content, max_retries=0)
+        except Exception as e:
+            result = {"status": "error", "message": str(e), "transient": True}
+        self.record_result(email_id, attempts + 1, result)
+        return result
+
+    async def drain_once(self) -> int:
+        """Send one claimed batch; returns how many emails were attempted"""
+        batch = await asyncio.to_thread(self.claim_batch)
+        if not batch:
+            return 0
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def send(row):
+            async with semaphore:
+                await asyncio.to_thread(self._send_one, *row)
+
+        await asyncio.gather(*(send(row) for row in batch))
+        return len(batch)
+
+    async def run_forever(self):
+        print(f"📮 Outbox sender {self.sender_id} started")
+        while not self._stopping:
+            try:
+                sent = await self.drain_once()
+            except Exception as e:
+                print(f"Outbox sender error: {e}")
+                sent = 0
+            if not sent:
+                await asyncio.sleep(self.poll_interval)
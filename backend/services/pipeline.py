@@ -0,0 +1,143 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Sentinel pushed through the queues to tell a stage its input is exhausted
+_DONE = object()
+
+class CampaignPipeline:
+    """
+    Bounded-concurrency pipeline for bulk campaigns:
+    AI generation pool -> send pool -> single log writer.
+
+    Stage callables may be plain functions or coroutines. Plain functions
+    run on a thread pool of each run's own, sized to the worker counts, so
+    they never block the event loop and concurrent runs don't share it.
+    """
+
+    def __init__(self, generate: Callable, send: Callable, log: Optional[Callable] = None,
+                 ai_workers: Optional[int] = None, send_workers: Optional[int] = None,
+                 queue_size: Optional[int] = None):
+        self.generate = generate
+        self.send = send
+        self.log = log
+        self.ai_workers = max(1, ai_workers or int(os.getenv("PIPELINE_AI_WORKERS", "4")))
+        self.send_workers = max(1, send_workers or int(os.getenv("PIPELINE_SEND_WORKERS", "8")))
+        self.queue_size = queue_size or int(os.getenv("PIPELINE_QUEUE_SIZE", "100"))
+
+    async def _call(self, executor: ThreadPoolExecutor, func: Callable, *args) -> Any:
+        """Await a coroutine function or run a plain function on the run's thread pool"""
+        if asyncio.iscoroutinefunction(func):
+            return await func(*args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, func, *args)
+
+    async def _feed(self, items: Iterable[Dict], generate_queue: asyncio.Queue):
+        for index, item in enumerate(items):
+            await generate_queue.put((index, item))
+        for _ in range(self.ai_workers):
+            await generate_queue.put(_DONE)
+
+    async def _generate_worker(self, executor: ThreadPoolExecutor, generate_queue: asyncio.Queue,
+                               send_queue: asyncio.Queue, log_queue: asyncio.Queue):
+        while True:
+            job = await generate_queue.get()
+            if job is _DONE:
+                return
+            index, item = job
+            try:
+                message = await self._call(executor, self.generate, item)
+            except Exception as e:
+                print(f"Pipeline generation error: {e}")
+                await log_queue.put({"index": index, "item": item, "status": "error", "error": str(e)})
+                continue
+            await send_queue.put((index, item, message))
+
+    async def _send_worker(self, executor: ThreadPoolExecutor, send_queue: asyncio.Queue, log_queue: asyncio.Queue):
+        while True:
+            job = await send_queue.get()
+            if job is _DONE:
+                return
+            index, item, message = job
+            try:
+                send_result = await self._call(executor, self.send, item, message)
+                result = {
+                    "index": index,
+                    "item": item,
+                    "message": message,
+                    "status": send_result.get("status", "error"),
+                    "send_result": send_result
+                }
+            except Exception as e:
+                print(f"Pipeline send error: {e}")
+                result = {"index": index, "item": item, "message": message, "status": "error", "error": str(e)}
+            await log_queue.put(result)
+
+    async def _log_writer(self, executor: ThreadPoolExecutor, log_queue: asyncio.Queue, out_queue: asyncio.Queue):
+        # A single writer keeps log appends serialized
+        while True:
+            result = await log_queue.get()
+            if result is _DONE:
+                await out_queue.put(_DONE)
+                return
+            if self.log is not None:
+                try:
+                    await self._call(executor, self.log, result)
+                except Exception as e:
+                    print(f"Pipeline log error: {e}")
+            await out_queue.put(result)
+
+    async def _close_stage(self, workers: list, queue: asyncio.Queue, count: int):
+        await asyncio.gather(*workers)
+        for _ in range(count):
+            await queue.put(_DONE)
+
+    async def run(self, items: Iterable[Dict]) -> AsyncIterator[Dict]:
+        """
+        Push items through the pipeline, yielding each result as soon as it is logged.
+        Results arrive in completion order; use result["index"] to restore input order.
+        """
+        executor = ThreadPoolExecutor(max_workers=self.ai_workers + self.send_workers + 1,
+                                      thread_name_prefix="campaign")
+        generate_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        send_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        log_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        out_queue: asyncio.Queue = asyncio.Queue()
+
+        generate_workers = [
+            asyncio.create_task(self._generate_worker(executor, generate_queue, send_queue, log_queue))
+            for _ in range(self.ai_workers)
+        ]
+        send_workers = [
+            asyncio.create_task(self._send_worker(executor, send_queue, log_queue))
+            for _ in range(self.send_workers)
+        ]
+        tasks = [
+            asyncio.create_task(self._feed(items, generate_queue)),
+            asyncio.create_task(self._close_stage(generate_workers, send_queue, self.send_workers)),
+            asyncio.create_task(self._close_stage(send_workers, log_queue, 1)),
+            asyncio.create_task(self._log_writer(executor, log_queue, out_queue)),
+        ] + generate_workers + send_workers
+
+        try:
+            while True:
+                result = await out_queue.get()
+                if result is _DONE:
+                    break
+                yield result
+        finally:
+            # Stop everything if the consumer goes away early (e.g. client disconnect)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            executor.shutdown(wait=False)
+
+    async def run_all(self, items: Iterable[Dict]) -> list:
+        """Run the pipeline to completion and return results in input order"""
+        results = [result async for result in self.run(items)]
+        return sorted(results, key=lambda r: r["index"])
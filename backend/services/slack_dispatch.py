@@ -0,0 +1,324 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from slack_sdk.errors import SlackApiError
+from dotenv import load_dotenv
+
+from services.email_service import TokenBucket
+
+load_dotenv()
+
+# Web API rate limit tiers, in requests per minute (https://api.slack.com/docs/rate-limits)
+TIER_RATES = {1: 1, 2: 20, 3: 50, 4: 100}
+METHOD_RATES = {
+    "conversations.open": TIER_RATES[3],
+    "chat.scheduleMessage": TIER_RATES[3],
+    # chat.postMessage is "special": ~1 per second per channel (enforced per channel below)
+    # and several hundred per minute across the workspace
+    "chat.postMessage": int(os.getenv("SLACK_RATE_POST_MESSAGE", "300")),
+}
+
+# Slack truncates very long messages; coalesced text stays well below that
+MAX_COALESCED_CHARS = 4000
+
+class _PendingMessage:
+    """Texts for one destination waiting out the coalescing window"""
+
+    def __init__(self):
+        self.texts: List[str] = []
+        self.futures: List[Future] = []
+        self.chars = 0
+
+    def add(self, text: str) -> Future:
+        future = Future()
+        self.texts.append(text)
+        self.futures.append(future)
+        self.chars += len(text)
+        return future
+
+class SlackDispatcher:
+    """
+    Sends Slack messages for a WebClient:
+
+    - DM channel ids are cached per user, so conversations.open runs once per user
+    - every call waits for its method's tier limit (and chat.postMessage for its
+      channel's one-per-second limit); a 429 pauses that method for Retry-After
+      seconds for all workers before the call is retried
+    - messages to the same channel or user within `coalesce_window` seconds are
+      joined into one chat.postMessage
+    - sends run concurrently on a small worker pool
+    """
+
+    def __init__(self, client, workers: int = None, coalesce_window: float = None, max_retries: int = None):
+        self.client = client
+        self.workers = workers or int(os.getenv("SLACK_SEND_WORKERS", "4"))
+        self.coalesce_window = coalesce_window if coalesce_window is not None else float(os.getenv("SLACK_COALESCE_WINDOW", "0.5"))
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv("SLACK_MAX_RETRIES", "3"))
+        channel_rate = float(os.getenv("SLACK_RATE_PER_CHANNEL", "1"))
+        # Limits are per minute, so a minute's allowance may go out as one burst
+        self.method_limiters = {
+            method: TokenBucket(per_minute / 60.0, capacity=per_minute)
+            for method, per_minute in METHOD_RATES.items()
+        }
+        self._channel_limiters: Dict[str, TokenBucket] = {}
+        self._channel_rate = channel_rate
+        self.dm_channels: Dict[str, str] = {}
+        self._pending: Dict[Tuple[str, str], _PendingMessage] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="slack-send")
+        self.api_calls = 0
+        self.rate_limited = 0
+        self.coalesced = 0
+
+    # ----- Web API calls -----
+
+    def _channel_limiter(self, channel: str) -> TokenBucket:
+        with self._lock:
+            limiter = self._channel_limiters.get(channel)
+            if limiter is None:
+                limiter = self._channel_limiters[channel] = TokenBucket(self._channel_rate)
+            return limiter
+
+    def call(self, method: str, channel: Optional[str] = None, **kwargs):
+        """Call a Web API method within its rate limits, retrying 429s after Retry-After"""
+        limiter = self.method_limiters.get(method)
+        attempt = 0
+        while True:
+            if limiter:
+                limiter.acquire()
+            if channel is not None:
+                self._channel_limiter(channel).acquire()
+            with self._lock:
+                self.api_calls += 1
+            try:
+                if channel is not None:
+                    kwargs["channel"] = channel
+                # chat.postMessage -> client.chat_postMessage(...)
+                return getattr(self.client, method.replace(".", "_"))(**kwargs)
+            except SlackApiError as e:
+                attempt += 1
+                if e.response.status_code != 429 or attempt > self.max_retries:
+                    raise
+                retry_after = float(e.response.headers.get("Retry-After", "1"))
+                with self._lock:
+                    self.rate_limited += 1
+                if limiter:
+                    limiter.pause(retry_after)
+                else:
+                    time.sleep(retry_after)
+
+    def dm_channel(self, user_id: str) -> str:
+        """The DM channel id for a user, opening the conversation only the first time"""
+        channel_id = self.dm_channels.get(user_id)
+        if channel_id is None:
+            conversation = self.call("conversations.open", users=[user_id])
+            channel_id = conversation["channel"]["id"]
+            self.dm_channels[user_id] = channel_id
+        return channel_id
+
+    def post(self, channel: str, text: str):
+        return self.call("chat.postMessage", channel=channel, text=text)
+
+    # ----- coalescing queue -----
+
+    def submit(self, channel: str = None, user_id: str = None, text: str = "") -> Future:
+        """
+        Queue a message for a channel or a user's DM. Resolves to the chat.postMessage
+        result dict ("coalesced" says how many messages shared the post).
+        """
+        key = ("user", user_id) if user_id else ("channel", channel)
+        with self._lock:
+            full = self._pending.get(key)
+            if full is not None and full.chars + len(text) <= MAX_COALESCED_CHARS:
+                self.coalesced += 1
+                return full.add(text)
+            pending = self._pending[key] = _PendingMessage()
+            future = pending.add(text)
+        if full is not None:
+            # No room for this text: send the batch now (its timer finds it gone and skips it)
+            self._executor.submit(self._deliver, key, full)
+        if self.coalesce_window > 0:
+            timer = threading.Timer(self.coalesce_window, self._flush, args=(key, pending))
+            timer.daemon = True
+            timer.start()
+        else:
+            self._flush(key, pending)
+        return future
+
+    def _flush(self, key: Tuple[str, str], pending: _PendingMessage):
+        with self._lock:
+            if self._pending.get(key) is not pending:
+                return  # already flushed
+            del self._pending[key]
+        self._executor.submit(self._deliver, key, pending)
+
+    def _deliver(self, key: Tuple[str, str], pending: _PendingMessage):
+        kind, target = key
+        try:
+            channel = self.dm_channel(target) if kind == "user" else target
+            response = self.post(channel, "\n\n".join(pending.texts))
+            result = {
+                "status": "success",
+                "message": "DM sent successfully" if kind == "user" else "Message sent successfully",
+                "ts": response["ts"],
+                "coalesced": len(pending.texts)
+            }
+        except Exception as e:
+            print(f"Error sending Slack message: {e}")
+            result = {"status": "error", "message": str(e)}
+        for future in pending.futures:
+            future.set_result(dict(result))
+
+    def send_many(self, messages: List[Dict[str, str]], timeout: float = None) -> List[dict]:
+        """
+        Send [{"user_id" or "channel": ..., "text": ...}] concurrently and wait
+        for all of them; results are in input order.
+        """
+        futures = [self.submit(m.get("channel"), m.get("user_id"), m["text"]) for m in messages]
+        return [future.result(timeout) for future in futures]
+
+    def stats(self) -> dict:
+        return {
+            "api_calls": self.api_calls,
+            "rate_limited": self.rate_limited,
+            "coalesced": self.coalesced,
+            "cached_dm_channels": len(self.dm_channels),
+            "pending": len(self._pending)
+        }
+
+    def close(self):
+        """Send whatever is still waiting out its window, then stop the workers"""
+        with self._lock:
+            pending = list(self._pending.items())
+        for key, message in pending:
+            self._flush(key, message)
+        self._executor.shutdown(wait=True)
+
+class AsyncSlackDispatcher:
+    """
+    The asyncio twin of SlackDispatcher for an AsyncWebClient: same rate limits,
+    Retry-After pauses, DM channel cache and counters (shared with `limits`, so
+    sync and async senders together stay within Slack's limits), with waits
+    and coalescing windows on the event loop instead of worker threads.
+    """
+
+    def __init__(self, client, limits: SlackDispatcher):
+        self.client = client
+        self.limits = limits
+        self._pending: Dict[Tuple[str, str], _PendingMessage] = {}
+        self._tasks = set()
+        self._slots = asyncio.Semaphore(limits.workers)
+
+    def _count(self, counter: str):
+        with self.limits._lock:
+            setattr(self.limits, counter, getattr(self.limits, counter) + 1)
+
+    async def call(self, method: str, channel: Optional[str] = None, **kwargs):
+        """Call a Web API method within its rate limits, retrying 429s after Retry-After"""
+        limiter = self.limits.method_limiters.get(method)
+        attempt = 0
+        while True:
+            delay = limiter.reserve() if limiter else 0.0
+            if channel is not None:
+                delay = max(delay, self.limits._channel_limiter(channel).reserve())
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._count("api_calls")
+            try:
+                if channel is not None:
+                    kwargs["channel"] = channel
+                return await getattr(self.client, method.replace(".", "_"))(**kwargs)
+            except SlackApiError as e:
+                attempt += 1
+                if e.response.status_code != 429 or attempt > self.limits.max_retries:
+                    raise
+                retry_after = float(e.response.headers.get("Retry-After", "1"))
+                self._count("rate_limited")
+                if limiter:
+                    limiter.pause(retry_after)
+                else:
+                    await asyncio.sleep(retry_after)
+
+    async def dm_channel(self, user_id: str) -> str:
+        """The DM channel id for a user, opening the conversation only the first time"""
+        channel_id = self.limits.dm_channels.get(user_id)
+        if channel_id is None:
+            conversation = await self.call("conversations.open", users=[user_id])
+            channel_id = conversation["channel"]["id"]
+            self.limits.dm_channels[user_id] = channel_id
+        return channel_id
+
+    async def post(self, channel: str, text: str):
+        return await self.call("chat.postMessage", channel=channel, text=text)
+
+    # ----- coalescing queue -----
+
+    def submit(self, channel: str = None, user_id: str = None, text: str = "") -> asyncio.Future:
+        """Queue a message for a channel or a user's DM; await the returned future for the result dict"""
+        loop = asyncio.get_running_loop()
+        key = ("user", user_id) if user_id else ("channel", channel)
+        pending = self._pending.get(key)
+        if pending is not None and pending.chars + len(text) <= MAX_COALESCED_CHARS:
+            self._count("coalesced")
+        else:
+            if pending is not None:
+                self._flush(key, pending)  # no room for this text: send the batch now
+            pending = self._pending[key] = _PendingMessage()
+            window = self.limits.coalesce_window
+            if window > 0:
+                loop.call_later(window, self._flush, key, pending)
+            else:
+                loop.call_soon(self._flush, key, pending)
+        future = loop.create_future()
+        pending.futures.append(future)
+        pending.texts.append(text)
+        pending.chars += len(text)
+        return future
+
+    def _flush(self, key: Tuple[str, str], pending: _PendingMessage):
+        if self._pending.get(key) is not pending:
+            return  # already flushed
+        del self._pending[key]
+        task = asyncio.get_running_loop().create_task(self._deliver(key, pending))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _deliver(self, key: Tuple[str, str], pending: _PendingMessage):
+        kind, target = key
+        try:
+            async with self._slots:
+                channel = await self.dm_channel(target) if kind == "user" else target
+                response = await self.post(channel, "\n\n".join(pending.texts))
+            result = {
+                "status": "success",
+                "message": "DM sent successfully" if kind == "user" else "Message sent successfully",
+                "ts": response["ts"],
+                "coalesced": len(pending.texts)
+            }
+        except Exception as e:
+            print(f"Error sending Slack message: {e}")
+            result = {"status": "error", "message": str(e)}
+        for future in pending.futures:
+            if not future.done():
+                future.set_result(dict(result))
+
+    async def send_many(self, messages: List[Dict[str, str]]) -> List[dict]:
+        """Send [{"user_id" or "channel": ..., "text": ...}] concurrently; results in input order"""
+        futures = [self.submit(m.get("channel"), m.get("user_id"), m["text"]) for m in messages]
+        return list(await asyncio.gather(*futures))
+
+    def take_pending(self) -> List[Tuple[Tuple[str, str], _PendingMessage]]:
+        """Remove and return the batches still waiting out their window (to send them elsewhere)"""
+        pending, self._pending = list(self._pending.items()), {}
+        return pending
+
+    async def close(self):
+        """Send whatever is still waiting out its window"""
+        for key, pending in list(self._pending.items()):
+            self._flush(key, pending)
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
@@ -1,24 +1,39 @@
+import asyncio
+import atexit
 import os
+import aiohttp
 from slack_sdk import WebClient
 from slack_sdk.errors import SlackApiError
+from slack_sdk.web.async_client import AsyncWebClient
 from dotenv import load_dotenv
 
+from services.slack_dispatch import AsyncSlackDispatcher, SlackDispatcher
+
 load_dotenv()
 
 class SlackService:
     def __init__(self):
-        self.client = WebClient(token=os.getenv('SLACK_BOT_TOKEN'))
+        # SLACK_API_URL points at a fake Web API in tests
+        self.client = WebClient(
+            token=os.getenv('SLACK_BOT_TOKEN'),
+            base_url=os.getenv('SLACK_API_URL', WebClient.BASE_URL)
+        )
         self.default_channel = os.getenv('SLACK_CHANNEL_ID')
+        # Rate limits, Retry-After, DM channel cache and coalescing
+        self.dispatcher = SlackDispatcher(self.client)
+        # AsyncWebClient path for the FastAPI handlers, created on first use in the event loop
+        self.http_pool_size = int(os.getenv('SLACK_HTTP_POOL_SIZE', '10'))
+        self._async_dispatcher = None
+        self._async_session = None
+        self._async_loop = None
+        self._retire_task = None
     
     def send_message(self, channel: str, text: str) -> dict:
         """
         Send message to Slack channel
         """
         try:
-            response = self.client.chat_postMessage(
-                channel=channel,
-                text=text
-            )
+            response = self.dispatcher.post(channel, text)
             return {
                 "status": "success",
                 "message": "Message sent successfully",
@@ -36,15 +51,11 @@ class SlackService:
         Send direct message to a user
         """
         try:
-            # Open a conversation with the user
-            conversation = self.client.conversations_open(users=[user_id])
-            channel_id = conversation["channel"]["id"]
+            # Open a conversation with the user (cached after the first DM)
+            channel_id = self.dispatcher.dm_channel(user_id)
             
             # Send the message
-            response = self.client.chat_postMessage(
-                channel=channel_id,
-                text=text
-            )
+            response = self.dispatcher.post(channel_id, text)
             return {
                 "status": "success",
                 "message": "DM sent successfully",
@@ -55,18 +66,14 @@ class SlackService:
             return {
                 "status": "error",
                 "message": str(e)
-    }
+            }
     
     def schedule_message(self, channel: str, text: str, post_at: int) -> dict:
         """
         Schedule a message for later
         """
         try:
-            response = self.client.chat_scheduleMessage(
-                channel=channel,
-                text=text,
-                post_at=post_at
-            )
+            response = self.dispatcher.call("chat.scheduleMessage", channel=channel, text=text, post_at=post_at)
             return {
                 "status": "success",
                 "message": "Message scheduled successfully",
@@ -79,8 +86,160 @@ class SlackService:
                 "message": str(e)
             }
 
+    def queue_message(self, channel: str, text: str):
+        """
+        Queue a channel message; messages to the same channel within the coalescing
+        window go out as one post. Returns a Future with the result dict.
+        """
+        return self.dispatcher.submit(channel=channel, text=text)
+    
+    def queue_dm(self, user_id: str, text: str):
+        """Queue a DM (coalesced per user); returns a Future with the result dict"""
+        return self.dispatcher.submit(user_id=user_id, text=text)
+    
+    def send_many(self, messages: list) -> list:
+        """
+        Send [{"user_id" or "channel": ..., "text": ...}] concurrently within
+        Slack's rate limits; results in input order
+        """
+        return self.dispatcher.send_many(messages)
+    
+    def close(self):
+        """Flush coalesced messages and stop the send workers"""
+        self.dispatcher.close()
+    
+    # ===== ASYNC PATH =====
+    
+    def async_dispatcher(self) -> AsyncSlackDispatcher:
+        """
+        Dispatcher on an AsyncWebClient whose requests share one aiohttp connection
+        pool (SLACK_HTTP_POOL_SIZE). Rate limits and the DM cache are shared with
+        the sync dispatcher.
+        """
+        loop = asyncio.get_running_loop()
+        if self._async_dispatcher is None or self._async_loop is not loop:
+            previous = (self._async_dispatcher, self._async_session, self._async_loop)
+            self._async_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.http_pool_size)
+            )
+            client = AsyncWebClient(
+                token=self.client.token,
+                base_url=self.client.base_url,
+                session=self._async_session
+            )
+            self._async_dispatcher = AsyncSlackDispatcher(client, self.dispatcher)
+            self._async_loop = loop
+            if previous[0] is not None:
+                self._retire_async(*previous)
+        return self._async_dispatcher
+    
+    def _retire_async(self, dispatcher: AsyncSlackDispatcher, session: aiohttp.ClientSession,
+                      loop: asyncio.AbstractEventLoop):
+        """
+        Close the client of a loop we moved away from without losing its queue: a loop
+        still running elsewhere flushes and closes it itself; the batches of one that
+        has ended (its timers will never fire) are re-queued here before closing.
+        """
+        replacement = self._async_dispatcher
+        
+        async def close_there():
+            await dispatcher.close()
+            await session.close()
+        
+        async def close_here():
+            for (kind, target), pending in dispatcher.take_pending():
+                for text in pending.texts:
+                    replacement.submit(**{"user_id" if kind == "user" else "channel": target}, text=text)
+            try:
+                await session.close()
+            except Exception as e:
+                print(f"Error closing Slack session: {e}")
+        
+        if loop.is_running() and not loop.is_closed():
+            asyncio.run_coroutine_threadsafe(close_there(), loop)
+        else:
+            self._retire_task = asyncio.get_running_loop().create_task(close_here())
+    
+    async def async_send_message(self, channel: str, text: str) -> dict:
+        """
+        Send message to Slack channel without blocking the event loop
+        """
+        try:
+            response = await self.async_dispatcher().post(channel, text)
+            return {
+                "status": "success",
+                "message": "Message sent successfully",
+                "ts": response["ts"]
+            }
+        except (SlackApiError, aiohttp.ClientError) as e:
+            print(f"Error sending Slack message: {e}")
+            return {
+                "status": "error",
+                "message": str(e)
+            }
+    
+    async def async_send_dm(self, user_id: str, text: str) -> dict:
+        """
+        Send direct message to a user without blocking the event loop
+        """
+        try:
+            dispatcher = self.async_dispatcher()
+            channel_id = await dispatcher.dm_channel(user_id)
+            response = await dispatcher.post(channel_id, text)
+            return {
+                "status": "success",
+                "message": "DM sent successfully",
+                "ts": response["ts"]
+            }
+        except (SlackApiError, aiohttp.ClientError) as e:
+            print(f"Error sending Slack DM: {e}")
+            return {
+                "status": "error",
+                "message": str(e)
+            }
+    
+    async def async_schedule_message(self, channel: str, text: str, post_at: int) -> dict:
+        """
+        Schedule a message for later without blocking the event loop
+        """
+        try:
+            response = await self.async_dispatcher().call(
+                "chat.scheduleMessage", channel=channel, text=text, post_at=post_at
+            )
+            return {
+                "status": "success",
+                "message": "Message scheduled successfully",
+                "scheduled_message_id": response["scheduled_message_id"]
+            }
+        except (SlackApiError, aiohttp.ClientError) as e:
+            print(f"Error scheduling Slack message: {e}")
+            return {
+                "status": "error",
+                "message": str(e)
+            }
+    
+    async def async_queue_message(self, channel: str, text: str) -> dict:
+        """Channel message through the coalescing queue; returns once it has been posted"""
+        return await self.async_dispatcher().submit(channel=channel, text=text)
+    
+    async def async_send_many(self, messages: list) -> list:
+        """Async send_many: concurrent, rate limited, results in input order"""
+        return await self.async_dispatcher().send_many(messages)
+    
+    async def aclose(self):
+        """Flush queued async messages and close the shared aiohttp session"""
+        if self._async_dispatcher is not None:
+            dispatcher = self.async_dispatcher()  # a client left on another loop is retired first
+            if self._retire_task is not None:
+                await self._retire_task
+                self._retire_task = None
+            await dispatcher.close()
+            await self._async_session.close()
+        self._async_dispatcher = self._async_session = self._async_loop = None
+
 # Create global instance
 slack_service = SlackService()
+atexit.register(slack_service.close)
 
 def send_slack_message(channel: str, text: str) -> dict:
     """
@@ -93,3 +252,45 @@ def send_slack_dm(user_id: str, text: str) -> dict:
     Global helper function for sending Slack DMs
     """
     return slack_service.send_dm(user_id, text)
+
+def queue_slack_message(channel: str, text: str):
+    """
+    Global helper: coalescing channel post, returns a Future
+    """
+    return slack_service.queue_message(channel, text)
+
+def send_slack_dms(messages: list) -> list:
+    """
+    Global helper for DMs to many users ([{"user_id": ..., "text": ...}])
+    """
+    return slack_service.send_many(messages)
+
+async def asend_slack_message(channel: str, text: str) -> dict:
+    """
+    Global async helper for sending Slack messages
+    """
+    return await slack_service.async_send_message(channel, text)
+
+async def asend_slack_dm(user_id: str, text: str) -> dict:
+    """
+    Global async helper for sending Slack DMs
+    """
+    return await slack_service.async_send_dm(user_id, text)
+
+async def aschedule_slack_message(channel: str, text: str, post_at: int) -> dict:
+    """
+    Global async helper for scheduling Slack messages
+    """
+    return await slack_service.async_schedule_message(channel, text, post_at)
+
+async def aqueue_slack_message(channel: str, text: str) -> dict:
+    """
+    Global async helper: coalescing channel post
+    """
+    return await slack_service.async_queue_message(channel, text)
+
+async def asend_slack_dms(messages: list) -> list:
+    """
+    Global async helper for DMs to many users ([{"user_id": ..., "text": ...}])
+    """
+    return await slack_service.async_send_many(messages)
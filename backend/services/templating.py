@@ -0,0 +1,61 @@
+import asyncio
+import re
+from typing import Awaitable, Callable, Dict, Iterable
+
+# Slots look like {{name}} so they survive a round trip through the model
+SLOT_PATTERN = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+def slot(name: str) -> str:
+    """Placeholder text for a slot"""
+    return "{{" + name + "}}"
+
+def template_instructions(slot_names: Iterable[str]) -> str:
+    """Extra prompt lines asking the model for a reusable template"""
+    placeholders = ", ".join(slot(name) for name in slot_names)
+    return f"""
+            This email is a reusable template sent to many people.
+            Write the placeholders {placeholders} exactly as shown wherever those details belong;
+            they will be filled in for each recipient. Do not invent names or other personal details.
+            """
+
+def prepare_template(template: str, slot_names: Iterable[str]) -> str:
+    """
+    If the model dropped the name placeholder, prepend a greeting so every
+    email is still addressed to its recipient. Placeholders are normalized to
+    {{name}} so providers that substitute literal tokens can fill them.
+    """
+    template = SLOT_PATTERN.sub(lambda m: slot(m.group(1)), template)
+    if "name" in slot_names and not any(m.group(1) == "name" for m in SLOT_PATTERN.finditer(template)):
+        template = f"Hi {slot('name')},\n\n{template}"
+    return template
+
+def render_template(template: str, slots: Dict[str, str]) -> str:
+    """Fill {{slot}} placeholders. Unknown placeholders are left untouched."""
+    template = prepare_template(template, slots)
+    return SLOT_PATTERN.sub(lambda m: str(slots.get(m.group(1), m.group(0))), template)
+
+class SegmentTemplates:
+    """
+    Generate one template per segment, then personalize locally.
+    Concurrent recipients of the same segment share a single model call.
+    """
+
+    def __init__(self, generate: Callable[[str], Awaitable[str]]):
+        self.generate = generate
+        self._templates: Dict[str, asyncio.Task] = {}
+
+    @property
+    def generated(self) -> int:
+        """Number of model calls made so far"""
+        return len(self._templates)
+
+    async def template_for(self, segment: str, prompt: str) -> str:
+        task = self._templates.get(segment)
+        if task is None:
+            task = asyncio.ensure_future(self.generate(prompt))
+            self._templates[segment] = task
+        # Shield so one cancelled recipient does not cancel the shared generation
+        return await asyncio.shield(task)
+
+    async def render(self, segment: str, prompt: str, slots: Dict[str, str]) -> str:
+        return render_template(await self.template_for(segment, prompt), slots)
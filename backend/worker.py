@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Background worker for HackaTwin bulk campaigns and the email outbox.
+Run alongside the API (set JOB_WORKER_INPROCESS=false and OUTBOX_WORKER_INPROCESS=false
+to keep sends out of the API process):
+
+    python worker.py
+"""
+
+import asyncio
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database.utils import create_tables
+from services.job_queue import JobWorker
+from services.outbox import OutboxSender
+
+async def run_workers():
+    await asyncio.gather(JobWorker().run_forever(), OutboxSender().run_forever())
+
+def main():
+    create_tables()
+    try:
+        asyncio.run(run_workers())
+    except KeyboardInterrupt:
+        print("\n👋 Worker stopped. Unfinished jobs will be resumed by the next worker.")
+
+if __name__ == "__main__":
+    main()